@@ -1,6 +1,13 @@
 #version 330 core
 in vec3 vColor;
+in vec3 vWorldPos;
+in vec3 vNormal;
 out vec4 FragColor;
+#include "SnakeLighting.glsl"
 void main() {
-    FragColor = vec4(vColor, 1.0);
-}
\ No newline at end of file
+    // Meshes without normals read a zero constant; use the face normal then.
+    vec3 normal = dot(vNormal, vNormal) > 1e-8
+        ? normalize(vNormal)
+        : normalize(cross(dFdx(vWorldPos), dFdy(vWorldPos)));
+    FragColor = vec4(SnakeLighting(vWorldPos, normal, vColor), 1.0);
+}
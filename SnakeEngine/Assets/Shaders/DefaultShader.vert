@@ -1,11 +1,17 @@
 #version 330 core
 layout (location = 0) in vec3 aPos;
 layout (location = 1) in vec3 aColor;
+layout (location = 2) in vec3 aNormal;
+layout (location = 3) in mat4 aModel;
 out vec3 vColor;
-uniform mat4 model;
-uniform mat4 view;
-uniform mat4 projection;
+out vec3 vWorldPos;
+out vec3 vNormal;
+#include "SnakeFrame.glsl"
 void main() {
-    gl_Position = projection * view * model * vec4(aPos, 1.0);
+    vec4 worldPos = aModel * vec4(aPos, 1.0);
+    gl_Position = projection * view * worldPos;
     vColor = aColor;
-}
\ No newline at end of file
+    vWorldPos = worldPos.xyz;
+    // Inverse transpose keeps normals right under non-uniform scale.
+    vNormal = transpose(inverse(mat3(aModel))) * aNormal;
+}
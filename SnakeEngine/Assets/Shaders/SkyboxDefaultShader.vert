@@ -1,8 +1,7 @@
 #version 330 core
 layout (location = 0) in vec3 aPos;
 out vec3 TexCoords;
-uniform mat4 projection;
-uniform mat4 view;
+#include "SnakeFrame.glsl"
 void main() {
     TexCoords = aPos;
     mat4 staticView = mat4(mat3(view));
@@ -0,0 +1,8 @@
+// Per-frame engine uniforms, filled once per frame by FrameUniforms.
+layout (std140) uniform SnakeFrame {
+    mat4 view;
+    mat4 projection;
+    vec3 viewPos;
+    float time;
+    vec2 resolution;
+};
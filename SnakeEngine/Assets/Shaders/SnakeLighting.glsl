@@ -0,0 +1,57 @@
+// Clustered forward lighting, filled once per frame by Lighting.
+#include "SnakeFrame.glsl"
+
+#define SNAKE_MAX_DIRECTIONAL 4
+
+layout (std140) uniform SnakeLights {
+    vec4 ambientLight;      // rgb, w unused
+    vec4 clusterCounts;     // tiles x, tiles y, depth slices, lighting enabled
+    vec4 clusterDepth;      // near, far, slice scale, slice bias
+    vec4 lightCounts;       // directional, point
+    vec4 directionalDir[SNAKE_MAX_DIRECTIONAL];
+    vec4 directionalColor[SNAKE_MAX_DIRECTIONAL];
+};
+
+// Three texels per point light: position + range, colour, attenuation.
+uniform samplerBuffer snakeLightData;
+// (first index, count) into snakeLightIndices for every cluster.
+uniform usamplerBuffer snakeLightGrid;
+uniform usamplerBuffer snakeLightIndices;
+
+int SnakeCluster(float viewDepth) {
+    ivec3 counts = ivec3(clusterCounts.xyz);
+    ivec2 tile = ivec2(gl_FragCoord.xy / resolution * clusterCounts.xy);
+    tile = clamp(tile, ivec2(0), counts.xy - 1);
+    float slice = floor(log(max(viewDepth, clusterDepth.x)) * clusterDepth.z + clusterDepth.w);
+    int z = clamp(int(slice), 0, counts.z - 1);
+    return (z * counts.y + tile.y) * counts.x + tile.x;
+}
+
+vec3 SnakeLighting(vec3 worldPos, vec3 normal, vec3 albedo) {
+    if (clusterCounts.w < 0.5) {
+        return albedo;
+    }
+
+    vec3 light = ambientLight.rgb;
+    int directional = int(lightCounts.x);
+    for (int i = 0; i < directional; ++i) {
+        light += directionalColor[i].rgb * max(dot(normal, -directionalDir[i].xyz), 0.0);
+    }
+
+    float viewDepth = -(view * vec4(worldPos, 1.0)).z;
+    uvec2 range = texelFetch(snakeLightGrid, SnakeCluster(viewDepth)).xy;
+    for (uint i = 0u; i < range.y; ++i) {
+        int base = int(texelFetch(snakeLightIndices, int(range.x + i)).x) * 3;
+        vec4 positionRange = texelFetch(snakeLightData, base);
+        vec3 color = texelFetch(snakeLightData, base + 1).rgb;
+        vec3 attenuation = texelFetch(snakeLightData, base + 2).xyz;
+
+        vec3 toLight = positionRange.xyz - worldPos;
+        float dist = length(toLight);
+        // Fade to exactly zero at the range so cluster bounds stay correct.
+        float fade = clamp(1.0 - pow(dist / positionRange.w, 4.0), 0.0, 1.0);
+        float falloff = fade * fade / (attenuation.x + dist * (attenuation.y + dist * attenuation.z));
+        light += color * falloff * max(dot(normal, toLight / max(dist, 1e-4)), 0.0);
+    }
+    return albedo * light;
+}
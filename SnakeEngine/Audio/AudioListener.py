@@ -44,20 +44,14 @@ class AudioListener(GameScript):
 
         transform = self.Entity.Transform
 
-        pitch = math.radians(transform.Rotation.X)
-        yaw = math.radians(transform.Rotation.Y)
+        (fx, fy, fz), up = transform.GetLookDirections()
 
-        fx = math.sin(yaw) * math.cos(pitch)
-        fy = -math.sin(pitch)
-        fz = math.cos(yaw) * math.cos(pitch)
-        fx, fy, fz = _normalize3(fx, fy, fz)
-
-        rx, ry, rz = _cross3(fx, fy, fz, 0.0, 1.0, 0.0)
+        rx, ry, rz = _cross3(fx, fy, fz, *up)
         rx, ry, rz = _normalize3(rx, ry, rz)
 
         ux, uy, uz = _cross3(rx, ry, rz, fx, fy, fz)
 
-        pos = transform.Position
+        pos = transform.WorldPosition
 
         al.alListener3f(al.AL_POSITION, pos.X, pos.Y, pos.Z)
 
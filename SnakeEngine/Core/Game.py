@@ -15,6 +15,13 @@ from ..Rendering.Skybox import Skybox
 from .Input import Input
 from ..Audio.AudioManager import AudioManager
 from ..Rendering.MeshRenderer import MeshRenderer
+from ..Rendering.MeshManager import MeshManager
+from ..Rendering.FrameUniforms import FrameUniforms
+from ..Rendering.Light import Light
+from ..Rendering.Lighting import Lighting
+from ..Rendering.TextureManager import TextureManager
+from ..Rendering.RenderQueue import RenderQueue, PASS_SKYBOX
+from ..Rendering.StaticBatch import StaticBatcher
 from ..UI.Canvas import UICanvas
 from ..UI.Button import UIButton
 from ..UI.Slider import UISlider
@@ -33,6 +40,9 @@ class Game:
         self._IsRunning = False
         self.GameWindow = None
         self.GraphicsContext = GraphicsContext()
+        self.ScriptMgr = ScriptManager()
+        self.RenderQueue = RenderQueue()
+        self.StaticBatcher = StaticBatcher()
         self.ActiveScene = None
         self.GlobalCanvas = None
         self.MouseLocked = False
@@ -40,12 +50,11 @@ class Game:
 
         self.Settings = settings if settings is not None else GameSettings()
 
-        self.ScriptMgr = ScriptManager()
-
         self._last_time = None
         self._fps_timer = None
         self._frame_count = 0
         self._fixed_timer = 0.0
+        self._elapsed_time = 0.0
         self._FIXED_DELTA = 1.0 / 60.0
         self._alt_enter_pressed = False
         self._esc_pressed = False
@@ -53,6 +62,16 @@ class Game:
 
         self.Initialize()
 
+    @property
+    def ActiveScene(self):
+        return self._ActiveScene
+
+    @ActiveScene.setter
+    def ActiveScene(self, scene):
+        self._ActiveScene = scene
+        self.ScriptMgr.Attach(scene)
+        self.StaticBatcher.Attach(scene)
+
     def Initialize(self):
         print(
             "=" * 50
@@ -114,7 +133,12 @@ class Game:
         self._IsRunning = False
         if self.ActiveScene:
             self.ScriptMgr.ClearOrphanedScripts(self.ActiveScene.Entities)
+        self.StaticBatcher.Attach(None)
         ShaderManager.cleanup()
+        MeshManager.cleanup()
+        FrameUniforms.cleanup()
+        Lighting.cleanup()
+        TextureManager.cleanup()
         AudioManager.Get().Shutdown()
         PhysicsManager.Shutdown()
         SnakeGLFW.Shutdown()
@@ -146,6 +170,7 @@ class Game:
                 DeltaTime = 0.0001
             elif DeltaTime > 0.1:
                 DeltaTime = 0.1
+            self._elapsed_time += DeltaTime
 
             Input._UpdateStates()
 
@@ -170,79 +195,92 @@ class Game:
             mx, my = Input.GetMousePosition()
             lpm_pressed_state = Input.IsMouseButtonPressed("LEFT")
 
-            active_entities = (
-                [e for e in self.ActiveScene.Entities if e.IsActive]
-                if self.ActiveScene
-                else []
-            )
-
-            for entity in active_entities:
-                btn = entity.GetComponent(UIButton)
-                if btn:
-                    b = btn.Bounds
-                    if (
-                        b.Position.X <= mx <= b.Position.X + b.Width
-                        and b.Position.Y <= my <= b.Position.Y + b.Height
-                    ):
-                        btn.IsHovered = True
-                    else:
-                        btn.IsHovered = False
+            scene = self.ActiveScene
+            buttons = scene.QueryComponents(UIButton) if scene else []
+            sliders = scene.QueryComponents(UISlider) if scene else []
+
+            for btn in buttons:
+                b = btn.Bounds
+                if (
+                    b.Position.X <= mx <= b.Position.X + b.Width
+                    and b.Position.Y <= my <= b.Position.Y + b.Height
+                ):
+                    btn.IsHovered = True
+                else:
+                    btn.IsHovered = False
 
             if lpm_pressed_state:
                 if not self._lpm_pressed:
-                    for entity in active_entities:
-                        btn = entity.GetComponent(UIButton)
-                        if btn and btn.Callback and btn.IsHovered:
+                    for btn in buttons:
+                        if btn.Callback and btn.IsHovered:
                             btn.Callback()
                     self._lpm_pressed = True
 
-                for entity in active_entities:
-                    slider = entity.GetComponent(UISlider)
-                    if slider:
-                        b = slider.Bounds
-                        if slider.IsDragging or (
-                            b.Position.X <= mx <= b.Position.X + b.Width
-                            and b.Position.Y <= my <= b.Position.Y + b.Height
-                        ):
-                            slider.IsDragging = True
-                            relative_x = mx - b.Position.X
-                            new_val = relative_x / b.Width
-                            slider.Value = max(0.0, min(1.0, new_val))
+                for slider in sliders:
+                    b = slider.Bounds
+                    if slider.IsDragging or (
+                        b.Position.X <= mx <= b.Position.X + b.Width
+                        and b.Position.Y <= my <= b.Position.Y + b.Height
+                    ):
+                        slider.IsDragging = True
+                        relative_x = mx - b.Position.X
+                        new_val = relative_x / b.Width
+                        slider.Value = max(0.0, min(1.0, new_val))
             else:
                 self._lpm_pressed = False
-                for entity in active_entities:
-                    slider = entity.GetComponent(UISlider)
-                    if slider:
-                        slider.IsDragging = False
+                for slider in sliders:
+                    slider.IsDragging = False
 
             if self.ActiveScene:
                 self._fixed_timer += DeltaTime
                 while self._fixed_timer >= self._FIXED_DELTA:
-                    self.ScriptMgr.OnFixedUpdate(active_entities, self._FIXED_DELTA)
+                    self.ScriptMgr.OnFixedUpdate(self._FIXED_DELTA)
                     PhysicsManager.Step(self._FIXED_DELTA)
                     self._fixed_timer -= self._FIXED_DELTA
 
-                self.ScriptMgr.OnUpdate(active_entities, DeltaTime)
+                self.ScriptMgr.OnUpdate(DeltaTime)
+                self.ActiveScene.UpdateTransforms()
 
             self.GameWindow.UpdateDimensions()
+            TextureManager.update()
 
             if self.ActiveScene:
                 view_matrix = None
                 proj_matrix = None
+                camera_entity = None
+                camera_position = None
                 aspect_ratio = (
                     self.GameWindow.Width / self.GameWindow.Height
                     if self.GameWindow.Height > 0
                     else 1.0
                 )
 
-                for entity in active_entities:
+                for entity in scene.Query(Camera):
                     cam = entity.GetComponent(Camera)
-                    if cam:
-                        view_matrix = cam.GetViewMatrix(entity.Transform)
-                        proj_matrix = Matrix4.Perspective(
-                            math.radians(cam.Fov), aspect_ratio, cam.Near, cam.Far
-                        )
-                        break
+                    view_matrix = cam.GetViewMatrix(entity.Transform)
+                    proj_matrix = Matrix4.Perspective(
+                        math.radians(cam.Fov), aspect_ratio, cam.Near, cam.Far
+                    )
+                    camera_entity = entity
+                    camera_position = entity.Transform.WorldPosition
+                    FrameUniforms.update(
+                        view_matrix,
+                        proj_matrix,
+                        camera_position,
+                        self._elapsed_time,
+                        self.GameWindow.Width,
+                        self.GameWindow.Height,
+                    )
+                    light_entities = scene.Query(Light)
+                    Lighting.update(
+                        light_entities,
+                        scene.GetModelMatrices(light_entities),
+                        view_matrix,
+                        proj_matrix,
+                        cam.Near,
+                        cam.Far,
+                    )
+                    break
 
                 self._frame_count += 1
                 if current_time - self._fps_timer >= 1.0:
@@ -255,20 +293,32 @@ class Game:
                 )
 
                 if view_matrix and proj_matrix:
-                    for entity in active_entities:
-                        sky = entity.GetComponent(Skybox)
-                        if sky:
-                            sky.Render(proj_matrix, view_matrix)
+                    cam = camera_entity.GetComponent(Camera)
+                    queue = self.RenderQueue
+                    queue.Begin(
+                        camera_position,
+                        cam.Far,
+                        proj_matrix.Multiply(view_matrix),
+                        proj_matrix.M[5],
+                    )
 
-                if view_matrix and proj_matrix:
-                    for entity in active_entities:
-                        mesh = entity.GetComponent(MeshRenderer)
-                        if mesh:
-                            mesh.Render(entity.Transform, view_matrix, proj_matrix)
+                    mesh_entities = scene.Query(MeshRenderer)
+                    model_matrices = scene.GetModelMatrices(mesh_entities)
+                    MeshRenderer.SubmitEntities(queue, mesh_entities, model_matrices)
+                    self.StaticBatcher.Submit(queue)
+
+                    # Drawn after opaque geometry so the depth test rejects
+                    # every sky pixel that is already covered.
+                    for sky in scene.QueryComponents(Skybox):
+                        queue.SubmitCallback(
+                            PASS_SKYBOX, sky.Render, proj_matrix, view_matrix
+                        )
+
+                    queue.Flush(view_matrix, proj_matrix)
 
                 if self.GlobalCanvas:
                     self.GlobalCanvas.Render(
-                        active_entities,
+                        scene,
                         self.GameWindow.Width,
                         self.GameWindow.Height,
                     )
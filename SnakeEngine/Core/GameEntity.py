@@ -5,12 +5,20 @@ from .GameScript import GameScript
 
 
 class GameEntity:
-    def __init__(self):
+    def __init__(self, scene=None):
         self.Uid = str(uuid.uuid4())
+        self.Scene = scene
+        self._SceneOrder = 0
         self._Name = "Entity"
-        self.Transform = Transform()
+        self.Transform = Transform(
+            scene.TransformStorage if scene is not None else None
+        )
+        self._Parent = None
+        self._Children = []
         self.Components = {}
+        self._ComponentLookup = {}
         self._IsActive = True
+        self._IsStatic = False
 
     @property
     def Name(self):
@@ -20,13 +28,46 @@ class GameEntity:
     def Name(self, value):
         self._Name = value
 
+    @property
+    def Parent(self):
+        return self._Parent
+
+    @property
+    def Children(self):
+        return tuple(self._Children)
+
+    def SetParent(self, parent):
+        self.Transform.SetParent(parent.Transform if parent is not None else None)
+
+        if self._Parent is not None:
+            self._Parent._Children.remove(self)
+        self._Parent = parent
+        if parent is not None:
+            parent._Children.append(self)
+
     @property
     def IsActive(self):
         return self._IsActive
 
+    @property
+    def IsStatic(self):
+        return self._IsStatic
+
+    @IsStatic.setter
+    def IsStatic(self, value):
+        # Static entities are expected not to move; renderers may bake them.
+        value = bool(value)
+        if value == self._IsStatic:
+            return
+        self._IsStatic = value
+        if self._IsActive and self.Scene is not None:
+            self.Scene._OnStaticChanged(self)
+
     def Activate(self):
         if not self._IsActive:
             self._IsActive = True
+            if self.Scene is not None:
+                self.Scene._RegisterEntity(self)
             for comp in self.Components.values():
                 if isinstance(comp, GameScript):
                     comp.OnActivate()
@@ -34,6 +75,8 @@ class GameEntity:
     def Deactivate(self):
         if self._IsActive:
             self._IsActive = False
+            if self.Scene is not None:
+                self.Scene._UnregisterEntity(self)
             for comp in self.Components.values():
                 if isinstance(comp, GameScript):
                     comp.OnDeactivate()
@@ -44,7 +87,14 @@ class GameEntity:
         if isinstance(component_instance, GameScript):
             component_instance.Entity = self
 
+        previous = self.Components.get(component_class)
         self.Components[component_class] = component_instance
+        self._ComponentLookup.clear()
+
+        if self._IsActive and self.Scene is not None:
+            if previous is not None:
+                self.Scene._UnregisterComponent(self, previous)
+            self.Scene._RegisterComponent(self, component_instance)
 
         if self._IsActive and isinstance(component_instance, GameScript):
             component_instance.OnActivate()
@@ -52,15 +102,20 @@ class GameEntity:
         return component_instance
 
     def GetComponent(self, component_class):
-        if component_class in self.Components:
-            return self.Components[component_class]
+        try:
+            return self._ComponentLookup[component_class]
+        except KeyError:
+            pass
+
+        instance = self.Components.get(component_class)
+        if instance is None:
+            for cls, candidate in self.Components.items():
+                if issubclass(cls, component_class):
+                    instance = candidate
+                    break
 
-        for cls, instance in self.Components.items():
-            if issubclass(cls, component_class):
-                return instance
-        return None
+        self._ComponentLookup[component_class] = instance
+        return instance
 
     def HasComponent(self, component_class):
-        if component_class in self.Components:
-            return True
-        return any(issubclass(cls, component_class) for cls in self.Components.keys())
+        return self.GetComponent(component_class) is not None
@@ -2,31 +2,24 @@ import math
 import numpy as np
 from .Vector3 import Vector3
 
+_IDENTITY = np.identity(4, dtype=np.float32).ravel()
+
 
 class Matrix4:
     def __init__(self):
-        self.M = [0.0] * 16
-        self.Identity()
+        self._M = _IDENTITY.copy()
+        self._M44 = self._M.reshape(4, 4)
+
+    @property
+    def M(self):
+        return self._M
+
+    @M.setter
+    def M(self, values):
+        self._M[:] = values
 
     def Identity(self):
-        self.M = [
-            1.0,
-            0.0,
-            0.0,
-            0.0,
-            0.0,
-            1.0,
-            0.0,
-            0.0,
-            0.0,
-            0.0,
-            1.0,
-            0.0,
-            0.0,
-            0.0,
-            0.0,
-            1.0,
-        ]
+        self._M[:] = _IDENTITY
 
     @staticmethod
     def Perspective(fov_rad, aspect, near, far):
@@ -70,15 +63,117 @@ class Matrix4:
         mat.M[10] = c
         return mat
 
+    @staticmethod
+    def RotateZ(angle_rad):
+        mat = Matrix4()
+        c = math.cos(angle_rad)
+        s = math.sin(angle_rad)
+        mat.M[0] = c
+        mat.M[1] = s
+        mat.M[4] = -s
+        mat.M[5] = c
+        return mat
+
+    @staticmethod
+    def Scale(v: Vector3):
+        mat = Matrix4()
+        mat.M[0] = v.X
+        mat.M[5] = v.Y
+        mat.M[10] = v.Z
+        return mat
+
+    @staticmethod
+    def TRSBatch(positions, rotations, scales, out=None):
+        """Builds Translate * RotateY * RotateX * RotateZ * Scale for N transforms.
+
+        Inputs are (N, 3) arrays, rotations in radians. Returns an (N, 4, 4)
+        float32 stack where each matrix is laid out like ``Matrix4.M``
+        (column-major), ready for glUniformMatrix4fv or an instance buffer.
+        """
+        positions = np.asarray(positions, dtype=np.float32)
+        rotations = np.asarray(rotations, dtype=np.float32)
+        scales = np.asarray(scales, dtype=np.float32)
+
+        count = positions.shape[0]
+        if out is None:
+            out = np.empty((count, 4, 4), dtype=np.float32)
+
+        cos = np.cos(rotations)
+        sin = np.sin(rotations)
+        cx, cy, cz = cos[:, 0], cos[:, 1], cos[:, 2]
+        sx, sy, sz = sin[:, 0], sin[:, 1], sin[:, 2]
+        sysx = sy * sx
+        cysx = cy * sx
+
+        col = out[:, 0]
+        col[:, 0] = (cy * cz + sysx * sz) * scales[:, 0]
+        col[:, 1] = cx * sz * scales[:, 0]
+        col[:, 2] = (cysx * sz - sy * cz) * scales[:, 0]
+        col[:, 3] = 0.0
+
+        col = out[:, 1]
+        col[:, 0] = (sysx * cz - cy * sz) * scales[:, 1]
+        col[:, 1] = cx * cz * scales[:, 1]
+        col[:, 2] = (sy * sz + cysx * cz) * scales[:, 1]
+        col[:, 3] = 0.0
+
+        col = out[:, 2]
+        col[:, 0] = sy * cx * scales[:, 2]
+        col[:, 1] = -sx * scales[:, 2]
+        col[:, 2] = cy * cx * scales[:, 2]
+        col[:, 3] = 0.0
+
+        out[:, 3, :3] = positions
+        out[:, 3, 3] = 1.0
+        return out
+
+    @staticmethod
+    def TRS(position: Vector3, rotation: Vector3, scale: Vector3, out=None):
+        mat = out if out is not None else Matrix4()
+        cx, sx = math.cos(rotation.X), math.sin(rotation.X)
+        cy, sy = math.cos(rotation.Y), math.sin(rotation.Y)
+        cz, sz = math.cos(rotation.Z), math.sin(rotation.Z)
+        sysx = sy * sx
+        cysx = cy * sx
+        kx, ky, kz = scale.X, scale.Y, scale.Z
+
+        mat._M[:] = (
+            (cy * cz + sysx * sz) * kx,
+            cx * sz * kx,
+            (cysx * sz - sy * cz) * kx,
+            0.0,
+            (sysx * cz - cy * sz) * ky,
+            cx * cz * ky,
+            (sy * sz + cysx * cz) * ky,
+            0.0,
+            sy * cx * kz,
+            -sx * kz,
+            cy * cx * kz,
+            0.0,
+            position.X,
+            position.Y,
+            position.Z,
+            1.0,
+        )
+        return mat
+
     def Multiply(self, other):
-        res = Matrix4()
-        for r in range(4):
-            for c in range(4):
-                val = 0.0
-                for i in range(4):
-                    val += self.M[i * 4 + r] * other.M[c * 4 + i]
-                res.M[c * 4 + r] = val
+        res = Matrix4.__new__(Matrix4)
+        res._M44 = np.matmul(other._M44, self._M44)
+        res._M = res._M44.reshape(16)
+        return res
+
+    def MultiplyInto(self, other, out):
+        # M is column-major, so the stored 4x4 blocks are transposed and
+        # self * other becomes other @ self.
+        np.matmul(other._M44, self._M44, out=out._M44)
+        return out
+
+    def Copy(self):
+        res = Matrix4.__new__(Matrix4)
+        res._M = self._M.copy()
+        res._M44 = res._M.reshape(4, 4)
         return res
 
     def ToArray(self):
-        return np.array(self.M, dtype=np.float32)
+        return self._M
@@ -1,15 +1,335 @@
+import math
+
 from .Vector3 import Vector3
 from .Matrix4 import Matrix4
 
 
+class _TransformVector3(Vector3):
+    __slots__ = ("_X", "_Y", "_Z", "_Transform")
+
+    def __init__(self, transform, x=0.0, y=0.0, z=0.0):
+        self._X = float(x)
+        self._Y = float(y)
+        self._Z = float(z)
+        self._Transform = transform
+
+    @property
+    def X(self):
+        return self._X
+
+    @X.setter
+    def X(self, value):
+        self._X = value
+        self._Transform._OnLocalChanged()
+
+    @property
+    def Y(self):
+        return self._Y
+
+    @Y.setter
+    def Y(self, value):
+        self._Y = value
+        self._Transform._OnLocalChanged()
+
+    @property
+    def Z(self):
+        return self._Z
+
+    @Z.setter
+    def Z(self, value):
+        self._Z = value
+        self._Transform._OnLocalChanged()
+
+    def Set(self, x, y, z):
+        self._X = x
+        self._Y = y
+        self._Z = z
+        self._Transform._OnLocalChanged()
+        return self
+
+
+class _StorageVector3(Vector3):
+    __slots__ = ("_Row", "_Transform")
+
+    def __init__(self, transform, row):
+        self._Row = row
+        self._Transform = transform
+
+    @property
+    def X(self):
+        return float(self._Row[0])
+
+    @X.setter
+    def X(self, value):
+        self._Row[0] = value
+        self._Transform._OnLocalChanged()
+
+    @property
+    def Y(self):
+        return float(self._Row[1])
+
+    @Y.setter
+    def Y(self, value):
+        self._Row[1] = value
+        self._Transform._OnLocalChanged()
+
+    @property
+    def Z(self):
+        return float(self._Row[2])
+
+    @Z.setter
+    def Z(self, value):
+        self._Row[2] = value
+        self._Transform._OnLocalChanged()
+
+    def Set(self, x, y, z):
+        row = self._Row
+        row[0] = x
+        row[1] = y
+        row[2] = z
+        self._Transform._OnLocalChanged()
+        return self
+
+
 class Transform:
-    def __init__(self):
-        self.Position = Vector3(0.0, 0.0, 0.0)
-        self.Rotation = Vector3(0.0, 0.0, 0.0)
-        self.Scale = Vector3(1.0, 1.0, 1.0)
+    def __init__(self, storage=None):
+        self._Storage = storage
+        if storage is not None:
+            self._Slot = storage.Allocate(self)
+            self._Position = _StorageVector3(self, storage.Positions[self._Slot])
+            self._Rotation = _StorageVector3(self, storage.Rotations[self._Slot])
+            self._Scale = _StorageVector3(self, storage.Scales[self._Slot])
+        else:
+            self._Slot = -1
+            self._Position = _TransformVector3(self, 0.0, 0.0, 0.0)
+            self._Rotation = _TransformVector3(self, 0.0, 0.0, 0.0)
+            self._Scale = _TransformVector3(self, 1.0, 1.0, 1.0)
+
+        self._Parent = None
+        self._Children = []
+        self._Depth = 0
+        self._Tracker = None
+
+        self._LocalDirty = True
+        self._WorldDirty = True
+        self._LocalMatrix = Matrix4()
+        self._WorldMatrix = Matrix4()
+        self._PassStamp = 0
+
+    @property
+    def Position(self):
+        return self._Position
+
+    @Position.setter
+    def Position(self, value):
+        self._Position.CopyFrom(value)
+
+    @property
+    def Rotation(self):
+        return self._Rotation
+
+    @Rotation.setter
+    def Rotation(self, value):
+        self._Rotation.CopyFrom(value)
+
+    @property
+    def Scale(self):
+        return self._Scale
+
+    @Scale.setter
+    def Scale(self, value):
+        self._Scale.CopyFrom(value)
+
+    @property
+    def WorldPosition(self):
+        m = self.GetWorldMatrix().M
+        return Vector3(m[12], m[13], m[14])
+
+    def GetLookDirections(self):
+        """World-space (forward, up hint) unit tuples for cameras and lights.
+
+        Their Rotation is pitch (X) and yaw (Y) in degrees, unlike the
+        radians model matrices use; the parent's world matrix is applied on
+        top so they follow the hierarchy.
+        """
+        pitch = math.radians(self._Rotation.X)
+        yaw = math.radians(self._Rotation.Y)
+        forward = (
+            math.sin(yaw) * math.cos(pitch),
+            -math.sin(pitch),
+            math.cos(yaw) * math.cos(pitch),
+        )
+        up = (0.0, 1.0, 0.0)
+        if self._Parent is not None:
+            m = self._Parent.GetWorldMatrix().M.tolist()
+            forward = _rotate_direction(m, forward)
+            up = _rotate_direction(m, up)
+        return _unit(forward, (0.0, 0.0, 1.0)), _unit(up, (0.0, 1.0, 0.0))
+
+    @property
+    def Parent(self):
+        return self._Parent
+
+    @property
+    def Children(self):
+        return tuple(self._Children)
+
+    @property
+    def Depth(self):
+        return self._Depth
+
+    @property
+    def IsDirty(self):
+        self._SyncStorage()
+        return self._WorldDirty
+
+    @property
+    def Storage(self):
+        return self._Storage
+
+    @property
+    def StorageSlot(self):
+        return self._Slot
+
+    def SetParent(self, parent):
+        if parent is self._Parent:
+            return
+
+        node = parent
+        while node is not None:
+            if node is self:
+                raise ValueError("Cannot parent a Transform to itself or its child")
+            node = node._Parent
+
+        if self._Parent is not None:
+            self._Parent._Children.remove(self)
+        self._Parent = parent
+        if parent is not None:
+            parent._Children.append(self)
+            parent._SyncStorage()
+        if self._Storage is not None:
+            self._Storage.HasParent[self._Slot] = parent is not None
+            self._Storage._Parents = None
+
+        depth = parent._Depth + 1 if parent is not None else 0
+        stack = [(self, depth)]
+        while stack:
+            node, depth = stack.pop()
+            node._Depth = depth
+            for child in node._Children:
+                stack.append((child, depth + 1))
+
+        if self._WorldDirty:
+            # Already queued somewhere above; make sure the new location is too.
+            if self._Tracker is not None:
+                self._Tracker.append(self)
+        else:
+            self._InvalidateWorld()
+
+    def GetLocalMatrix(self):
+        self._SyncStorage()
+        if self._LocalDirty:
+            Matrix4.TRS(
+                self._Position, self._Rotation, self._Scale, out=self._LocalMatrix
+            )
+            self._LocalDirty = False
+        return self._LocalMatrix
 
     def GetWorldMatrix(self):
-        pos_mat = Matrix4.Translate(self.Position)
-        rot_y = Matrix4.RotateY(self.Rotation.Y)
-        rot_x = Matrix4.RotateX(self.Rotation.X)
-        return pos_mat.Multiply(rot_y).Multiply(rot_x)
+        self._SyncStorage()
+        if self._WorldDirty:
+            chain = []
+            node = self
+            while node is not None and node._WorldDirty:
+                chain.append(node)
+                node = node._Parent
+            for node in reversed(chain):
+                node._UpdateWorld()
+        return self._WorldMatrix
+
+    def GetWorldMatrixArray(self):
+        return self.GetWorldMatrix().ToArray()
+
+    def _UpdateWorld(self):
+        local = self.GetLocalMatrix()
+        if self._Parent is not None:
+            self._Parent._WorldMatrix.MultiplyInto(local, self._WorldMatrix)
+        else:
+            self._WorldMatrix.M = local.M
+        self._WorldDirty = False
+
+    def _OnLocalChanged(self):
+        self._LocalDirty = True
+        if self._Storage is not None:
+            self._Storage.Dirty[self._Slot] = True
+            self._Storage.Moved[self._Slot] = True
+        if not self._WorldDirty:
+            self._InvalidateWorld()
+
+    def _SyncStorage(self):
+        # Picks up rows written in bulk through TransformStorage.MarkDirty.
+        storage = self._Storage
+        if storage is not None and storage.Stale[self._Slot]:
+            storage.Stale[self._Slot] = False
+            self._LocalDirty = True
+            if not self._WorldDirty:
+                self._InvalidateWorld()
+
+    def _BindStorageRows(self):
+        storage = self._Storage
+        self._Position._Row = storage.Positions[self._Slot]
+        self._Rotation._Row = storage.Rotations[self._Slot]
+        self._Scale._Row = storage.Scales[self._Slot]
+
+    def _InvalidateWorld(self):
+        # A dirty Transform always has a dirty subtree, so the walk can stop
+        # at the first node that is already flagged.
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node._WorldDirty:
+                continue
+            node._WorldDirty = True
+            stack.extend(node._Children)
+
+        if self._Tracker is not None:
+            self._Tracker.append(self)
+
+
+def _rotate_direction(m, d):
+    x, y, z = d
+    return (
+        m[0] * x + m[4] * y + m[8] * z,
+        m[1] * x + m[5] * y + m[9] * z,
+        m[2] * x + m[6] * y + m[10] * z,
+    )
+
+
+def _unit(v, fallback):
+    length = math.sqrt(v[0] * v[0] + v[1] * v[1] + v[2] * v[2])
+    if length < 1e-9:
+        return fallback
+    return (v[0] / length, v[1] / length, v[2] / length)
+
+
+def UpdateWorldMatrices(roots, stamp):
+    roots.sort(key=_transform_depth)
+    for root in roots:
+        if root._PassStamp == stamp:
+            continue
+
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node._PassStamp == stamp:
+                continue
+            node._PassStamp = stamp
+            if node._WorldDirty:
+                if node._Parent is not None and node._Parent._WorldDirty:
+                    node._Parent.GetWorldMatrix()
+                node._UpdateWorld()
+            stack.extend(node._Children)
+
+
+def _transform_depth(transform):
+    return transform._Depth
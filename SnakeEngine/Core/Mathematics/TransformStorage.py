@@ -0,0 +1,155 @@
+import numpy as np
+
+from .Matrix4 import Matrix4
+
+
+class TransformStorage:
+    def __init__(self, capacity: int = 1024):
+        capacity = max(1, int(capacity))
+        self.Positions = np.zeros((capacity, 3), dtype=np.float32)
+        self.Rotations = np.zeros((capacity, 3), dtype=np.float32)
+        self.Scales = np.ones((capacity, 3), dtype=np.float32)
+        self.Dirty = np.ones(capacity, dtype=np.bool_)
+        # Like Dirty, but only cleared by whoever tracks movement (the
+        # scene's spatial index), not by matrix rebuilds.
+        self.Moved = np.ones(capacity, dtype=np.bool_)
+        self.HasParent = np.zeros(capacity, dtype=np.bool_)
+        # Rows changed through MarkDirty whose Transform still holds cached
+        # matrices; each Transform clears its own flag when next used.
+        self.Stale = np.zeros(capacity, dtype=np.bool_)
+        self.LocalMatrices = np.zeros((capacity, 4, 4), dtype=np.float32)
+        self.Count = 0
+
+        self._Transforms = []
+        # (slots, transforms) of the parents in this storage; rebuilt lazily
+        # after SetParent changes the hierarchy.
+        self._Parents = None
+
+    @property
+    def Capacity(self) -> int:
+        return self.Positions.shape[0]
+
+    @property
+    def Transforms(self):
+        return self._Transforms
+
+    def Allocate(self, transform) -> int:
+        if self.Count == self.Capacity:
+            self._Grow(self.Capacity * 2)
+
+        slot = self.Count
+        self.Count += 1
+        self.Positions[slot] = 0.0
+        self.Rotations[slot] = 0.0
+        self.Scales[slot] = 1.0
+        self.Dirty[slot] = True
+        self.Moved[slot] = True
+        self.HasParent[slot] = False
+        self.Stale[slot] = False
+        self._Transforms.append(transform)
+        return slot
+
+    def UpdateLocalMatrices(self):
+        dirty = np.flatnonzero(self.Dirty[: self.Count])
+        if dirty.size == 0:
+            return
+        if dirty.size == self.Count:
+            count = self.Count
+            Matrix4.TRSBatch(
+                self.Positions[:count],
+                self.Rotations[:count],
+                self.Scales[:count],
+                out=self.LocalMatrices[:count],
+            )
+        else:
+            self.LocalMatrices[dirty] = Matrix4.TRSBatch(
+                self.Positions[dirty], self.Rotations[dirty], self.Scales[dirty]
+            )
+        self.Dirty[dirty] = False
+
+    def GetWorldMatrices(self, slots):
+        self.UpdateLocalMatrices()
+        out = self.LocalMatrices[slots]
+
+        parented = np.flatnonzero(self.HasParent[slots])
+        if parented.size:
+            transforms = self._Transforms
+            parent_worlds = np.stack(
+                [
+                    transforms[slot]._Parent.GetWorldMatrixArray()
+                    for slot in slots[parented]
+                ]
+            ).reshape(-1, 4, 4)
+            # Rows hold Matrix4.M (column-major), so parent * local is local @ parent.
+            out[parented] = np.matmul(out[parented], parent_worlds)
+        return out
+
+    def MarkDirty(self, slots=None):
+        count = self.Count
+        if slots is None:
+            slots = slice(0, count)
+        else:
+            slots = np.asarray(slots)
+            if slots.dtype == np.bool_:
+                slots = np.flatnonzero(slots[:count])
+        self.Dirty[slots] = True
+        self.Moved[slots] = True
+        self.Stale[slots] = True
+
+        # Children cache world matrices built from their parent's, so stale
+        # parents must invalidate their subtree now rather than lazily.
+        if self._Parents is None:
+            self._Parents = self._CollectParents()
+        parent_slots, parents = self._Parents
+        stale = np.flatnonzero(self.Stale[parent_slots])
+        if stale.size == 0:
+            return
+        self.Stale[parent_slots[stale]] = False
+        for index in stale.tolist():
+            parent = parents[index]
+            parent._LocalDirty = True
+            if not parent._WorldDirty:
+                parent._InvalidateWorld()
+
+    def _CollectParents(self):
+        transforms = self._Transforms
+        parents = {}
+        for slot in np.flatnonzero(self.HasParent[: self.Count]).tolist():
+            parent = transforms[slot]._Parent
+            if parent._Storage is self:
+                parents[parent._Slot] = parent
+        slots = np.fromiter(parents, dtype=np.intp, count=len(parents))
+        return slots, list(parents.values())
+
+    def _Grow(self, capacity: int):
+        count = self.Count
+
+        positions = np.zeros((capacity, 3), dtype=np.float32)
+        rotations = np.zeros((capacity, 3), dtype=np.float32)
+        scales = np.ones((capacity, 3), dtype=np.float32)
+        dirty = np.ones(capacity, dtype=np.bool_)
+        moved = np.ones(capacity, dtype=np.bool_)
+        has_parent = np.zeros(capacity, dtype=np.bool_)
+        stale = np.zeros(capacity, dtype=np.bool_)
+        local_matrices = np.zeros((capacity, 4, 4), dtype=np.float32)
+
+        positions[:count] = self.Positions[:count]
+        rotations[:count] = self.Rotations[:count]
+        scales[:count] = self.Scales[:count]
+        dirty[:count] = self.Dirty[:count]
+        moved[:count] = self.Moved[:count]
+        has_parent[:count] = self.HasParent[:count]
+        stale[:count] = self.Stale[:count]
+        local_matrices[:count] = self.LocalMatrices[:count]
+
+        self.Positions = positions
+        self.Rotations = rotations
+        self.Scales = scales
+        self.Dirty = dirty
+        self.Moved = moved
+        self.HasParent = has_parent
+        self.Stale = stale
+        self.LocalMatrices = local_matrices
+
+        for transform in self._Transforms:
+            transform._BindStorageRows()
@@ -2,6 +2,8 @@ import math
 
 
 class Vector2:
+    __slots__ = ("X", "Y")
+
     def __init__(self, X=0.0, Y=0.0):
         self.X = float(X)
         self.Y = float(Y)
@@ -12,27 +14,25 @@ class Vector2:
     def __str__(self):
         return f"({self.X}, {self.Y})"
 
-    def _to_vec(self, other):
-        if isinstance(other, (int, float)):
-            return Vector2(other, other)
-        return other
-
     def Copy(self):
         return Vector2(self.X, self.Y)
 
     def __add__(self, other):
-        other = self._to_vec(other)
+        if isinstance(other, (int, float)):
+            return Vector2(self.X + other, self.Y + other)
         return Vector2(self.X + other.X, self.Y + other.Y)
 
     def __sub__(self, other):
-        other = self._to_vec(other)
+        if isinstance(other, (int, float)):
+            return Vector2(self.X - other, self.Y - other)
         return Vector2(self.X - other.X, self.Y - other.Y)
 
+    def __neg__(self):
+        return Vector2(-self.X, -self.Y)
+
     def __mul__(self, value):
         if isinstance(value, (int, float)):
             return Vector2(self.X * value, self.Y * value)
-
-        value = self._to_vec(value)
         return Vector2(self.X * value.X, self.Y * value.Y)
 
     def __truediv__(self, value):
@@ -41,22 +41,59 @@ class Vector2:
         raise TypeError("Vector2 division only supports scalar")
 
     def __iadd__(self, other):
-        other = self._to_vec(other)
-        self.X += other.X
-        self.Y += other.Y
-        return self
+        if isinstance(other, (int, float)):
+            return self.Set(self.X + other, self.Y + other)
+        return self.Set(self.X + other.X, self.Y + other.Y)
 
     def __isub__(self, other):
-        other = self._to_vec(other)
-        self.X -= other.X
-        self.Y -= other.Y
-        return self
+        if isinstance(other, (int, float)):
+            return self.Set(self.X - other, self.Y - other)
+        return self.Set(self.X - other.X, self.Y - other.Y)
+
+    def __imul__(self, value):
+        if isinstance(value, (int, float)):
+            return self.Set(self.X * value, self.Y * value)
+        return self.Set(self.X * value.X, self.Y * value.Y)
+
+    def __itruediv__(self, value):
+        if isinstance(value, (int, float)):
+            return self.Set(self.X / value, self.Y / value)
+        raise TypeError("Vector2 division only supports scalar")
 
     def __rmul__(self, value):
         return self.__mul__(value)
 
+    def Set(self, x, y):
+        self.X = x
+        self.Y = y
+        return self
+
+    def CopyFrom(self, other):
+        return self.Set(other.X, other.Y)
+
+    def AddScaled(self, other, factor):
+        return self.Set(self.X + other.X * factor, self.Y + other.Y * factor)
+
+    def ScaleInPlace(self, factor):
+        return self.Set(self.X * factor, self.Y * factor)
+
+    def NormalizeInPlace(self):
+        length = math.sqrt(self.X * self.X + self.Y * self.Y)
+        if length == 0:
+            return self.Set(0.0, 0.0)
+        return self.Set(self.X / length, self.Y / length)
+
+    def LerpInto(self, a, b, t):
+        return self.Set(a.X + (b.X - a.X) * t, a.Y + (b.Y - a.Y) * t)
+
+    def Lerp(self, other, t):
+        return Vector2(self.X + (other.X - self.X) * t, self.Y + (other.Y - self.Y) * t)
+
     def Length(self):
-        return math.sqrt(self.X**2 + self.Y**2)
+        return math.sqrt(self.X * self.X + self.Y * self.Y)
+
+    def LengthSquared(self):
+        return self.X * self.X + self.Y * self.Y
 
     def Normalize(self):
         length = self.Length()
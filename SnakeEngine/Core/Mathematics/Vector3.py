@@ -2,6 +2,8 @@ import math
 
 
 class Vector3:
+    __slots__ = ("X", "Y", "Z")
+
     def __init__(self, x=0.0, y=0.0, z=0.0):
         self.X = float(x)
         self.Y = float(y)
@@ -13,53 +15,99 @@ class Vector3:
     def __str__(self):
         return f"({self.X}, {self.Y}, {self.Z})"
 
-    def _to_vec(self, other):
-        if isinstance(other, (int, float)):
-            return Vector3(other, other, other)
-        return other
-
     def Copy(self):
         return Vector3(self.X, self.Y, self.Z)
 
     def __add__(self, other):
-        other = self._to_vec(other)
+        if isinstance(other, (int, float)):
+            return Vector3(self.X + other, self.Y + other, self.Z + other)
         return Vector3(self.X + other.X, self.Y + other.Y, self.Z + other.Z)
 
     def __sub__(self, other):
-        other = self._to_vec(other)
+        if isinstance(other, (int, float)):
+            return Vector3(self.X - other, self.Y - other, self.Z - other)
         return Vector3(self.X - other.X, self.Y - other.Y, self.Z - other.Z)
 
+    def __neg__(self):
+        return Vector3(-self.X, -self.Y, -self.Z)
+
     def __iadd__(self, other):
-        other = self._to_vec(other)
-        self.X += other.X
-        self.Y += other.Y
-        self.Z += other.Z
-        return self
+        if isinstance(other, (int, float)):
+            return self.Set(self.X + other, self.Y + other, self.Z + other)
+        return self.Set(self.X + other.X, self.Y + other.Y, self.Z + other.Z)
 
     def __isub__(self, other):
-        other = self._to_vec(other)
-        self.X -= other.X
-        self.Y -= other.Y
-        self.Z -= other.Z
-        return self
+        if isinstance(other, (int, float)):
+            return self.Set(self.X - other, self.Y - other, self.Z - other)
+        return self.Set(self.X - other.X, self.Y - other.Y, self.Z - other.Z)
 
     def __mul__(self, value):
         if isinstance(value, (int, float)):
             return Vector3(self.X * value, self.Y * value, self.Z * value)
-
-        value = self._to_vec(value)
         return Vector3(self.X * value.X, self.Y * value.Y, self.Z * value.Z)
 
     def __rmul__(self, value):
         return self.__mul__(value)
 
+    def __imul__(self, value):
+        if isinstance(value, (int, float)):
+            return self.Set(self.X * value, self.Y * value, self.Z * value)
+        return self.Set(self.X * value.X, self.Y * value.Y, self.Z * value.Z)
+
     def __truediv__(self, value):
         if isinstance(value, (int, float)):
             return Vector3(self.X / value, self.Y / value, self.Z / value)
         raise TypeError("Vector3 division only supports scalar")
 
+    def __itruediv__(self, value):
+        if isinstance(value, (int, float)):
+            return self.Set(self.X / value, self.Y / value, self.Z / value)
+        raise TypeError("Vector3 division only supports scalar")
+
+    def Set(self, x, y, z):
+        self.X = x
+        self.Y = y
+        self.Z = z
+        return self
+
+    def CopyFrom(self, other):
+        return self.Set(other.X, other.Y, other.Z)
+
+    def AddScaled(self, other, factor):
+        return self.Set(
+            self.X + other.X * factor,
+            self.Y + other.Y * factor,
+            self.Z + other.Z * factor,
+        )
+
+    def ScaleInPlace(self, factor):
+        return self.Set(self.X * factor, self.Y * factor, self.Z * factor)
+
+    def NormalizeInPlace(self):
+        length = math.sqrt(self.X * self.X + self.Y * self.Y + self.Z * self.Z)
+        if length == 0:
+            return self.Set(0.0, 0.0, 0.0)
+        return self.Set(self.X / length, self.Y / length, self.Z / length)
+
+    def LerpInto(self, a, b, t):
+        return self.Set(
+            a.X + (b.X - a.X) * t,
+            a.Y + (b.Y - a.Y) * t,
+            a.Z + (b.Z - a.Z) * t,
+        )
+
+    def Lerp(self, other, t):
+        return Vector3(
+            self.X + (other.X - self.X) * t,
+            self.Y + (other.Y - self.Y) * t,
+            self.Z + (other.Z - self.Z) * t,
+        )
+
     def Length(self):
-        return math.sqrt(self.X**2 + self.Y**2 + self.Z**2)
+        return math.sqrt(self.X * self.X + self.Y * self.Y + self.Z * self.Z)
+
+    def LengthSquared(self):
+        return self.X * self.X + self.Y * self.Y + self.Z * self.Z
 
     def Normalize(self):
         length = self.Length()
@@ -71,7 +119,8 @@ class Vector3:
         return self.X * other.X + self.Y * other.Y + self.Z * other.Z
 
     def Cross(self, other):
-        other = self._to_vec(other)
+        if isinstance(other, (int, float)):
+            other = Vector3(other, other, other)
         return Vector3(
             self.Y * other.Z - self.Z * other.Y,
             self.Z * other.X - self.X * other.Z,
@@ -0,0 +1,189 @@
+import numpy as np
+
+from .Vector3 import Vector3
+
+_ATTRIBUTES = {
+    "Position": "Positions",
+    "Rotation": "Rotations",
+    "Scale": "Scales",
+}
+
+
+def _operand(value):
+    if isinstance(value, Vector3Array):
+        return value.Data
+    if isinstance(value, Vector3):
+        return np.array((value.X, value.Y, value.Z), dtype=np.float32)
+    return np.asarray(value, dtype=np.float32)
+
+
+class Vector3Array:
+    __slots__ = ("Data",)
+
+    def __init__(self, data=None, count: int = 0):
+        if data is None:
+            self.Data = np.zeros((count, 3), dtype=np.float32)
+        else:
+            data = np.asarray(data, dtype=np.float32)
+            self.Data = data.reshape(-1, 3) if data.ndim != 2 else data
+
+    def __repr__(self):
+        return f"Vector3Array({len(self)})"
+
+    def __len__(self):
+        return self.Data.shape[0]
+
+    def __iter__(self):
+        for x, y, z in self.Data.tolist():
+            yield Vector3(x, y, z)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            x, y, z = self.Data[index].tolist()
+            return Vector3(x, y, z)
+        return Vector3Array(self.Data[index])
+
+    def __setitem__(self, index, value):
+        self.Data[index] = _operand(value)
+
+    @property
+    def X(self):
+        return self.Data[:, 0]
+
+    @property
+    def Y(self):
+        return self.Data[:, 1]
+
+    @property
+    def Z(self):
+        return self.Data[:, 2]
+
+    @staticmethod
+    def Zeros(count: int):
+        return Vector3Array(count=count)
+
+    @staticmethod
+    def Filled(count: int, value: Vector3):
+        data = np.empty((count, 3), dtype=np.float32)
+        data[:] = _operand(value)
+        return Vector3Array(data)
+
+    @staticmethod
+    def FromVectors(vectors):
+        data = np.array([(v.X, v.Y, v.Z) for v in vectors], dtype=np.float32)
+        return Vector3Array(data.reshape(-1, 3))
+
+    def ToVectors(self):
+        return [Vector3(x, y, z) for x, y, z in self.Data.tolist()]
+
+    @staticmethod
+    def FromStorage(storage, attribute: str = "Position", slots=None):
+        """Reads a TransformStorage column.
+
+        Without ``slots`` the result is a zero-copy view of every live row;
+        in-place edits must be followed by ``storage.MarkDirty()``.
+        """
+        column = getattr(storage, _ATTRIBUTES[attribute])
+        if slots is None:
+            return Vector3Array(column[: storage.Count])
+        return Vector3Array(column[slots])
+
+    def CopyToStorage(self, storage, attribute: str = "Position", slots=None):
+        column = getattr(storage, _ATTRIBUTES[attribute])
+        if slots is None:
+            if len(self) != storage.Count:
+                raise ValueError(
+                    f"Vector3Array has {len(self)} rows, storage has {storage.Count}"
+                )
+            column[: storage.Count] = self.Data
+        else:
+            column[slots] = self.Data
+        storage.MarkDirty(slots)
+
+    def Copy(self):
+        return Vector3Array(self.Data.copy())
+
+    def __add__(self, other):
+        return Vector3Array(self.Data + _operand(other))
+
+    def __radd__(self, other):
+        return Vector3Array(_operand(other) + self.Data)
+
+    def __sub__(self, other):
+        return Vector3Array(self.Data - _operand(other))
+
+    def __rsub__(self, other):
+        return Vector3Array(_operand(other) - self.Data)
+
+    def __mul__(self, value):
+        return Vector3Array(self.Data * _factor(value, len(self)))
+
+    def __rmul__(self, value):
+        return self.__mul__(value)
+
+    def __truediv__(self, value):
+        return Vector3Array(self.Data / _factor(value, len(self)))
+
+    def __neg__(self):
+        return Vector3Array(-self.Data)
+
+    def __iadd__(self, other):
+        self.Data += _operand(other)
+        return self
+
+    def __isub__(self, other):
+        self.Data -= _operand(other)
+        return self
+
+    def __imul__(self, value):
+        self.Data *= _factor(value, len(self))
+        return self
+
+    def __itruediv__(self, value):
+        self.Data /= _factor(value, len(self))
+        return self
+
+    def AddScaled(self, other, factor):
+        self.Data += _operand(other) * _factor(factor, len(self))
+        return self
+
+    def LerpInto(self, a, b, t):
+        # a may be self.Data, so build the result before writing it back.
+        a = _operand(a)
+        np.copyto(self.Data, a + (_operand(b) - a) * _factor(t, len(self)))
+        return self
+
+    def Length(self):
+        return np.sqrt(self.LengthSquared())
+
+    def LengthSquared(self):
+        return np.einsum("ij,ij->i", self.Data, self.Data)
+
+    def Normalize(self):
+        return self.Copy().NormalizeInPlace()
+
+    def NormalizeInPlace(self):
+        length = self.Length()
+        np.divide(
+            self.Data, length[:, None], out=self.Data, where=length[:, None] > 0.0
+        )
+        return self
+
+    def Dot(self, other):
+        other = _operand(other)
+        if other.ndim == 1:
+            return self.Data @ other
+        return np.einsum("ij,ij->i", self.Data, other)
+
+    def Cross(self, other):
+        return Vector3Array(np.cross(self.Data, _operand(other)))
+
+
+def _factor(value, rows: int):
+    # A 1-D array always holds one scalar per row, whatever the row count;
+    # per-component factors come as a Vector3, tuple or (N, 3) array.
+    if isinstance(value, np.ndarray) and value.ndim == 1:
+        if value.shape[0] != rows:
+            raise ValueError(f"Expected {rows} per-row factors, got {value.shape[0]}")
+        return value[:, None]
+    return _operand(value)
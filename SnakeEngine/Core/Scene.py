@@ -1,11 +1,313 @@
+import math
+
+import numpy as np
+
 from .GameEntity import GameEntity
+from .SpatialGrid import SpatialHashGrid
+from .Mathematics.Transform import UpdateWorldMatrices
+from .Mathematics.TransformStorage import TransformStorage
+from ..Rendering.Frustum import transform_spheres
 
 
 class Scene:
-    def __init__(self):
+    def __init__(self, transform_storage: bool = False, spatial_cell_size: float = 8.0):
         self.Entities = []
+        self.TransformStorage = TransformStorage() if transform_storage else None
+        self.SpatialIndex = SpatialHashGrid(spatial_cell_size)
+
+        self._ActiveEntities = {}
+        self._ComponentIndex = {}
+        self._QueryCache = {}
+        self._NextOrder = 0
+        self._Listeners = []
+
+        self._DirtyTransforms = []
+        self._TransformPass = 0
+        self._SlotCache = {}
+
+        # Entities whose bounds need refreshing in SpatialIndex.
+        self._SpatialPending = {}
+        self._LocalBounds = {}
+        self._TransformOwners = {}
 
     def CreateEntity(self):
-        entity = GameEntity()
+        entity = GameEntity(self)
+        entity._SceneOrder = self._NextOrder
+        self._NextOrder += 1
         self.Entities.append(entity)
+        self._TransformOwners[entity.Transform] = entity
+
+        if self.TransformStorage is None:
+            # Storage-backed scenes build world matrices in batches instead,
+            # so their transforms only resolve lazily when asked directly.
+            entity.Transform._Tracker = self._DirtyTransforms
+            self._DirtyTransforms.append(entity.Transform)
+
+        if entity.IsActive:
+            self._RegisterEntity(entity)
         return entity
+
+    def Query(self, *component_classes):
+        key = component_classes
+        result = self._QueryCache.get(key)
+        if result is not None:
+            return result
+
+        if not component_classes:
+            candidates = self._ActiveEntities
+        else:
+            buckets = []
+            for cls in component_classes:
+                bucket = self._ComponentIndex.get(cls)
+                if not bucket:
+                    buckets = None
+                    break
+                buckets.append(bucket)
+
+            if buckets is None:
+                candidates = ()
+            else:
+                buckets.sort(key=len)
+                first, rest = buckets[0], buckets[1:]
+                candidates = [e for e in first if all(e in bucket for bucket in rest)]
+
+        result = sorted(candidates, key=_scene_order)
+        self._QueryCache[key] = result
+        return result
+
+    def QueryComponents(self, component_class):
+        key = ("components", component_class)
+        result = self._QueryCache.get(key)
+        if result is not None:
+            return result
+
+        bucket = self._ComponentIndex.get(component_class, {})
+        result = [
+            comp
+            for entity in sorted(bucket, key=_scene_order)
+            for comp in bucket[entity]
+        ]
+        self._QueryCache[key] = result
+        return result
+
+    def UpdateTransforms(self):
+        if self.TransformStorage is not None:
+            self._CollectMovedSlots()
+        elif self._DirtyTransforms:
+            self._CollectMovedTransforms(self._DirtyTransforms)
+            self._TransformPass += 1
+            UpdateWorldMatrices(self._DirtyTransforms, self._TransformPass)
+            self._DirtyTransforms.clear()
+
+        self._UpdateSpatialIndex()
+
+    def QuerySphere(self, center, radius: float, component_class=None):
+        """Active entities whose bounds touch the sphere.
+
+        Spatial queries see positions as of the last UpdateTransforms().
+        """
+        self._UpdateSpatialIndex()
+        found = self.SpatialIndex.QuerySphere(_xyz(center), radius)
+        return _filter(found, component_class)
+
+    def QueryAABB(self, box_min, box_max, component_class=None):
+        self._UpdateSpatialIndex()
+        found = self.SpatialIndex.QueryAABB(_xyz(box_min), _xyz(box_max))
+        return _filter(found, component_class)
+
+    def QueryNearest(
+        self, point, k: int = 1, max_distance: float = math.inf, component_class=None
+    ):
+        """Up to ``k`` entities, nearest first, measured centre to centre."""
+        self._UpdateSpatialIndex()
+        predicate = None
+        if component_class is not None:
+            predicate = lambda entity: entity.HasComponent(component_class)
+        hits = self.SpatialIndex.QueryNearest(_xyz(point), k, max_distance, predicate)
+        return [entity for _, entity in hits]
+
+    def Raycast(self, origin, direction, max_distance: float = math.inf):
+        """Nearest (entity, distance) whose bounding sphere the ray hits, or None."""
+        self._UpdateSpatialIndex()
+        hit = self.SpatialIndex.Raycast(_xyz(origin), _xyz(direction), max_distance)
+        return (hit[1], hit[0]) if hit is not None else None
+
+    def GetModelMatrices(self, entities):
+        if not entities:
+            return np.empty((0, 4, 4), dtype=np.float32)
+
+        if self.TransformStorage is None:
+            return np.stack(
+                [entity.Transform.GetWorldMatrixArray() for entity in entities]
+            ).reshape(-1, 4, 4)
+
+        return self.TransformStorage.GetWorldMatrices(self._GetSlots(entities))
+
+    def _AddListener(self, listener):
+        if listener not in self._Listeners:
+            self._Listeners.append(listener)
+
+    def _RemoveListener(self, listener):
+        if listener in self._Listeners:
+            self._Listeners.remove(listener)
+
+    def _OnStaticChanged(self, entity):
+        for listener in self._Listeners:
+            handler = getattr(listener, "_OnStaticChanged", None)
+            if handler is not None:
+                handler(entity)
+
+    def _CollectMovedTransforms(self, roots):
+        owners = self._TransformOwners
+        pending = self._SpatialPending
+        active = self._ActiveEntities
+        seen = set()
+        stack = list(roots)
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            owner = owners.get(node)
+            if owner in active:
+                pending[owner] = None
+            stack.extend(node._Children)
+
+    def _CollectMovedSlots(self):
+        entities = self.Query()
+        if not entities:
+            return
+        storage = self.TransformStorage
+        slots = self._GetSlots(entities)
+        # Parented rows can move with their parent, so they are always
+        # refreshed.
+        moved = np.flatnonzero(storage.Moved[slots] | storage.HasParent[slots])
+        storage.Moved[slots] = False
+        pending = self._SpatialPending
+        for index in moved.tolist():
+            pending[entities[index]] = None
+
+    def _UpdateSpatialIndex(self):
+        if not self._SpatialPending:
+            return
+        entities = list(self._SpatialPending)
+        self._SpatialPending.clear()
+
+        if self.TransformStorage is None:
+            matrices = np.stack(
+                [entity.Transform.GetWorldMatrixArray() for entity in entities]
+            ).reshape(-1, 4, 4)
+        else:
+            slots = np.fromiter(
+                (entity.Transform.StorageSlot for entity in entities),
+                dtype=np.intp,
+                count=len(entities),
+            )
+            matrices = self.TransformStorage.GetWorldMatrices(slots)
+
+        centers = np.empty((len(entities), 3), dtype=np.float32)
+        radii = np.empty(len(entities), dtype=np.float32)
+        for index, entity in enumerate(entities):
+            centers[index], radii[index] = self._LocalBounds.get(entity, _POINT_BOUNDS)
+        world_centers, world_radii = transform_spheres(matrices, centers, radii)
+        self.SpatialIndex.UpdateMany(entities, world_centers, world_radii)
+
+    def _RefreshLocalBounds(self, entity):
+        bounds = _POINT_BOUNDS
+        for comp in entity.Components.values():
+            get_bounds = getattr(comp, "GetLocalBounds", None)
+            result = get_bounds() if get_bounds is not None else None
+            if result is not None and result[1] > bounds[1]:
+                bounds = result
+        self._LocalBounds[entity] = bounds
+        self._SpatialPending[entity] = None
+
+    def _GetSlots(self, entities):
+        cached = self._SlotCache.get(id(entities))
+        if cached is None or cached[0] is not entities:
+            slots = np.fromiter(
+                (entity.Transform.StorageSlot for entity in entities),
+                dtype=np.intp,
+                count=len(entities),
+            )
+            if len(self._SlotCache) >= 32:
+                self._SlotCache.clear()
+            cached = self._SlotCache[id(entities)] = (entities, slots)
+        return cached[1]
+
+    def _InvalidateQueries(self):
+        self._QueryCache.clear()
+        self._SlotCache.clear()
+
+    def _RegisterEntity(self, entity):
+        self._ActiveEntities[entity] = None
+        for comp in entity.Components.values():
+            self._RegisterComponent(entity, comp)
+        self._RefreshLocalBounds(entity)
+        self._InvalidateQueries()
+
+    def _UnregisterEntity(self, entity):
+        self._ActiveEntities.pop(entity, None)
+        for comp in entity.Components.values():
+            self._UnregisterComponent(entity, comp)
+        self._SpatialPending.pop(entity, None)
+        self._LocalBounds.pop(entity, None)
+        self.SpatialIndex.Remove(entity)
+        self._InvalidateQueries()
+
+    def _RegisterComponent(self, entity, component):
+        for cls in type(component).__mro__[:-1]:
+            bucket = self._ComponentIndex.get(cls)
+            if bucket is None:
+                bucket = self._ComponentIndex[cls] = {}
+            bucket.setdefault(entity, []).append(component)
+        if hasattr(component, "GetLocalBounds"):
+            # Lets the component report later bounds changes to this scene.
+            component._BoundsOwner = entity
+            self._RefreshLocalBounds(entity)
+        self._InvalidateQueries()
+
+        for listener in self._Listeners:
+            listener._OnComponentActivated(entity, component)
+
+    def _UnregisterComponent(self, entity, component):
+        for cls in type(component).__mro__[:-1]:
+            bucket = self._ComponentIndex.get(cls)
+            if bucket is None:
+                continue
+            comps = bucket.get(entity)
+            if comps is None:
+                continue
+            comps = [c for c in comps if c is not component]
+            if comps:
+                bucket[entity] = comps
+            else:
+                del bucket[entity]
+        if hasattr(component, "GetLocalBounds"):
+            if getattr(component, "_BoundsOwner", None) is entity:
+                component._BoundsOwner = None
+            if entity in self._ActiveEntities:
+                self._RefreshLocalBounds(entity)
+        self._InvalidateQueries()
+
+        for listener in self._Listeners:
+            listener._OnComponentDeactivated(entity, component)
+
+
+_POINT_BOUNDS = ((0.0, 0.0, 0.0), 0.0)
+
+
+def _scene_order(entity):
+    return entity._SceneOrder
+
+
+def _xyz(value):
+    if hasattr(value, "X"):
+        return (value.X, value.Y, value.Z)
+    return tuple(value)
+
+
+def _filter(entities, component_class):
+    if component_class is None:
+        return entities
+    return [entity for entity in entities if entity.HasComponent(component_class)]
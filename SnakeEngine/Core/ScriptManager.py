@@ -1,45 +1,114 @@
 from .GameScript import GameScript
 
+_PHASES = ("OnStart", "OnUpdate", "OnFixedUpdate")
+_phase_overrides = {}
+
+
+def _get_phase_overrides(script_class):
+    overrides = _phase_overrides.get(script_class)
+    if overrides is None:
+        overrides = tuple(
+            getattr(script_class, phase) is not getattr(GameScript, phase)
+            for phase in _PHASES
+        )
+        _phase_overrides[script_class] = overrides
+    return overrides
+
 
 class ScriptManager:
     def __init__(self):
 
         self._started_scripts = set()
+        self._scene = None
 
-    def _get_active_scripts(self, entities):
+        self._pending_start = {}
+        self._update_scripts = {}
+        self._fixed_update_scripts = {}
+        self._update_snapshot = ()
+        self._fixed_update_snapshot = ()
 
-        active_scripts = []
-        for entity in entities:
-            if not entity.IsActive:
-                continue
-            for comp in entity.Components.values():
-                if isinstance(comp, GameScript):
-                    active_scripts.append(comp)
-        return active_scripts
+    def Attach(self, scene):
+        if scene is self._scene:
+            return
+
+        if self._scene is not None:
+            self._scene._RemoveListener(self)
+
+        self._pending_start.clear()
+        self._update_scripts.clear()
+        self._fixed_update_scripts.clear()
+        self._update_snapshot = ()
+        self._fixed_update_snapshot = ()
 
-    def OnStart(self, entities):
+        self._scene = scene
+        if scene is not None:
+            scene._AddListener(self)
+            for script in scene.QueryComponents(GameScript):
+                self.Register(script)
+
+    def Register(self, script):
+        if script not in self._started_scripts:
+            self._pending_start[script] = None
+            return
+
+        _, updates, fixed_updates = _get_phase_overrides(type(script))
+        if updates:
+            self._update_scripts[script] = None
+            self._update_snapshot = None
+        if fixed_updates:
+            self._fixed_update_scripts[script] = None
+            self._fixed_update_snapshot = None
+
+    def Unregister(self, script):
+        self._pending_start.pop(script, None)
+        if self._update_scripts.pop(script, 0) is None:
+            self._update_snapshot = None
+        if self._fixed_update_scripts.pop(script, 0) is None:
+            self._fixed_update_snapshot = None
+
+    def _OnComponentActivated(self, entity, component):
+        if isinstance(component, GameScript):
+            self.Register(component)
+
+    def _OnComponentDeactivated(self, entity, component):
+        if isinstance(component, GameScript):
+            self.Unregister(component)
+
+    def OnStart(self, entities=None):
+        # entities is still accepted from older callers, but scripts now come
+        # from the attached scene.
+        if not self._pending_start:
+            return
+
+        for script in list(self._pending_start):
+            if self._pending_start.pop(script, 0) is not None:
+                continue
 
-        current_active = self._get_active_scripts(entities)
-        for script in current_active:
-            if script not in self._started_scripts:
+            if _get_phase_overrides(type(script))[0]:
                 script.OnStart()
-                self._started_scripts.add(script)
+            self._started_scripts.add(script)
+            self.Register(script)
 
-    def OnUpdate(self, entities, delta_time: float):
+    def OnUpdate(self, delta_time: float, *legacy):
+        # Older callers pass (entities, delta_time); the entity list is ignored.
+        if legacy:
+            delta_time = legacy[0]
 
-        self.OnStart(entities)
+        self.OnStart()
 
-        current_active = self._get_active_scripts(entities)
-        for script in current_active:
-            if script in self._started_scripts:
-                script.OnUpdate(delta_time)
+        if self._update_snapshot is None:
+            self._update_snapshot = tuple(self._update_scripts)
+        for script in self._update_snapshot:
+            script.OnUpdate(delta_time)
 
-    def OnFixedUpdate(self, entities, fixed_delta_time: float):
+    def OnFixedUpdate(self, fixed_delta_time: float, *legacy):
+        if legacy:
+            fixed_delta_time = legacy[0]
 
-        current_active = self._get_active_scripts(entities)
-        for script in current_active:
-            if script in self._started_scripts:
-                script.OnFixedUpdate(fixed_delta_time)
+        if self._fixed_update_snapshot is None:
+            self._fixed_update_snapshot = tuple(self._fixed_update_scripts)
+        for script in self._fixed_update_snapshot:
+            script.OnFixedUpdate(fixed_delta_time)
 
     def ClearOrphanedScripts(self, entities):
         """Czyści wewnętrzny kesz managera ze skryptów, których encje zostały usunięte.
@@ -0,0 +1,409 @@
+import math
+
+import numpy as np
+
+_NEIGHBOURS = [
+    (dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+]
+
+
+class SpatialHashGrid:
+    """Loose uniform hash grid over bounding spheres.
+
+    Every item lives in the single cell that holds its centre, and queries
+    widen their search by half a cell, so moving an item only touches the
+    grid when it crosses a cell boundary. Items wider than half a cell are
+    kept in a separate list that every query checks.
+    """
+
+    def __init__(self, cell_size: float = 8.0, capacity: int = 256):
+        self.CellSize = float(cell_size)
+        self._inv_cell = 1.0 / self.CellSize
+
+        capacity = max(1, int(capacity))
+        self._centers = np.zeros((capacity, 3), dtype=np.float64)
+        self._radii = np.zeros(capacity, dtype=np.float64)
+        self._cell_keys = np.zeros((capacity, 3), dtype=np.int64)
+        self._large = np.zeros(capacity, dtype=np.bool_)
+        self._items = [None] * capacity
+
+        self._slots = {}
+        self._free = []
+        self._high_water = 0
+        self._cells = {}
+        self._large_slots = set()
+
+        self._key_array = None
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, item):
+        return item in self._slots
+
+    def Insert(self, item, center, radius: float = 0.0):
+        self.UpdateMany([item], np.asarray([center], np.float64), [radius])
+
+    def Update(self, item, center, radius: float = 0.0):
+        self.UpdateMany([item], np.asarray([center], np.float64), [radius])
+
+    def UpdateMany(self, items, centers, radii):
+        """Inserts or moves ``items``; ``centers`` is (N, 3), ``radii`` (N,)."""
+        if not len(items):
+            return
+        slots = np.fromiter(
+            (self._slot_for(item) for item in items), dtype=np.intp, count=len(items)
+        )
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+        radii = np.asarray(radii, dtype=np.float64).reshape(-1)
+
+        keys = np.floor(centers * self._inv_cell).astype(np.int64)
+        large = radii > self.CellSize * 0.5
+        placed = self._items_placed(slots)
+        changed = (
+            ~placed
+            | (large != self._large[slots])
+            | np.any(keys != self._cell_keys[slots], axis=1)
+        )
+
+        moved = slots[changed]
+        for slot in moved[placed[changed]].tolist():
+            self._unplace(slot)
+
+        self._centers[slots] = centers
+        self._radii[slots] = radii
+        self._cell_keys[slots] = keys
+        self._large[slots] = large
+
+        for slot in moved.tolist():
+            self._place(slot)
+
+    def Remove(self, item):
+        slot = self._slots.pop(item, None)
+        if slot is None:
+            return
+        self._unplace(slot)
+        self._items[slot] = None
+        self._free.append(slot)
+
+    def Clear(self):
+        self._slots.clear()
+        self._free.clear()
+        self._cells.clear()
+        self._large_slots.clear()
+        self._items = [None] * len(self._items)
+        self._high_water = 0
+        self._key_array = None
+
+    def GetSphere(self, item):
+        slot = self._slots.get(item)
+        if slot is None:
+            return None
+        return tuple(self._centers[slot].tolist()), float(self._radii[slot])
+
+    def QuerySphere(self, center, radius: float) -> list:
+        center = np.asarray(center, dtype=np.float64)
+        candidates = self._candidates_in_box(center - radius, center + radius)
+        offset = self._centers[candidates] - center
+        reach = self._radii[candidates] + radius
+        hit = np.einsum("ij,ij->i", offset, offset) <= reach * reach
+        return self._to_items(candidates[hit])
+
+    def QueryAABB(self, box_min, box_max) -> list:
+        box_min = np.asarray(box_min, dtype=np.float64)
+        box_max = np.asarray(box_max, dtype=np.float64)
+        candidates = self._candidates_in_box(box_min, box_max)
+        centers = self._centers[candidates]
+        offset = centers - np.clip(centers, box_min, box_max)
+        radii = self._radii[candidates]
+        hit = np.einsum("ij,ij->i", offset, offset) <= radii * radii
+        return self._to_items(candidates[hit])
+
+    def QueryFrustum(self, frustum) -> list:
+        """Items touching ``frustum`` (anything with TestAABBs/TestSpheres)."""
+        keys = self._occupied_keys()
+        candidates = [self._large_slots]
+        if len(keys):
+            half = self.CellSize * 0.5
+            low = keys * self.CellSize - half
+            high = low + self.CellSize + 2.0 * half
+            for index in np.flatnonzero(frustum.TestAABBs(low, high)).tolist():
+                candidates.append(self._cells[tuple(keys[index].tolist())])
+        candidates = self._merge(candidates)
+        hit = frustum.TestSpheres(self._centers[candidates], self._radii[candidates])
+        return self._to_items(candidates[hit])
+
+    def QueryNearest(
+        self, point, k: int = 1, max_distance: float = math.inf, predicate=None
+    ) -> list:
+        """Up to ``k`` (distance, item) pairs, nearest centre first."""
+        point = np.asarray(point, dtype=np.float64)
+        keys = self._occupied_keys()
+        best_d = np.empty(0, dtype=np.float64)
+        best_s = np.empty(0, dtype=np.intp)
+
+        def consider(slots):
+            nonlocal best_d, best_s
+            if predicate is not None:
+                slots = np.array(
+                    [s for s in slots.tolist() if predicate(self._items[s])],
+                    dtype=np.intp,
+                )
+            if not len(slots):
+                return
+            offset = self._centers[slots] - point
+            distances = np.sqrt(np.einsum("ij,ij->i", offset, offset))
+            keep = distances <= max_distance
+            best_d = np.concatenate((best_d, distances[keep]))
+            best_s = np.concatenate((best_s, slots[keep]))
+            if len(best_d) > k:
+                order = np.argpartition(best_d, k - 1)[:k]
+                best_d, best_s = best_d[order], best_s[order]
+
+        consider(self._merge([self._large_slots]))
+        if len(keys):
+            home = np.floor(point * self._inv_cell).astype(np.int64)
+            rings = np.abs(keys - home).max(axis=1)
+            order = np.argsort(rings, kind="stable")
+            rings = rings[order]
+            bounds = np.flatnonzero(np.diff(rings)) + 1
+            starts = np.concatenate(([0], bounds))
+            ends = np.concatenate((bounds, [len(rings)]))
+            for start, end in zip(starts.tolist(), ends.tolist()):
+                ring = int(rings[start])
+                # Centres in ring r are at least (r - 1) cells away.
+                floor_distance = (ring - 1) * self.CellSize
+                if floor_distance > max_distance:
+                    break
+                if len(best_d) >= k and best_d.max() <= floor_distance:
+                    break
+                cells = [
+                    self._cells[tuple(key)] for key in keys[order[start:end]].tolist()
+                ]
+                consider(self._merge(cells))
+
+        order = np.argsort(best_d, kind="stable")
+        return [(float(best_d[i]), self._items[int(best_s[i])]) for i in order.tolist()]
+
+    def Raycast(self, origin, direction, max_distance: float = math.inf):
+        """Nearest (distance, item) hit along the ray, or None."""
+        hits = self._raycast(origin, direction, max_distance, first_only=True)
+        return hits[0] if hits else None
+
+    def RaycastAll(self, origin, direction, max_distance: float = math.inf) -> list:
+        """Every (distance, item) hit along the ray, nearest first."""
+        return self._raycast(origin, direction, max_distance, first_only=False)
+
+    def _raycast(self, origin, direction, max_distance: float, first_only: bool):
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        length = float(np.linalg.norm(direction))
+        if length < 1e-12:
+            return []
+        direction = direction / length
+
+        seen_cells = set()
+        seen_slots = set()
+        hits_d = []
+        hits_s = []
+
+        def test(slots):
+            if not len(slots):
+                return
+            distances = _ray_sphere(
+                origin, direction, self._centers[slots], self._radii[slots]
+            )
+            keep = np.isfinite(distances) & (distances <= max_distance)
+            hits_d.extend(distances[keep].tolist())
+            hits_s.extend(slots[keep].tolist())
+
+        test(self._merge([self._large_slots]))
+        seen_slots.update(self._large_slots)
+
+        batch = []
+        budget = len(self._cells) + 64
+        for key, t_enter in self._ray_cells(origin, direction, max_distance):
+            if first_only:
+                # Test what was collected so far, or the early exit can't see it.
+                if batch:
+                    test(np.array(batch, dtype=np.intp))
+                    batch = []
+                if hits_d and t_enter > min(hits_d) + self.CellSize:
+                    break
+            budget -= 1
+            if budget < 0:
+                # Long rays through sparse grids: testing every remaining
+                # item is cheaper than walking empty cells.
+                batch.extend(s for s in self._slots.values() if s not in seen_slots)
+                break
+            x, y, z = key
+            for dx, dy, dz in _NEIGHBOURS:
+                neighbour = (x + dx, y + dy, z + dz)
+                if neighbour in seen_cells:
+                    continue
+                seen_cells.add(neighbour)
+                bucket = self._cells.get(neighbour)
+                if bucket:
+                    batch.extend(s for s in bucket if s not in seen_slots)
+                    seen_slots.update(bucket)
+            if len(batch) >= 64:
+                test(np.array(batch, dtype=np.intp))
+                batch = []
+        test(np.array(batch, dtype=np.intp))
+
+        order = sorted(range(len(hits_d)), key=hits_d.__getitem__)
+        if first_only:
+            order = order[:1]
+        return [(hits_d[i], self._items[hits_s[i]]) for i in order]
+
+    def _ray_cells(self, origin, direction, max_distance: float):
+        # Amanatides-Woo traversal, clipped to the occupied part of the grid.
+        keys = self._occupied_keys()
+        if not len(keys):
+            return
+        low = (keys.min(axis=0) - 1) * self.CellSize
+        high = (keys.max(axis=0) + 2) * self.CellSize
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inv = 1.0 / direction
+            t0 = (low - origin) * inv
+            t1 = (high - origin) * inv
+        t_near = np.nanmax(np.minimum(t0, t1))
+        t_far = np.nanmin(np.maximum(t0, t1))
+        t = max(float(t_near), 0.0)
+        t_end = min(float(t_far), max_distance)
+        if t > t_end:
+            return
+
+        position = origin + direction * t
+        cell = np.floor(position * self._inv_cell).astype(np.int64)
+        step = np.sign(direction).astype(np.int64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t_delta = np.abs(self.CellSize * inv)
+            boundary = (cell + (step > 0)) * self.CellSize
+            t_next = np.where(step != 0, t + (boundary - position) * inv, np.inf)
+        cell = cell.tolist()
+        step = step.tolist()
+        t_next = t_next.tolist()
+        t_delta = t_delta.tolist()
+
+        while t <= t_end:
+            yield (cell[0], cell[1], cell[2]), t
+            axis = min(range(3), key=t_next.__getitem__)
+            t = t_next[axis]
+            cell[axis] += step[axis]
+            t_next[axis] += t_delta[axis]
+
+    def _slot_for(self, item) -> int:
+        slot = self._slots.get(item)
+        if slot is not None:
+            return slot
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self._high_water == len(self._items):
+                self._grow(len(self._items) * 2)
+            slot = self._high_water
+            self._high_water += 1
+        self._slots[item] = slot
+        self._items[slot] = item
+        # Marks the slot as not yet placed in any cell.
+        self._cell_keys[slot] = np.iinfo(np.int64).min
+        return slot
+
+    def _items_placed(self, slots):
+        return self._cell_keys[slots, 0] != np.iinfo(np.int64).min
+
+    def _place(self, slot: int):
+        if self._large[slot]:
+            self._large_slots.add(slot)
+            return
+        key = tuple(self._cell_keys[slot].tolist())
+        bucket = self._cells.get(key)
+        if bucket is None:
+            bucket = self._cells[key] = set()
+            self._key_array = None
+        bucket.add(slot)
+
+    def _unplace(self, slot: int):
+        if self._large[slot]:
+            self._large_slots.discard(slot)
+            return
+        key = tuple(self._cell_keys[slot].tolist())
+        bucket = self._cells.get(key)
+        if bucket is None:
+            return
+        bucket.discard(slot)
+        if not bucket:
+            del self._cells[key]
+            self._key_array = None
+
+    def _occupied_keys(self) -> np.ndarray:
+        if self._key_array is None:
+            self._key_array = np.array(list(self._cells), dtype=np.int64).reshape(-1, 3)
+        return self._key_array
+
+    def _candidates_in_box(self, box_min, box_max) -> np.ndarray:
+        half = self.CellSize * 0.5
+        low = np.floor((box_min - half) * self._inv_cell).astype(np.int64)
+        high = np.floor((box_max + half) * self._inv_cell).astype(np.int64)
+        span = high - low + 1
+
+        buckets = [self._large_slots]
+        if int(np.prod(span)) > len(self._cells):
+            keys = self._occupied_keys()
+            if len(keys):
+                inside = np.all((keys >= low) & (keys <= high), axis=1)
+                for key in keys[inside].tolist():
+                    buckets.append(self._cells[tuple(key)])
+        else:
+            cells = self._cells
+            for x in range(low[0], high[0] + 1):
+                for y in range(low[1], high[1] + 1):
+                    for z in range(low[2], high[2] + 1):
+                        bucket = cells.get((x, y, z))
+                        if bucket:
+                            buckets.append(bucket)
+        return self._merge(buckets)
+
+    @staticmethod
+    def _merge(buckets) -> np.ndarray:
+        count = sum(len(bucket) for bucket in buckets)
+        if not count:
+            return np.empty(0, dtype=np.intp)
+        slots = np.empty(count, dtype=np.intp)
+        offset = 0
+        for bucket in buckets:
+            size = len(bucket)
+            slots[offset : offset + size] = np.fromiter(bucket, np.intp, size)
+            offset += size
+        return slots
+
+    def _to_items(self, slots) -> list:
+        items = self._items
+        return [items[slot] for slot in slots.tolist()]
+
+    def _grow(self, capacity: int):
+        count = len(self._items)
+        for name in ("_centers", "_radii", "_cell_keys", "_large"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:count] = old
+            setattr(self, name, new)
+        self._items.extend([None] * (capacity - count))
+
+
+def _ray_sphere(origin, direction, centers, radii) -> np.ndarray:
+    """Entry distance per sphere, inf on a miss, 0 when the origin is inside."""
+    offset = centers - origin
+    along = offset @ direction
+    closest_sq = np.einsum("ij,ij->i", offset, offset) - along * along
+    radii_sq = radii * radii
+    with np.errstate(invalid="ignore"):
+        half_chord = np.sqrt(radii_sq - closest_sq)
+    entry = along - half_chord
+    exit_ = along + half_chord
+    result = np.where(entry >= 0.0, entry, 0.0)
+    miss = (closest_sq > radii_sq) | (exit_ < 0.0)
+    result[miss] = np.inf
+    return result
@@ -25,38 +25,34 @@ class Camera:
         self.Far = 1000.0
 
     def GetViewMatrix(self, entity_transform: Transform) -> Matrix4:
-        pitch = math.radians(entity_transform.Rotation.X)
-        yaw = math.radians(entity_transform.Rotation.Y)
+        # World-space basis, so a camera parented to a moving entity follows it.
+        (fx, fy, fz), up = entity_transform.GetLookDirections()
 
-        fx = math.sin(yaw) * math.cos(pitch)
-        fy = -math.sin(pitch)
-        fz = math.cos(yaw) * math.cos(pitch)
-        fx, fy, fz = _normalize3(fx, fy, fz)
-
-        rx, ry, rz = _cross3(fx, fy, fz, 0.0, 1.0, 0.0)
+        rx, ry, rz = _cross3(fx, fy, fz, *up)
         rx, ry, rz = _normalize3(rx, ry, rz)
 
         ux, uy, uz = _cross3(rx, ry, rz, fx, fy, fz)
 
-        px = entity_transform.Position.X
-        py = entity_transform.Position.Y
-        pz = entity_transform.Position.Z
+        position = entity_transform.WorldPosition
+        px, py, pz = position.X, position.Y, position.Z
 
         m = Matrix4()
-        m.M[0] = rx
-        m.M[1] = ux
-        m.M[2] = -fx
-        m.M[3] = 0.0
-        m.M[4] = ry
-        m.M[5] = uy
-        m.M[6] = -fy
-        m.M[7] = 0.0
-        m.M[8] = rz
-        m.M[9] = uz
-        m.M[10] = -fz
-        m.M[11] = 0.0
-        m.M[12] = -_dot3(rx, ry, rz, px, py, pz)
-        m.M[13] = -_dot3(ux, uy, uz, px, py, pz)
-        m.M[14] = _dot3(fx, fy, fz, px, py, pz)
-        m.M[15] = 1.0
+        m.M = (
+            rx,
+            ux,
+            -fx,
+            0.0,
+            ry,
+            uy,
+            -fy,
+            0.0,
+            rz,
+            uz,
+            -fz,
+            0.0,
+            -_dot3(rx, ry, rz, px, py, pz),
+            -_dot3(ux, uy, uz, px, py, pz),
+            _dot3(fx, fy, fz, px, py, pz),
+            1.0,
+        )
         return m
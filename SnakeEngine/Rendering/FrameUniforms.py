@@ -0,0 +1,64 @@
+from OpenGL.GL import *
+import numpy as np
+
+from ..Core.Logger import Logger
+from ..Core.Mathematics.Matrix4 import Matrix4
+from ..Core.Mathematics.Vector3 import Vector3
+from .GraphicsContext import GraphicsContext
+from .ShaderManager import ENGINE_BLOCK_BINDING
+
+# std140 layout of the SnakeFrame block, in floats:
+#   view 0-15, projection 16-31, viewPos 32-34, time 35, resolution 36-37.
+_BLOCK_FLOATS = 40
+
+
+class _FrameUniformsSingleton:
+    def __init__(self):
+        self._ubo = 0
+        self._data = np.zeros(_BLOCK_FLOATS, dtype=np.float32)
+
+    @property
+    def buffer(self) -> int:
+        return self._ubo
+
+    def update(
+        self,
+        view: Matrix4,
+        projection: Matrix4,
+        view_pos: Vector3,
+        time: float,
+        width: float,
+        height: float,
+    ):
+        data = self._data
+        data[0:16] = view.ToArray()
+        data[16:32] = projection.ToArray()
+        data[32] = view_pos.X
+        data[33] = view_pos.Y
+        data[34] = view_pos.Z
+        data[35] = time
+        data[36] = width
+        data[37] = height
+
+        state = GraphicsContext.State
+        if not self._ubo:
+            self._ubo = glGenBuffers(1)
+            state.BindBuffer(GL_UNIFORM_BUFFER, self._ubo)
+            glBufferData(GL_UNIFORM_BUFFER, data.nbytes, data, GL_DYNAMIC_DRAW)
+            glBindBufferBase(GL_UNIFORM_BUFFER, ENGINE_BLOCK_BINDING, self._ubo)
+        else:
+            state.BindBuffer(GL_UNIFORM_BUFFER, self._ubo)
+            glBufferSubData(GL_UNIFORM_BUFFER, 0, data.nbytes, data)
+
+    def cleanup(self):
+        if not self._ubo:
+            return
+        try:
+            glDeleteBuffers(1, [self._ubo])
+            GraphicsContext.State.Forget(self._ubo)
+        except Exception as e:
+            Logger.error(f"Failed to delete frame uniform buffer: {e}", exc_info=True)
+        self._ubo = 0
+
+
+FrameUniforms = _FrameUniformsSingleton()
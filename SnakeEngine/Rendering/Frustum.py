@@ -0,0 +1,56 @@
+import numpy as np
+
+from ..Core.Mathematics.Matrix4 import Matrix4
+
+
+def transform_spheres(models: np.ndarray, centers: np.ndarray, radii: np.ndarray):
+    """Moves local bounding spheres into world space.
+
+    ``models`` is an (N, 4, 4) column-major stack, ``centers`` (N, 3) and
+    ``radii`` (N,). Radii grow by each matrix's largest axis scale.
+    """
+    world = np.einsum("ni,nij->nj", centers, models[:, :3, :3])
+    world += models[:, 3, :3]
+    axis_sq = np.einsum("nij,nij->ni", models[:, :3, :3], models[:, :3, :3])
+    return world, radii * np.sqrt(axis_sq.max(axis=1))
+
+
+class Frustum:
+    def __init__(self):
+        # Rows are (a, b, c, d) with unit normals pointing inwards:
+        # left, right, bottom, top, near, far.
+        self.Planes = np.zeros((6, 4), dtype=np.float32)
+
+    def Update(self, view_proj: Matrix4):
+        # The stored block is the transpose of the matrix, so its columns
+        # are the matrix rows (Gribb-Hartmann plane extraction).
+        m = view_proj.ToArray().reshape(4, 4)
+        r0, r1, r2, r3 = m[:, 0], m[:, 1], m[:, 2], m[:, 3]
+        planes = self.Planes
+        planes[0] = r3 + r0
+        planes[1] = r3 - r0
+        planes[2] = r3 + r1
+        planes[3] = r3 - r1
+        planes[4] = r3 + r2
+        planes[5] = r3 - r2
+        lengths = np.linalg.norm(planes[:, :3], axis=1)
+        planes /= np.maximum(lengths, 1e-12)[:, None]
+        return self
+
+    def TestSpheres(self, centers: np.ndarray, radii: np.ndarray) -> np.ndarray:
+        """Boolean mask of spheres that touch the frustum."""
+        distances = centers @ self.Planes[:, :3].T + self.Planes[:, 3]
+        return np.all(distances >= -radii[:, None], axis=1)
+
+    def TestAABBs(self, mins: np.ndarray, maxs: np.ndarray) -> np.ndarray:
+        """Boolean mask of boxes that touch the frustum."""
+        normals = self.Planes[:, :3]
+        # The corner furthest along each plane normal decides the test.
+        positive = normals >= 0.0
+        corners = np.where(positive[None], maxs[:, None, :], mins[:, None, :])
+        distances = np.einsum("npj,pj->np", corners, normals) + self.Planes[:, 3]
+        return np.all(distances >= 0.0, axis=1)
+
+    def ContainsPoint(self, x: float, y: float, z: float) -> bool:
+        point = np.array((x, y, z, 1.0), dtype=np.float32)
+        return bool(np.all(self.Planes @ point >= 0.0))
@@ -0,0 +1,147 @@
+from OpenGL.GL import *
+
+
+class GLStateCache:
+    """Shadow copy of the GL state the engine touches.
+
+    Calls that would not change anything are dropped and counted. Code that
+    changes state behind its back must call Invalidate() (or Forget() after
+    deleting an object) so the shadow copy does not go stale.
+    """
+
+    def __init__(self):
+        self.Calls = 0
+        self.Skipped = 0
+        self.LastFrameCalls = 0
+        self.LastFrameSkipped = 0
+        self.Invalidate()
+
+    def Invalidate(self):
+        self._caps = {}
+        self._program = None
+        self._vao = None
+        self._buffers = {}
+        self._active_unit = None
+        self._textures = {}
+        self._blend_func = None
+        self._depth_mask = None
+        self._depth_func = None
+
+    def EndFrame(self):
+        self.LastFrameCalls = self.Calls
+        self.LastFrameSkipped = self.Skipped
+        self.Calls = 0
+        self.Skipped = 0
+
+    def Forget(self, gl_id: int):
+        # GL unbinds deleted objects, and their names can be handed out again.
+        if self._program == gl_id:
+            self._program = None
+        if self._vao == gl_id:
+            self._vao = None
+        for table in (self._buffers, self._textures):
+            for key in [k for k, v in table.items() if v == gl_id]:
+                del table[key]
+
+    def Enable(self, cap):
+        if self._caps.get(cap) is True:
+            self.Skipped += 1
+            return
+        glEnable(cap)
+        self._caps[cap] = True
+        self.Calls += 1
+
+    def Disable(self, cap):
+        if self._caps.get(cap) is False:
+            self.Skipped += 1
+            return
+        glDisable(cap)
+        self._caps[cap] = False
+        self.Calls += 1
+
+    def SetEnabled(self, cap, enabled: bool):
+        if enabled:
+            self.Enable(cap)
+        else:
+            self.Disable(cap)
+
+    def IsEnabled(self, cap) -> bool:
+        enabled = self._caps.get(cap)
+        if enabled is None:
+            enabled = bool(glIsEnabled(cap))
+            self._caps[cap] = enabled
+            self.Calls += 1
+        return enabled
+
+    def UseProgram(self, program: int):
+        if self._program == program:
+            self.Skipped += 1
+            return
+        glUseProgram(program)
+        self._program = program
+        self.Calls += 1
+
+    def BindVertexArray(self, vao: int):
+        if self._vao == vao:
+            self.Skipped += 1
+            return
+        glBindVertexArray(vao)
+        self._vao = vao
+        self.Calls += 1
+
+    def BindBuffer(self, target, buffer: int):
+        if target == GL_ELEMENT_ARRAY_BUFFER:
+            # The element buffer binding belongs to the bound VAO.
+            glBindBuffer(target, buffer)
+            self.Calls += 1
+            return
+        if self._buffers.get(target) == buffer:
+            self.Skipped += 1
+            return
+        glBindBuffer(target, buffer)
+        self._buffers[target] = buffer
+        self.Calls += 1
+
+    def ActiveTexture(self, unit: int):
+        if self._active_unit == unit:
+            self.Skipped += 1
+            return
+        glActiveTexture(GL_TEXTURE0 + unit)
+        self._active_unit = unit
+        self.Calls += 1
+
+    def BindTexture(self, target, texture: int, unit=None):
+        if unit is not None or self._active_unit is None:
+            self.ActiveTexture(unit or 0)
+        key = (self._active_unit, target)
+        if self._textures.get(key) == texture:
+            self.Skipped += 1
+            return
+        glBindTexture(target, texture)
+        self._textures[key] = texture
+        self.Calls += 1
+
+    def BlendFunc(self, src, dst):
+        if self._blend_func == (src, dst):
+            self.Skipped += 1
+            return
+        glBlendFunc(src, dst)
+        self._blend_func = (src, dst)
+        self.Calls += 1
+
+    def DepthMask(self, flag: bool):
+        flag = bool(flag)
+        if self._depth_mask is flag:
+            self.Skipped += 1
+            return
+        glDepthMask(GL_TRUE if flag else GL_FALSE)
+        self._depth_mask = flag
+        self.Calls += 1
+
+    def DepthFunc(self, func):
+        if self._depth_func == func:
+            self.Skipped += 1
+            return
+        glDepthFunc(func)
+        self._depth_func = func
+        self.Calls += 1
@@ -1,8 +1,13 @@
 import glfw
 from OpenGL.GL import *
 
+from .GLStateCache import GLStateCache
+
 
 class GraphicsContext:
+    # One GL context is current at a time, so renderers share one tracker.
+    State = GLStateCache()
+
     def __init__(self):
         self.PrimaryContextWindow = None
 
@@ -13,7 +18,8 @@ class GraphicsContext:
         if not self.PrimaryContextWindow:
             self.PrimaryContextWindow = window_handle
             glfw.make_context_current(window_handle)
-            glEnable(GL_DEPTH_TEST)
+            self.State.Invalidate()
+            self.State.Enable(GL_DEPTH_TEST)
             glfw.swap_interval(0)
         return window_handle
 
@@ -27,3 +33,4 @@ class GraphicsContext:
 
     def ScreenPresent(self, window_handle):
         glfw.swap_buffers(window_handle)
+        self.State.EndFrame()
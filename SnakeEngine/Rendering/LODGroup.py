@@ -0,0 +1,79 @@
+from typing import Union
+
+import numpy as np
+
+from .MeshManager import Mesh, MeshManager
+
+LOD_DISTANCE = "distance"
+LOD_SCREEN_SIZE = "screen_size"
+
+
+class LODGroup:
+    """Detail levels for a mesh, finest first.
+
+    With LOD_DISTANCE, ``thresholds[i]`` is the camera distance past which
+    level i + 1 is used. With LOD_SCREEN_SIZE it is the fraction of the
+    screen height the bounding sphere must drop below instead. One
+    threshold more than there are extra meshes culls the object past the
+    last one. ``hysteresis`` widens each threshold by that fraction in the
+    direction of travel so objects near a boundary don't flicker.
+
+    Renderers batch together when they share one LODGroup instance.
+    """
+
+    def __init__(
+        self,
+        meshes,
+        thresholds,
+        mode: str = LOD_DISTANCE,
+        hysteresis: float = 0.1,
+    ):
+        self.Meshes = tuple(_resolve(mesh) for mesh in meshes)
+        thresholds = np.asarray(thresholds, dtype=np.float64).reshape(-1)
+        if len(thresholds) not in (len(self.Meshes) - 1, len(self.Meshes)):
+            raise ValueError(
+                f"{len(self.Meshes)} LOD meshes need {len(self.Meshes) - 1} "
+                f"or {len(self.Meshes)} thresholds, got {len(thresholds)}"
+            )
+        if mode not in (LOD_DISTANCE, LOD_SCREEN_SIZE):
+            raise ValueError(f"Unknown LOD mode '{mode}'")
+
+        self.Mode = mode
+        self.Thresholds = tuple(thresholds.tolist())
+        self.Hysteresis = float(hysteresis)
+
+        # Both modes select on a metric that grows as detail should drop:
+        # distance, or the reciprocal of screen size.
+        if mode == LOD_SCREEN_SIZE:
+            limits = 1.0 / np.maximum(thresholds, 1e-9)
+        else:
+            limits = thresholds
+        if np.any(np.diff(limits) < 0.0):
+            raise ValueError("LOD thresholds must go from finest to coarsest level")
+        self._coarser = limits * (1.0 + self.Hysteresis)
+        self._finer = limits * (1.0 - self.Hysteresis)
+
+    @property
+    def LevelCount(self) -> int:
+        return len(self.Meshes)
+
+    @property
+    def CullLevel(self) -> int:
+        """Level index meaning "not drawn"; equals LevelCount if used."""
+        return len(self._coarser)
+
+    def SelectLevels(self, metric: np.ndarray, current: np.ndarray) -> np.ndarray:
+        """New level per object from a distance-like ``metric``."""
+        coarser = np.searchsorted(self._coarser, metric, side="left")
+        finer = np.searchsorted(self._finer, metric, side="left")
+        levels = np.where(coarser > current, coarser, current)
+        return np.where(finer < levels, finer, levels)
+
+
+def _resolve(mesh: Union[Mesh, str]) -> Mesh:
+    if isinstance(mesh, str):
+        resolved = MeshManager.load(mesh)
+        if resolved is None:
+            raise ValueError(f"Could not load LOD mesh '{mesh}'")
+        return resolved
+    return mesh
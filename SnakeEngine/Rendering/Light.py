@@ -14,3 +14,8 @@ class Light:
 
         self.Range = 10.0
         self.Attenuation = Vector3(1.0, 0.09, 0.032)
+
+    @staticmethod
+    def GetDirection(entity_transform) -> tuple:
+        # Same convention as Camera: the way the entity faces in world space.
+        return entity_transform.GetLookDirections()[0]
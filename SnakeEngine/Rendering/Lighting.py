@@ -0,0 +1,329 @@
+import math
+
+from OpenGL.GL import *
+import numpy as np
+
+from ..Core.Logger import Logger
+from ..Core.Mathematics.Matrix4 import Matrix4
+from .GraphicsContext import GraphicsContext
+from .Light import Light
+from .ShaderManager import ENGINE_SAMPLER_UNITS, LIGHT_BLOCK_BINDING
+
+MAX_DIRECTIONAL_LIGHTS = 4
+
+# std140 layout of the SnakeLights block, in floats:
+#   ambient 0-3, cluster counts 4-7, cluster depth 8-11, light counts 12-15,
+#   directional directions 16-31, directional colours 32-47.
+_BLOCK_FLOATS = 16 + 8 * MAX_DIRECTIONAL_LIGHTS
+_DIRECTION_OFFSET = 16
+_COLOR_OFFSET = _DIRECTION_OFFSET + 4 * MAX_DIRECTIONAL_LIGHTS
+
+# Texture buffer name -> (internal format, sampler it feeds).
+_TEXTURE_BUFFERS = {
+    "lights": (GL_RGBA32F, "snakeLightData"),
+    "grid": (GL_RG32UI, "snakeLightGrid"),
+    "indices": (GL_R32UI, "snakeLightIndices"),
+}
+
+
+def cluster_bounds(grid_shape, near: float, far: float, x_scale, y_scale):
+    """View-space (mins, maxs) of every cluster, each (clusters, 3).
+
+    Clusters are screen tiles split into depth slices that grow
+    exponentially from ``near`` to ``far``, ordered slice, row, column.
+    ``x_scale`` and ``y_scale`` are the projection's first two diagonal terms.
+    """
+    tiles_x, tiles_y, slices = grid_shape
+    edges_x = np.linspace(-1.0, 1.0, tiles_x + 1) / x_scale
+    edges_y = np.linspace(-1.0, 1.0, tiles_y + 1) / y_scale
+    depths = near * (far / near) ** (np.arange(slices + 1) / slices)
+
+    d0 = depths[:-1, None, None]
+    d1 = depths[1:, None, None]
+    x0, x1 = edges_x[None, None, :-1], edges_x[None, None, 1:]
+    y0, y1 = edges_y[None, :-1, None], edges_y[None, 1:, None]
+
+    shape = (slices, tiles_y, tiles_x)
+    mins = np.stack(
+        [
+            np.broadcast_to(np.minimum(x0 * d0, x0 * d1), shape),
+            np.broadcast_to(np.minimum(y0 * d0, y0 * d1), shape),
+            np.broadcast_to(-d1, shape),
+        ],
+        axis=-1,
+    )
+    maxs = np.stack(
+        [
+            np.broadcast_to(np.maximum(x1 * d0, x1 * d1), shape),
+            np.broadcast_to(np.maximum(y1 * d0, y1 * d1), shape),
+            np.broadcast_to(-d0, shape),
+        ],
+        axis=-1,
+    )
+    return mins.reshape(-1, 3), maxs.reshape(-1, 3)
+
+
+def assign_lights(
+    centers: np.ndarray,
+    radii: np.ndarray,
+    grid_shape,
+    near: float,
+    far: float,
+    x_scale: float,
+    y_scale: float,
+    bounds=None,
+):
+    """Bins view-space light spheres into clusters.
+
+    Returns ``grid``, a (clusters, 2) array of (first, count) into
+    ``indices``, which lists the light numbers touching each cluster.
+    """
+    tiles_x, tiles_y, slices = grid_shape
+    cluster_count = tiles_x * tiles_y * slices
+    if bounds is None:
+        bounds = cluster_bounds(grid_shape, near, far, x_scale, y_scale)
+
+    depth = -centers[:, 2]
+    z_near = np.maximum(depth - radii, near)
+    z_far = np.minimum(depth + radii, far)
+
+    # The clipped view-space box projects to its widest at one of its corners.
+    left = centers[:, 0] - radii
+    right = centers[:, 0] + radii
+    bottom = centers[:, 1] - radii
+    top = centers[:, 1] + radii
+    lo_x = np.minimum(left / z_near, left / z_far) * x_scale
+    hi_x = np.maximum(right / z_near, right / z_far) * x_scale
+    lo_y = np.minimum(bottom / z_near, bottom / z_far) * y_scale
+    hi_y = np.maximum(top / z_near, top / z_far) * y_scale
+
+    keep = (z_near <= z_far) & (lo_x <= 1.0) & (hi_x >= -1.0)
+    keep &= (lo_y <= 1.0) & (hi_y >= -1.0)
+    lights = np.flatnonzero(keep)
+
+    def tile_range(lo, hi, count):
+        first = np.floor((lo[keep] + 1.0) * 0.5 * count)
+        last = np.floor((hi[keep] + 1.0) * 0.5 * count)
+        first = np.clip(first, 0, count - 1).astype(np.intp)
+        last = np.clip(last, 0, count - 1).astype(np.intp)
+        return first, last - first + 1
+
+    x0, nx = tile_range(lo_x, hi_x, tiles_x)
+    y0, ny = tile_range(lo_y, hi_y, tiles_y)
+    slice_scale = slices / math.log(far / near)
+    s0 = np.floor(np.log(z_near[keep] / near) * slice_scale)
+    s1 = np.floor(np.log(z_far[keep] / near) * slice_scale)
+    s0 = np.clip(s0, 0, slices - 1).astype(np.intp)
+    nz = np.clip(s1, 0, slices - 1).astype(np.intp) - s0 + 1
+
+    # Expand each light's block of clusters into (light, cluster) pairs.
+    totals = nx * ny * nz
+    owner = np.repeat(np.arange(len(lights)), totals)
+    local = np.arange(int(totals.sum())) - np.repeat(np.cumsum(totals) - totals, totals)
+    ix = x0[owner] + local % nx[owner]
+    rest = local // nx[owner]
+    iy = y0[owner] + rest % ny[owner]
+    iz = s0[owner] + rest // ny[owner]
+    clusters = (iz * tiles_y + iy) * tiles_x + ix
+
+    # The tile block is loose around a sphere, so test each pair exactly.
+    sphere = centers[lights[owner]]
+    closest = np.clip(sphere, bounds[0][clusters], bounds[1][clusters])
+    offset = closest - sphere
+    hit = np.einsum("ij,ij->i", offset, offset) <= radii[lights[owner]] ** 2
+    clusters = clusters[hit]
+    owner = owner[hit]
+
+    order = np.argsort(clusters, kind="stable")
+    indices = lights[owner[order]].astype(np.uint32)
+    counts = np.bincount(clusters, minlength=cluster_count)
+    grid = np.empty((cluster_count, 2), dtype=np.uint32)
+    grid[:, 0] = np.cumsum(counts) - counts
+    grid[:, 1] = counts
+    return grid, indices
+
+
+class _LightingSingleton:
+    def __init__(self):
+        self.tiles_x = 16
+        self.tiles_y = 9
+        self.slices = 24
+
+        self._ubo = 0
+        self._data = np.zeros(_BLOCK_FLOATS, dtype=np.float32)
+        # name -> [buffer, texture, capacity in bytes]
+        self._texture_buffers = {}
+        self._bounds_key = None
+        self._bounds = None
+
+        self.point_lights = 0
+        self.directional_lights = 0
+        self.light_indices = 0
+
+    def update(
+        self,
+        entities,
+        model_matrices: np.ndarray,
+        view: Matrix4,
+        projection: Matrix4,
+        near: float,
+        far: float,
+    ):
+        """Collects the Light components of ``entities`` and uploads them.
+
+        ``model_matrices`` is the (N, 4, 4) stack from ``Scene.GetModelMatrices``
+        in the same order as ``entities``. Scenes without lights render unlit.
+        """
+        data = self._data
+        data[:] = 0.0
+
+        point_rows = []
+        point_params = []
+        directional = 0
+        for index, entity in enumerate(entities):
+            light = entity.GetComponent(Light)
+            if light is None:
+                continue
+            color = (
+                light.Color.X * light.Intensity,
+                light.Color.Y * light.Intensity,
+                light.Color.Z * light.Intensity,
+            )
+            if light.Type == Light.AMBIENT:
+                data[0:3] += color
+            elif light.Type == Light.POINT:
+                point_rows.append(index)
+                attenuation = light.Attenuation
+                point_params.append(
+                    (
+                        max(light.Range, 1e-4),
+                        *color,
+                        attenuation.X,
+                        attenuation.Y,
+                        attenuation.Z,
+                    )
+                )
+            elif directional < MAX_DIRECTIONAL_LIGHTS:
+                start = _DIRECTION_OFFSET + directional * 4
+                data[start : start + 3] = Light.GetDirection(entity.Transform)
+                start = _COLOR_OFFSET + directional * 4
+                data[start : start + 3] = color
+                directional += 1
+
+        grid_shape = (self.tiles_x, self.tiles_y, self.slices)
+        x_scale = projection.M[0]
+        y_scale = projection.M[5]
+        near = max(near, 1e-4)
+        far = max(far, near * 1.001)
+
+        point_data = np.zeros((len(point_rows), 3, 4), dtype=np.float32)
+        if point_rows:
+            params = np.array(point_params, dtype=np.float32)
+            positions = model_matrices[point_rows, 3, :3]
+            point_data[:, 0, :3] = positions
+            point_data[:, 0, 3] = params[:, 0]
+            point_data[:, 1, :3] = params[:, 1:4]
+            point_data[:, 2, :3] = params[:, 4:7]
+
+            block = view.ToArray().reshape(4, 4)
+            centers = positions @ block[:3, :3] + block[3, :3]
+            grid, indices = assign_lights(
+                centers,
+                params[:, 0],
+                grid_shape,
+                near,
+                far,
+                x_scale,
+                y_scale,
+                self._cluster_bounds(grid_shape, near, far, x_scale, y_scale),
+            )
+        else:
+            grid = np.zeros((self.tiles_x * self.tiles_y * self.slices, 2), np.uint32)
+            indices = np.zeros(0, dtype=np.uint32)
+
+        has_lights = bool(point_rows or directional or data[0:3].any())
+        data[4:8] = (self.tiles_x, self.tiles_y, self.slices, float(has_lights))
+        slice_scale = self.slices / math.log(far / near)
+        data[8:12] = (near, far, slice_scale, -math.log(near) * slice_scale)
+        data[12] = directional
+        data[13] = len(point_rows)
+
+        self.point_lights = len(point_rows)
+        self.directional_lights = directional
+        self.light_indices = len(indices)
+
+        state = GraphicsContext.State
+        if not self._ubo:
+            self._ubo = glGenBuffers(1)
+            state.BindBuffer(GL_UNIFORM_BUFFER, self._ubo)
+            glBufferData(GL_UNIFORM_BUFFER, data.nbytes, data, GL_DYNAMIC_DRAW)
+            glBindBufferBase(GL_UNIFORM_BUFFER, LIGHT_BLOCK_BINDING, self._ubo)
+        else:
+            state.BindBuffer(GL_UNIFORM_BUFFER, self._ubo)
+            glBufferSubData(GL_UNIFORM_BUFFER, 0, data.nbytes, data)
+
+        self._upload("lights", point_data)
+        self._upload("grid", grid)
+        self._upload("indices", indices)
+
+    def get_stats(self) -> dict:
+        return {
+            "point_lights": self.point_lights,
+            "directional_lights": self.directional_lights,
+            "light_indices": self.light_indices,
+            "clusters": self.tiles_x * self.tiles_y * self.slices,
+        }
+
+    def cleanup(self):
+        state = GraphicsContext.State
+        try:
+            if self._ubo:
+                glDeleteBuffers(1, [self._ubo])
+                state.Forget(self._ubo)
+            for buffer, texture, _ in self._texture_buffers.values():
+                glDeleteTextures(1, [texture])
+                glDeleteBuffers(1, [buffer])
+                state.Forget(texture)
+                state.Forget(buffer)
+        except Exception as e:
+            Logger.error(f"Failed to delete lighting buffers: {e}", exc_info=True)
+        self._ubo = 0
+        self._texture_buffers.clear()
+
+    def _cluster_bounds(self, grid_shape, near, far, x_scale, y_scale):
+        # Only changes with the projection, so it is kept between frames.
+        key = (grid_shape, near, far, x_scale, y_scale)
+        if key != self._bounds_key:
+            self._bounds = cluster_bounds(grid_shape, near, far, x_scale, y_scale)
+            self._bounds_key = key
+        return self._bounds
+
+    def _upload(self, name: str, array: np.ndarray):
+        internal_format, sampler = _TEXTURE_BUFFERS[name]
+        unit = ENGINE_SAMPLER_UNITS[sampler]
+        state = GraphicsContext.State
+
+        entry = self._texture_buffers.get(name)
+        created = entry is None
+        if created:
+            entry = [glGenBuffers(1), glGenTextures(1), 0]
+            self._texture_buffers[name] = entry
+        buffer, texture, capacity = entry
+
+        array = np.ascontiguousarray(array)
+        state.BindBuffer(GL_TEXTURE_BUFFER, buffer)
+        if array.nbytes > capacity:
+            capacity = max(array.nbytes, capacity * 2, 256)
+            entry[2] = capacity
+        # Orphan the old storage so the driver doesn't stall on last frame's draw.
+        glBufferData(GL_TEXTURE_BUFFER, capacity, None, GL_STREAM_DRAW)
+        if array.nbytes:
+            glBufferSubData(GL_TEXTURE_BUFFER, 0, array.nbytes, array)
+
+        state.BindTexture(GL_TEXTURE_BUFFER, texture, unit)
+        if created:
+            # The texture keeps pointing at the buffer across reallocations.
+            glTexBuffer(GL_TEXTURE_BUFFER, internal_format, buffer)
+
+
+Lighting = _LightingSingleton()
@@ -0,0 +1,160 @@
+from typing import Optional
+
+from OpenGL.GL import *
+import numpy as np
+
+from ..Core.Mathematics.Matrix4 import Matrix4
+from ..Core.Mathematics.Vector2 import Vector2
+from ..Core.Mathematics.Vector3 import Vector3
+from .GraphicsContext import GraphicsContext
+from .ShaderManager import ShaderManager, ShaderProgram
+from .TextureManager import TextureManager, TextureSettings
+
+_UPLOADERS = {
+    "float": lambda loc, n, v: (
+        glUniform1fv(loc, n, v) if n > 1 else glUniform1f(loc, v)
+    ),
+    "vec2": lambda loc, n, v: glUniform2fv(loc, n, v),
+    "vec3": lambda loc, n, v: glUniform3fv(loc, n, v),
+    "vec4": lambda loc, n, v: glUniform4fv(loc, n, v),
+    "int": lambda loc, n, v: glUniform1iv(loc, n, v) if n > 1 else glUniform1i(loc, v),
+    "bool": lambda loc, n, v: glUniform1i(loc, v),
+    "ivec2": lambda loc, n, v: glUniform2iv(loc, n, v),
+    "ivec3": lambda loc, n, v: glUniform3iv(loc, n, v),
+    "ivec4": lambda loc, n, v: glUniform4iv(loc, n, v),
+    "mat3": lambda loc, n, v: glUniformMatrix3fv(loc, n, GL_FALSE, v),
+    "mat4": lambda loc, n, v: glUniformMatrix4fv(loc, n, GL_FALSE, v),
+    "sampler2D": lambda loc, n, v: glUniform1i(loc, v),
+    "samplerCube": lambda loc, n, v: glUniform1i(loc, v),
+}
+
+_shared_materials: dict = {}
+
+
+def _normalize(value):
+    # Values are stored as plain numbers or tuples so they hash and compare
+    # cheaply against what the program last received.
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, Vector3):
+        return (value.X, value.Y, value.Z)
+    if isinstance(value, Vector2):
+        return (value.X, value.Y)
+    if isinstance(value, Matrix4):
+        return tuple(value.ToArray().tolist())
+    if isinstance(value, np.ndarray):
+        return tuple(value.ravel().tolist())
+    return tuple(value)
+
+
+class Material:
+    """Shader program plus the uniform values it should be drawn with.
+
+    Bind() uploads only the values that differ from what the program last
+    received, so uniforms owned by a material must not be set with raw
+    glUniform calls.
+    """
+
+    def __init__(self, shader_name: str, values: Optional[dict] = None, features=()):
+        self.ShaderName = shader_name
+        # #define switches selecting a compiled variant of the shader.
+        self.Features = frozenset(features)
+        self.Transparent = False
+        self._values: dict = {}
+        self._textures: dict = {}
+        self._managed: dict = {}
+        self._key = None
+        if values:
+            for name, value in values.items():
+                self.Set(name, value)
+
+    @staticmethod
+    def ForShader(shader_name: str, features=()) -> "Material":
+        key = (shader_name, frozenset(features))
+        material = _shared_materials.get(key)
+        if material is None:
+            material = Material(shader_name, features=features)
+            _shared_materials[key] = material
+        return material
+
+    @property
+    def Program(self) -> Optional[ShaderProgram]:
+        return ShaderManager.get_variant_program(self.ShaderName, self.Features)
+
+    @property
+    def StateKey(self) -> frozenset:
+        if self._key is None:
+            self._key = frozenset(self._values.items())
+        return self._key
+
+    def Set(self, name: str, value):
+        value = _normalize(value)
+        if self._values.get(name) != value:
+            self._values[name] = value
+            self._key = None
+
+    def Get(self, name: str, default=None):
+        return self._values.get(name, default)
+
+    def SetTexture(self, name: str, texture_id: int, target=GL_TEXTURE_2D):
+        TextureManager.release(self._managed.pop(name, None))
+        entry = self._textures.get(name)
+        unit = entry[0] if entry is not None else len(self._textures)
+        self._textures[name] = (unit, target, texture_id)
+        self.Set(name, unit)
+
+    def LoadTexture(
+        self, name: str, path: str, settings: TextureSettings = TextureSettings()
+    ) -> bool:
+        """Binds a texture from the shared TextureManager cache to ``name``."""
+        texture = TextureManager.acquire_async(path, settings)
+        if texture is None:
+            return False
+        self.SetTexture(name, texture.gl_id, texture.target)
+        self._managed[name] = texture
+        return True
+
+    def ReleaseTextures(self):
+        for name in list(self._managed):
+            self.SetTexture(name, 0, self._textures[name][1])
+
+    def Copy(self) -> "Material":
+        material = Material(self.ShaderName, features=self.Features)
+        material.Transparent = self.Transparent
+        material._values = dict(self._values)
+        material._textures = dict(self._textures)
+        material._managed = {
+            name: TextureManager.retain(texture)
+            for name, texture in self._managed.items()
+        }
+        return material
+
+    def Bind(self) -> Optional[ShaderProgram]:
+        program = self.Program
+        if program is None or not program.gl_id:
+            return None
+
+        state = GraphicsContext.State
+        state.UseProgram(program.gl_id)
+        for unit, target, texture_id in self._textures.values():
+            state.BindTexture(target, texture_id, unit)
+
+        key = self.StateKey
+        if program.bound_state is key or program.bound_state == key:
+            return program
+
+        uniforms = program.uniforms
+        for name, value in self._values.items():
+            info = uniforms.get(name)
+            if info is None or info.location == -1 or info.value == value:
+                continue
+            uploader = _UPLOADERS.get(info.glsl_type)
+            if uploader is None:
+                continue
+            uploader(info.location, info.array_size, value)
+            info.value = value
+
+        program.bound_state = key
+        return program
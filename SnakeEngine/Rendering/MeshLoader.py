@@ -0,0 +1,383 @@
+import base64
+import hashlib
+import json
+import os
+import re
+import struct
+from typing import Optional
+
+import numpy as np
+
+from ..Core.FileSystem import FileSystem
+from ..Core.Logger import Logger
+
+# Interleaved layout of every loaded mesh: position, normal, uv.
+FLOATS_PER_VERTEX = 8
+
+_CACHE_DIR = "MeshCache"
+_CACHE_MAGIC = b"SNKMESH1"
+# Bump when the parsers or the vertex layout change so stale caches are ignored.
+_CACHE_VERSION = 1
+_HEADER = struct.Struct("<8sIIII8x")
+
+_OBJ_VERTEX_RE = re.compile(rb"^v[ \t]+(.*)$", re.MULTILINE)
+_OBJ_NORMAL_RE = re.compile(rb"^vn[ \t]+(.*)$", re.MULTILINE)
+_OBJ_UV_RE = re.compile(rb"^vt[ \t]+(.*)$", re.MULTILINE)
+_OBJ_FACE_RE = re.compile(rb"^f[ \t]+(.*)$", re.MULTILINE)
+
+_GLTF_COMPONENT_TYPES = {
+    5120: np.int8,
+    5121: np.uint8,
+    5122: np.int16,
+    5123: np.uint16,
+    5125: np.uint32,
+    5126: np.float32,
+}
+_GLTF_TYPE_SIZES = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4, "MAT4": 16}
+_GLTF_TRIANGLES = 4
+
+
+def load_mesh_data(relative: str) -> Optional[tuple]:
+    path = FileSystem.resolve_asset_path(relative)
+    if path is None:
+        Logger.error(f"Mesh asset not found: '{relative}'")
+        return None
+
+    try:
+        key = source_hash(path)
+        cached = read_cache(key)
+        if cached is not None:
+            return cached
+
+        ext = os.path.splitext(path)[1].lower()
+        if ext == ".obj":
+            with open(path, "rb") as f:
+                vertices, indices = parse_obj(f.read())
+        elif ext in (".gltf", ".glb"):
+            vertices, indices = parse_gltf(path)
+        else:
+            Logger.error(f"Unsupported mesh format '{ext}' for '{relative}'.")
+            return None
+    except Exception as e:
+        Logger.error(f"Failed to load mesh '{relative}': {e}", exc_info=True)
+        return None
+
+    write_cache(key, vertices, indices)
+    return vertices, indices
+
+
+def source_hash(path: str) -> str:
+    digest = hashlib.sha1(struct.pack("<I", _CACHE_VERSION))
+    for source in _source_files(path):
+        with open(source, "rb") as f:
+            while chunk := f.read(1 << 20):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_files(path: str) -> list[str]:
+    if not path.lower().endswith(".gltf"):
+        return [path]
+    with open(path, encoding="utf-8") as f:
+        doc = json.load(f)
+    base = os.path.dirname(path)
+    files = [path]
+    for buffer in doc.get("buffers", []):
+        uri = buffer.get("uri")
+        if uri and not uri.startswith("data:"):
+            files.append(os.path.join(base, uri))
+    return files
+
+
+def read_cache(key: str) -> Optional[tuple]:
+    relative = f"{_CACHE_DIR}/{key}.mesh"
+    if not FileSystem.exists(relative):
+        return None
+
+    path = FileSystem.user_data_path / relative
+    try:
+        mapped = np.memmap(path, dtype=np.uint8, mode="r")
+        magic, version, vertex_count, index_count, floats = _HEADER.unpack(
+            mapped[: _HEADER.size].tobytes()
+        )
+        vertex_bytes = vertex_count * floats * 4
+        expected = _HEADER.size + vertex_bytes + index_count * 4
+        if (
+            magic != _CACHE_MAGIC
+            or version != _CACHE_VERSION
+            or floats != FLOATS_PER_VERTEX
+            or mapped.size != expected
+        ):
+            Logger.warning(f"Ignoring stale or truncated mesh cache '{relative}'.")
+            return None
+
+        vertex_end = _HEADER.size + vertex_bytes
+        vertices = mapped[_HEADER.size : vertex_end].view(np.float32)
+        indices = mapped[vertex_end:].view(np.uint32)
+        return vertices.reshape(-1, floats), indices
+    except Exception as e:
+        Logger.error(f"Failed to map mesh cache '{relative}': {e}", exc_info=True)
+        return None
+
+
+def write_cache(key: str, vertices: np.ndarray, indices: np.ndarray) -> bool:
+    vertices = np.ascontiguousarray(vertices, dtype=np.float32)
+    indices = np.ascontiguousarray(indices, dtype=np.uint32)
+    header = _HEADER.pack(
+        _CACHE_MAGIC,
+        _CACHE_VERSION,
+        vertices.size // FLOATS_PER_VERTEX,
+        indices.size,
+        FLOATS_PER_VERTEX,
+    )
+    return FileSystem.write(
+        f"{_CACHE_DIR}/{key}.mesh", header + vertices.tobytes() + indices.tobytes()
+    )
+
+
+def parse_obj(data: bytes) -> tuple:
+    positions = _obj_floats(_OBJ_VERTEX_RE.findall(data), 3)
+    normals = _obj_floats(_OBJ_NORMAL_RE.findall(data), 3)
+    uvs = _obj_floats(_OBJ_UV_RE.findall(data), 2)
+    faces = _OBJ_FACE_RE.findall(data)
+    if positions is None or not faces:
+        raise ValueError("OBJ file has no vertices or faces")
+
+    joined = b"\n".join(faces)
+    first = joined.split(None, 1)[0].split(b"/")
+    width = len(first)
+    has_uv = width >= 2 and first[1] != b""
+    has_normal = width == 3
+
+    corners = np.array(
+        joined.replace(b"//", b"/0/").replace(b"/", b" ").split(), dtype=np.int64
+    )
+    if corners.size % width:
+        raise ValueError("OBJ faces mix different v/vt/vn formats")
+    corners = corners.reshape(-1, width)
+
+    # Number of corners per face: count token starts on every line.
+    buf = np.frombuffer(joined, dtype=np.uint8)
+    is_token = buf > 32
+    starts = is_token & ~np.concatenate(([False], is_token[:-1]))
+    line_of = np.cumsum(buf == 10)
+    counts = np.bincount(line_of[starts], minlength=len(faces))
+    triangles = _fan_triangulate(counts)
+
+    v = _obj_index(corners[:, 0], len(positions))
+    t = np.zeros_like(v)
+    n = np.zeros_like(v)
+    uv_count = normal_count = 1
+    if has_uv and uvs is not None:
+        uv_count = len(uvs)
+        t = _obj_index(corners[:, 1], uv_count)
+    if has_normal and normals is not None:
+        normal_count = len(normals)
+        n = _obj_index(corners[:, 2], normal_count)
+
+    # Each distinct (v, vt, vn) corner becomes one vertex; packing the triple
+    # into one integer keeps the dedupe a flat sort.
+    keys = (v * uv_count + t) * normal_count + n
+    unique, inverse = np.unique(keys, return_inverse=True)
+    indices = inverse.reshape(-1)[triangles].astype(np.uint32).reshape(-1)
+    unique_n = unique % normal_count
+    unique_t = unique // normal_count % uv_count
+    unique_v = unique // normal_count // uv_count
+
+    vertices = np.zeros((unique.shape[0], FLOATS_PER_VERTEX), dtype=np.float32)
+    vertices[:, 0:3] = positions[unique_v]
+    if has_normal and normals is not None:
+        vertices[:, 3:6] = normals[unique_n]
+    else:
+        vertices[:, 3:6] = _smooth_normals(vertices[:, 0:3], indices)
+    if has_uv and uvs is not None:
+        vertices[:, 6:8] = uvs[unique_t]
+    return vertices, indices
+
+
+def _obj_floats(lines: list, width: int) -> Optional[np.ndarray]:
+    if not lines:
+        return None
+    values = np.array(b" ".join(lines).split(), dtype=np.float32)
+    stride = len(lines[0].split())
+    if values.size != stride * len(lines) or stride < width:
+        raise ValueError("OBJ attribute lines have inconsistent component counts")
+    return values.reshape(-1, stride)[:, :width]
+
+
+def _obj_index(index: np.ndarray, count: int) -> np.ndarray:
+    return np.where(index < 0, index + count, index - 1)
+
+
+def _fan_triangulate(counts: np.ndarray) -> np.ndarray:
+    offsets = np.cumsum(counts) - counts
+    per_face = np.maximum(counts - 2, 0)
+    face = np.repeat(np.arange(counts.size), per_face)
+    local = np.arange(face.size) - np.repeat(np.cumsum(per_face) - per_face, per_face)
+    first = offsets[face]
+    return np.stack((first, first + local + 1, first + local + 2), axis=1)
+
+
+def _smooth_normals(positions: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    tris = indices.reshape(-1, 3)
+    a, b, c = positions[tris[:, 0]], positions[tris[:, 1]], positions[tris[:, 2]]
+    face_normals = np.cross(b - a, c - a)
+
+    corners = tris.reshape(-1)
+    normals = np.empty((positions.shape[0], 3), dtype=np.float32)
+    for axis in range(3):
+        weights = np.repeat(face_normals[:, axis], 3)
+        normals[:, axis] = np.bincount(
+            corners, weights=weights, minlength=positions.shape[0]
+        )
+    length = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, length, out=normals, where=length > 0.0)
+    return normals
+
+
+def parse_gltf(path: str) -> tuple:
+    doc, buffers = _read_gltf(path)
+    meshes = doc.get("meshes", [])
+    nodes = doc.get("nodes", [])
+
+    scenes = doc.get("scenes")
+    if scenes:
+        roots = scenes[doc.get("scene", 0)].get("nodes", [])
+        stack = [(node, np.identity(4)) for node in roots]
+    else:
+        stack = [(None, np.identity(4))]
+
+    vertex_parts = []
+    index_parts = []
+    vertex_count = 0
+    while stack:
+        node_index, parent = stack.pop()
+        if node_index is None:
+            instances = [(i, parent) for i in range(len(meshes))]
+        else:
+            node = nodes[node_index]
+            world = parent @ _gltf_node_matrix(node)
+            stack.extend((child, world) for child in node.get("children", []))
+            instances = [(node["mesh"], world)] if "mesh" in node else []
+
+        for mesh_index, world in instances:
+            for primitive in meshes[mesh_index].get("primitives", []):
+                if primitive.get("mode", _GLTF_TRIANGLES) != _GLTF_TRIANGLES:
+                    continue
+                vertices, indices = _gltf_primitive(doc, buffers, primitive, world)
+                vertex_parts.append(vertices)
+                index_parts.append(indices + vertex_count)
+                vertex_count += vertices.shape[0]
+
+    if not vertex_parts:
+        raise ValueError("glTF file has no triangle primitives")
+    return np.concatenate(vertex_parts), np.concatenate(index_parts)
+
+
+def _read_gltf(path: str) -> tuple:
+    with open(path, "rb") as f:
+        data = f.read()
+
+    embedded = None
+    if data[:4] == b"glTF":
+        offset = 12
+        doc = None
+        while offset < len(data):
+            length, chunk_type = struct.unpack_from("<II", data, offset)
+            chunk = data[offset + 8 : offset + 8 + length]
+            if chunk_type == 0x4E4F534A:
+                doc = json.loads(chunk)
+            elif chunk_type == 0x004E4942:
+                embedded = chunk
+            offset += 8 + length
+        if doc is None:
+            raise ValueError("GLB file has no JSON chunk")
+    else:
+        doc = json.loads(data)
+
+    base = os.path.dirname(path)
+    buffers = []
+    for buffer in doc.get("buffers", []):
+        uri = buffer.get("uri")
+        if uri is None:
+            buffers.append(embedded)
+        elif uri.startswith("data:"):
+            buffers.append(base64.b64decode(uri.split(",", 1)[1]))
+        else:
+            with open(os.path.join(base, uri), "rb") as f:
+                buffers.append(f.read())
+    return doc, buffers
+
+
+def _gltf_accessor(doc: dict, buffers: list, index: int) -> np.ndarray:
+    accessor = doc["accessors"][index]
+    dtype = np.dtype(_GLTF_COMPONENT_TYPES[accessor["componentType"]])
+    width = _GLTF_TYPE_SIZES[accessor["type"]]
+    count = accessor["count"]
+
+    if "bufferView" not in accessor:
+        return np.zeros((count, width), dtype=dtype)
+
+    view = doc["bufferViews"][accessor["bufferView"]]
+    offset = view.get("byteOffset", 0) + accessor.get("byteOffset", 0)
+    stride = view.get("byteStride") or dtype.itemsize * width
+    values = np.ndarray(
+        (count, width),
+        dtype=dtype,
+        buffer=buffers[view["buffer"]],
+        offset=offset,
+        strides=(stride, dtype.itemsize),
+    )
+    if accessor.get("normalized") and dtype.kind in "iu":
+        return values.astype(np.float32) / np.iinfo(dtype).max
+    return values
+
+
+def _gltf_node_matrix(node: dict) -> np.ndarray:
+    if "matrix" in node:
+        return np.array(node["matrix"], dtype=np.float64).reshape(4, 4).T
+
+    x, y, z, w = node.get("rotation", (0.0, 0.0, 0.0, 1.0))
+    rotation = np.array(
+        (
+            (1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)),
+            (2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)),
+            (2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)),
+        )
+    )
+    matrix = np.identity(4)
+    matrix[:3, :3] = rotation * np.asarray(node.get("scale", (1.0, 1.0, 1.0)))
+    matrix[:3, 3] = node.get("translation", (0.0, 0.0, 0.0))
+    return matrix
+
+
+def _gltf_primitive(doc: dict, buffers: list, primitive: dict, world) -> tuple:
+    attributes = primitive["attributes"]
+    positions = _gltf_accessor(doc, buffers, attributes["POSITION"])
+
+    if "indices" in primitive:
+        indices = _gltf_accessor(doc, buffers, primitive["indices"]).reshape(-1)
+        indices = indices.astype(np.uint32)
+    else:
+        indices = np.arange(positions.shape[0], dtype=np.uint32)
+
+    vertices = np.zeros((positions.shape[0], FLOATS_PER_VERTEX), dtype=np.float32)
+    linear = world[:3, :3]
+    vertices[:, 0:3] = positions @ linear.T + world[:3, 3]
+
+    if "NORMAL" in attributes:
+        normals = _gltf_accessor(doc, buffers, attributes["NORMAL"])
+        normals = normals @ np.linalg.inv(linear)
+        length = np.linalg.norm(normals, axis=1, keepdims=True)
+        vertices[:, 3:6] = np.divide(
+            normals, length, out=np.zeros_like(normals), where=length > 0.0
+        )
+    else:
+        vertices[:, 3:6] = _smooth_normals(vertices[:, 0:3], indices)
+
+    if "TEXCOORD_0" in attributes:
+        uvs = _gltf_accessor(doc, buffers, attributes["TEXCOORD_0"])
+        # glTF puts the uv origin top-left, textures are uploaded flipped.
+        vertices[:, 6] = uvs[:, 0]
+        vertices[:, 7] = 1.0 - uvs[:, 1]
+    return vertices, indices
@@ -0,0 +1,467 @@
+import ctypes
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from OpenGL.GL import *
+
+from ..Core.Logger import Logger
+from . import MeshLoader
+from .GraphicsContext import GraphicsContext
+
+CUBE_MESH = "SnakeEngine/Cube"
+
+ATTRIB_POSITION = 0
+ATTRIB_COLOR = 1
+ATTRIB_NORMAL = 2
+# Per-instance model matrices occupy four consecutive vec4 attribute slots.
+INSTANCE_MATRIX_LOCATION = 3
+ATTRIB_UV = 7
+
+COLORED_LAYOUT = ((ATTRIB_POSITION, 3), (ATTRIB_COLOR, 3))
+ASSET_LAYOUT = ((ATTRIB_POSITION, 3), (ATTRIB_NORMAL, 3), (ATTRIB_UV, 2))
+
+_CUBE_VERTICES = [
+    -0.5,
+    -0.5,
+    0.5,
+    1.0,
+    0.0,
+    0.0,
+    0.5,
+    -0.5,
+    0.5,
+    1.0,
+    0.0,
+    0.0,
+    0.5,
+    0.5,
+    0.5,
+    1.0,
+    0.0,
+    0.0,
+    -0.5,
+    -0.5,
+    0.5,
+    1.0,
+    0.0,
+    0.0,
+    0.5,
+    0.5,
+    0.5,
+    1.0,
+    0.0,
+    0.0,
+    -0.5,
+    0.5,
+    0.5,
+    1.0,
+    0.0,
+    0.0,
+    -0.5,
+    -0.5,
+    -0.5,
+    0.0,
+    1.0,
+    0.0,
+    -0.5,
+    0.5,
+    -0.5,
+    0.0,
+    1.0,
+    0.0,
+    0.5,
+    0.5,
+    -0.5,
+    0.0,
+    1.0,
+    0.0,
+    -0.5,
+    -0.5,
+    -0.5,
+    0.0,
+    1.0,
+    0.0,
+    0.5,
+    0.5,
+    -0.5,
+    0.0,
+    1.0,
+    0.0,
+    0.5,
+    -0.5,
+    -0.5,
+    0.0,
+    1.0,
+    0.0,
+    -0.5,
+    0.5,
+    -0.5,
+    0.0,
+    0.0,
+    1.0,
+    -0.5,
+    0.5,
+    0.5,
+    0.0,
+    0.0,
+    1.0,
+    0.5,
+    0.5,
+    0.5,
+    0.0,
+    0.0,
+    1.0,
+    -0.5,
+    0.5,
+    -0.5,
+    0.0,
+    0.0,
+    1.0,
+    0.5,
+    0.5,
+    0.5,
+    0.0,
+    0.0,
+    1.0,
+    0.5,
+    0.5,
+    -0.5,
+    0.0,
+    0.0,
+    1.0,
+    -0.5,
+    -0.5,
+    -0.5,
+    1.0,
+    1.0,
+    0.0,
+    0.5,
+    -0.5,
+    -0.5,
+    1.0,
+    1.0,
+    0.0,
+    0.5,
+    -0.5,
+    0.5,
+    1.0,
+    1.0,
+    0.0,
+    -0.5,
+    -0.5,
+    -0.5,
+    1.0,
+    1.0,
+    0.0,
+    0.5,
+    -0.5,
+    0.5,
+    1.0,
+    1.0,
+    0.0,
+    -0.5,
+    -0.5,
+    0.5,
+    1.0,
+    1.0,
+    0.0,
+    0.5,
+    -0.5,
+    -0.5,
+    1.0,
+    0.0,
+    1.0,
+    0.5,
+    0.5,
+    -0.5,
+    1.0,
+    0.0,
+    1.0,
+    0.5,
+    0.5,
+    0.5,
+    1.0,
+    0.0,
+    1.0,
+    0.5,
+    -0.5,
+    -0.5,
+    1.0,
+    0.0,
+    1.0,
+    0.5,
+    0.5,
+    0.5,
+    1.0,
+    0.0,
+    1.0,
+    0.5,
+    -0.5,
+    0.5,
+    1.0,
+    0.0,
+    1.0,
+    -0.5,
+    -0.5,
+    -0.5,
+    0.0,
+    1.0,
+    1.0,
+    -0.5,
+    -0.5,
+    0.5,
+    0.0,
+    1.0,
+    1.0,
+    -0.5,
+    0.5,
+    0.5,
+    0.0,
+    1.0,
+    1.0,
+    -0.5,
+    -0.5,
+    -0.5,
+    0.0,
+    1.0,
+    1.0,
+    -0.5,
+    0.5,
+    0.5,
+    0.0,
+    1.0,
+    1.0,
+    -0.5,
+    0.5,
+    -0.5,
+    0.0,
+    1.0,
+    1.0,
+]
+
+
+@dataclass(eq=False)
+class Mesh:
+    name: str
+    vao: int = 0
+    vbo: int = 0
+    ebo: int = 0
+    vertex_count: int = 0
+    index_count: int = 0
+    layout: tuple = COLORED_LAYOUT
+    has_color: bool = True
+    has_normal: bool = False
+    instance_vbo: int = 0
+    instance_capacity: int = 0
+    bounds_min: tuple = (0.0, 0.0, 0.0)
+    bounds_max: tuple = (0.0, 0.0, 0.0)
+    # Bounding sphere around the AABB centre, used for culling.
+    bounds_center: tuple = (0.0, 0.0, 0.0)
+    bounds_radius: float = 0.0
+    # CPU copies of what was uploaded, for static batching.
+    vertices: Optional[np.ndarray] = None
+    indices: Optional[np.ndarray] = None
+
+    def upload_instances(self, matrices: np.ndarray) -> int:
+        count = matrices.shape[0]
+        nbytes = count * 64
+        GraphicsContext.State.BindBuffer(GL_ARRAY_BUFFER, self.instance_vbo)
+        if count > self.instance_capacity:
+            self.instance_capacity = max(count, self.instance_capacity * 2)
+        # Orphan the old storage so the driver doesn't stall on last frame's draw.
+        glBufferData(GL_ARRAY_BUFFER, self.instance_capacity * 64, None, GL_STREAM_DRAW)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, nbytes, matrices)
+        return count
+
+    def bind(self):
+        GraphicsContext.State.BindVertexArray(self.vao)
+        if not self.has_color:
+            # Meshes without vertex colors read the constant attribute instead.
+            glVertexAttrib3f(ATTRIB_COLOR, 1.0, 1.0, 1.0)
+        if not self.has_normal:
+            # A zero normal tells lit shaders to derive one per face.
+            glVertexAttrib3f(ATTRIB_NORMAL, 0.0, 0.0, 0.0)
+
+    def draw(self, instance_count: int = 0, bind: bool = True):
+        # The VAO is left bound so consecutive draws of one mesh skip the rebind.
+        if bind:
+            self.bind()
+        if self.ebo:
+            if instance_count:
+                glDrawElementsInstanced(
+                    GL_TRIANGLES,
+                    self.index_count,
+                    GL_UNSIGNED_INT,
+                    None,
+                    instance_count,
+                )
+            else:
+                glDrawElements(GL_TRIANGLES, self.index_count, GL_UNSIGNED_INT, None)
+        elif instance_count:
+            glDrawArraysInstanced(GL_TRIANGLES, 0, self.vertex_count, instance_count)
+        else:
+            glDrawArrays(GL_TRIANGLES, 0, self.vertex_count)
+
+
+def _compute_bounds(mesh: Mesh, vertices: np.ndarray, layout: tuple):
+    offset = 0
+    for location, size in layout:
+        if location == ATTRIB_POSITION:
+            break
+        offset += size
+    else:
+        return
+    if not len(vertices):
+        return
+
+    positions = vertices[:, offset : offset + 3]
+    low = positions.min(axis=0)
+    high = positions.max(axis=0)
+    center = (low + high) * 0.5
+    offsets = positions - center
+    mesh.bounds_min = tuple(low.tolist())
+    mesh.bounds_max = tuple(high.tolist())
+    mesh.bounds_center = tuple(center.tolist())
+    mesh.bounds_radius = float(np.sqrt(np.einsum("ij,ij->i", offsets, offsets).max()))
+
+
+class _MeshManagerSingleton:
+    def __init__(self):
+        self._meshes: dict[str, Mesh] = {}
+
+    def get(self, name: str) -> Optional[Mesh]:
+        return self._meshes.get(name)
+
+    def load_vertices(
+        self,
+        name: str,
+        vertices,
+        layout: tuple = COLORED_LAYOUT,
+        indices=None,
+        force_reload: bool = False,
+    ) -> Optional[Mesh]:
+        if name in self._meshes and not force_reload:
+            return self._meshes[name]
+
+        data = np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1)
+        floats_per_vertex = sum(size for _, size in layout)
+        if floats_per_vertex == 0 or data.size % floats_per_vertex:
+            Logger.error(
+                f"Mesh '{name}' has {data.size} floats, "
+                f"which does not match a {floats_per_vertex}-float vertex layout."
+            )
+            return None
+
+        mesh = self._meshes.get(name)
+        if mesh is None:
+            mesh = Mesh(name=name, layout=tuple(layout))
+            mesh.vao = glGenVertexArrays(1)
+            mesh.vbo = glGenBuffers(1)
+            mesh.instance_vbo = glGenBuffers(1)
+            self._meshes[name] = mesh
+        mesh.layout = tuple(layout)
+        mesh.has_color = any(location == ATTRIB_COLOR for location, _ in layout)
+        mesh.has_normal = any(location == ATTRIB_NORMAL for location, _ in layout)
+        mesh.vertex_count = data.size // floats_per_vertex
+        mesh.vertices = data
+        _compute_bounds(mesh, data.reshape(-1, floats_per_vertex), layout)
+
+        state = GraphicsContext.State
+        state.BindVertexArray(mesh.vao)
+        state.BindBuffer(GL_ARRAY_BUFFER, mesh.vbo)
+        glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_STATIC_DRAW)
+
+        stride = floats_per_vertex * 4
+        offset = 0
+        for location, size in layout:
+            glVertexAttribPointer(
+                location, size, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(offset)
+            )
+            glEnableVertexAttribArray(location)
+            offset += size * 4
+
+        state.BindBuffer(GL_ARRAY_BUFFER, mesh.instance_vbo)
+        for column in range(4):
+            location = INSTANCE_MATRIX_LOCATION + column
+            glVertexAttribPointer(
+                location, 4, GL_FLOAT, GL_FALSE, 64, ctypes.c_void_p(column * 16)
+            )
+            glEnableVertexAttribArray(location)
+            glVertexAttribDivisor(location, 1)
+
+        if indices is not None:
+            index_data = np.ascontiguousarray(indices, dtype=np.uint32).reshape(-1)
+            if not mesh.ebo:
+                mesh.ebo = glGenBuffers(1)
+            state.BindBuffer(GL_ELEMENT_ARRAY_BUFFER, mesh.ebo)
+            glBufferData(
+                GL_ELEMENT_ARRAY_BUFFER, index_data.nbytes, index_data, GL_STATIC_DRAW
+            )
+            mesh.index_count = index_data.size
+            mesh.indices = index_data
+        else:
+            # A reload without indices draws unindexed; deleting the buffer
+            # while the VAO is bound also detaches it.
+            if mesh.ebo:
+                glDeleteBuffers(1, [mesh.ebo])
+                mesh.ebo = 0
+            mesh.index_count = 0
+            mesh.indices = None
+
+        state.BindVertexArray(0)
+
+        Logger.info(f"Mesh '{name}' uploaded ({mesh.vertex_count} vertices).")
+        return mesh
+
+    def load(self, path: str, force_reload: bool = False) -> Optional[Mesh]:
+        if path in self._meshes and not force_reload:
+            return self._meshes[path]
+
+        data = MeshLoader.load_mesh_data(path)
+        if data is None:
+            return None
+
+        vertices, indices = data
+        return self.load_vertices(
+            path, vertices, ASSET_LAYOUT, indices, force_reload=True
+        )
+
+    def cube(self) -> Mesh:
+        mesh = self._meshes.get(CUBE_MESH)
+        if mesh is None:
+            mesh = self.load_vertices(CUBE_MESH, _CUBE_VERTICES)
+        return mesh
+
+    def list_meshes(self) -> list[str]:
+        return list(self._meshes.keys())
+
+    def unload(self, name: str):
+        mesh = self._meshes.pop(name, None)
+        if mesh is None:
+            return
+        self._delete(mesh)
+        state = GraphicsContext.State
+        for gl_id in (mesh.vao, mesh.vbo, mesh.ebo, mesh.instance_vbo):
+            state.Forget(gl_id)
+
+    def cleanup(self):
+        Logger.info("Cleaning up shared meshes...")
+        for mesh in self._meshes.values():
+            self._delete(mesh)
+        self._meshes.clear()
+        GraphicsContext.State.Invalidate()
+
+    @staticmethod
+    def _delete(mesh: Mesh):
+        try:
+            buffers = [b for b in (mesh.vbo, mesh.ebo, mesh.instance_vbo) if b]
+            if buffers:
+                glDeleteBuffers(len(buffers), buffers)
+            if mesh.vao:
+                glDeleteVertexArrays(1, [mesh.vao])
+        except Exception as e:
+            Logger.error(f"Failed to delete mesh '{mesh.name}': {e}", exc_info=True)
+
+
+MeshManager = _MeshManagerSingleton()
@@ -1,14 +1,24 @@
-import ctypes
+from typing import Optional, Union
+
 from OpenGL.GL import *
 import numpy as np
 
 from ..Core.Mathematics.Matrix4 import Matrix4
 from ..Core.Mathematics.Transform import Transform
 from ..Assets.DefaultAssets import DefaultAssets
+from .Frustum import transform_spheres
+from .LODGroup import LODGroup, LOD_SCREEN_SIZE
+from .Material import Material
+from .MeshManager import Mesh, MeshManager
+from .RenderQueue import RenderQueue, bind_material, uniform_location
 from .ShaderManager import ShaderManager
 
 _SHADER_NAME = "SnakeEngine/Default"
 
+# Batch groups per queried entity list:
+# id(list) -> (list, state version, (groups, centers, radii, included)).
+_batch_cache: dict = {}
+
 
 def _ensure_default_shader():
     if ShaderManager.get(_SHADER_NAME) == 0:
@@ -19,277 +29,250 @@ def _ensure_default_shader():
         )
 
 
+def _resolve_mesh(mesh: Union[Mesh, str, None]) -> Optional[Mesh]:
+    if isinstance(mesh, str):
+        return MeshManager.load(mesh)
+    return mesh
+
+
+def _batch_groups(entities) -> tuple:
+    cached = _batch_cache.get(id(entities))
+    if (
+        cached is not None
+        and cached[0] is entities
+        and cached[1] == MeshRenderer._StateVersion
+    ):
+        return cached[2]
+
+    grouped: dict = {}
+    centers = np.zeros((len(entities), 3), dtype=np.float32)
+    radii = np.zeros(len(entities), dtype=np.float32)
+    included = np.ones(len(entities), dtype=bool)
+    for index, entity in enumerate(entities):
+        renderer = entity.GetComponent(MeshRenderer)
+        if renderer is None or renderer._mesh is None:
+            # Nothing to draw, so it counts as neither drawn nor culled.
+            included[index] = False
+            continue
+        if renderer._static_batched:
+            # Drawn by the StaticBatcher instead.
+            included[index] = False
+            continue
+        mesh = renderer._mesh
+        source = renderer._lod if renderer._lod is not None else mesh
+        grouped.setdefault((source, renderer._material), []).append((index, renderer))
+        centers[index] = mesh.bounds_center
+        radii[index] = mesh.bounds_radius
+
+    groups = []
+    for (source, material), members in grouped.items():
+        indices = np.array([index for index, _ in members], dtype=np.intp)
+        if isinstance(source, LODGroup):
+            renderers = [renderer for _, renderer in members]
+            levels = np.array([r._lod_level for r in renderers], dtype=np.intp)
+            groups.append((source, material, indices, (renderers, levels)))
+        elif len(indices) == len(entities):
+            # Everything shares one mesh and material, draw straight from the stack.
+            groups.append((source, material, None, None))
+        else:
+            groups.append((source, material, indices, None))
+
+    if len(_batch_cache) >= 8:
+        _batch_cache.clear()
+    result = (groups, centers, radii, None if included.all() else included)
+    _batch_cache[id(entities)] = (entities, MeshRenderer._StateVersion, result)
+    return result
+
+
+def _submit_lods(
+    queue, lod, material, indices, lod_state, model_matrices, world, visible
+):
+    renderers, levels = lod_state
+    offset = world[0][indices] - queue.CameraPosition
+    metric = np.sqrt(np.einsum("ij,ij->i", offset, offset))
+    if lod.Mode == LOD_SCREEN_SIZE:
+        # Reciprocal of the screen height fraction the sphere covers.
+        metric /= np.maximum(world[1][indices] * queue.ScreenScale, 1e-9)
+    metric *= queue.LODBias
+
+    new_levels = lod.SelectLevels(metric, levels)
+    for position in np.flatnonzero(new_levels != levels).tolist():
+        renderers[position]._lod_level = int(new_levels[position])
+    levels[:] = new_levels
+
+    keep = visible[indices] if visible is not None else None
+    for level, mesh in enumerate(lod.Meshes):
+        mask = new_levels == level
+        if keep is not None:
+            mask &= keep
+        if mask.any():
+            queue.Submit(material, mesh, model_matrices[indices[mask]])
+
+    if lod.CullLevel == lod.LevelCount:
+        beyond = new_levels == lod.CullLevel
+        if keep is not None:
+            beyond &= keep
+        dropped = int(np.count_nonzero(beyond))
+        queue.ObjectsDrawn -= dropped
+        queue.ObjectsCulled += dropped
+
+
 class MeshRenderer:
-    def __init__(self):
-        self.Vao = None
-        self.Vbo = None
-        self.VertexCount = 0
-        self._shader_name = _SHADER_NAME
-        self._InitializeCube()
-
-    def _InitializeCube(self):
+    _StateVersion = 0
+
+    def __init__(
+        self, mesh: Union[Mesh, str, None] = None, lod: Optional[LODGroup] = None
+    ):
         _ensure_default_shader()
+        self._mesh = _resolve_mesh(mesh) if mesh is not None else MeshManager.cube()
+        self._material = Material.ForShader(_SHADER_NAME)
+        self._lod = None
+        self._lod_level = 0
+        self._static_batched = False
+        # Entity whose scene indexes our bounds, set while registered.
+        self._BoundsOwner = None
+        if lod is not None:
+            self.LOD = lod
+
+    @property
+    def Mesh(self) -> Optional[Mesh]:
+        return self._mesh
+
+    @Mesh.setter
+    def Mesh(self, mesh: Union[Mesh, str, None]):
+        self._mesh = _resolve_mesh(mesh)
+        self._lod = None
+        MeshRenderer._StateVersion += 1
+        self._OnBoundsChanged()
 
-        vertices = [
-            -0.5,
-            -0.5,
-            0.5,
-            1.0,
-            0.0,
-            0.0,
-            0.5,
-            -0.5,
-            0.5,
-            1.0,
-            0.0,
-            0.0,
-            0.5,
-            0.5,
-            0.5,
-            1.0,
-            0.0,
-            0.0,
-            -0.5,
-            -0.5,
-            0.5,
-            1.0,
-            0.0,
-            0.0,
-            0.5,
-            0.5,
-            0.5,
-            1.0,
-            0.0,
-            0.0,
-            -0.5,
-            0.5,
-            0.5,
-            1.0,
-            0.0,
-            0.0,
-            -0.5,
-            -0.5,
-            -0.5,
-            0.0,
-            1.0,
-            0.0,
-            -0.5,
-            0.5,
-            -0.5,
-            0.0,
-            1.0,
-            0.0,
-            0.5,
-            0.5,
-            -0.5,
-            0.0,
-            1.0,
-            0.0,
-            -0.5,
-            -0.5,
-            -0.5,
-            0.0,
-            1.0,
-            0.0,
-            0.5,
-            0.5,
-            -0.5,
-            0.0,
-            1.0,
-            0.0,
-            0.5,
-            -0.5,
-            -0.5,
-            0.0,
-            1.0,
-            0.0,
-            -0.5,
-            0.5,
-            -0.5,
-            0.0,
-            0.0,
-            1.0,
-            -0.5,
-            0.5,
-            0.5,
-            0.0,
-            0.0,
-            1.0,
-            0.5,
-            0.5,
-            0.5,
-            0.0,
-            0.0,
-            1.0,
-            -0.5,
-            0.5,
-            -0.5,
-            0.0,
-            0.0,
-            1.0,
-            0.5,
-            0.5,
-            0.5,
-            0.0,
-            0.0,
-            1.0,
-            0.5,
-            0.5,
-            -0.5,
-            0.0,
-            0.0,
-            1.0,
-            -0.5,
-            -0.5,
-            -0.5,
-            1.0,
-            1.0,
-            0.0,
-            0.5,
-            -0.5,
-            -0.5,
-            1.0,
-            1.0,
-            0.0,
-            0.5,
-            -0.5,
-            0.5,
-            1.0,
-            1.0,
-            0.0,
-            -0.5,
-            -0.5,
-            -0.5,
-            1.0,
-            1.0,
-            0.0,
-            0.5,
-            -0.5,
-            0.5,
-            1.0,
-            1.0,
-            0.0,
-            -0.5,
-            -0.5,
-            0.5,
-            1.0,
-            1.0,
-            0.0,
-            0.5,
-            -0.5,
-            -0.5,
-            1.0,
-            0.0,
-            1.0,
-            0.5,
-            0.5,
-            -0.5,
-            1.0,
-            0.0,
-            1.0,
-            0.5,
-            0.5,
-            0.5,
-            1.0,
-            0.0,
-            1.0,
-            0.5,
-            -0.5,
-            -0.5,
-            1.0,
-            0.0,
-            1.0,
-            0.5,
-            0.5,
-            0.5,
-            1.0,
-            0.0,
-            1.0,
-            0.5,
-            -0.5,
-            0.5,
-            1.0,
-            0.0,
-            1.0,
-            -0.5,
-            -0.5,
-            -0.5,
-            0.0,
-            1.0,
-            1.0,
-            -0.5,
-            -0.5,
-            0.5,
-            0.0,
-            1.0,
-            1.0,
-            -0.5,
-            0.5,
-            0.5,
-            0.0,
-            1.0,
-            1.0,
-            -0.5,
-            -0.5,
-            -0.5,
-            0.0,
-            1.0,
-            1.0,
-            -0.5,
-            0.5,
-            0.5,
-            0.0,
-            1.0,
-            1.0,
-            -0.5,
-            0.5,
-            -0.5,
-            0.0,
-            1.0,
-            1.0,
-        ]
-
-        data = np.array(vertices, dtype=np.float32)
-        self.VertexCount = len(vertices) // 6
-
-        self.Vao = glGenVertexArrays(1)
-        self.Vbo = glGenBuffers(1)
-
-        glBindVertexArray(self.Vao)
-        glBindBuffer(GL_ARRAY_BUFFER, self.Vbo)
-        glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_STATIC_DRAW)
-
-        stride = 6 * 4
-        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(0))
-        glEnableVertexAttribArray(0)
-        glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(12))
-        glEnableVertexAttribArray(1)
-
-        glBindBuffer(GL_ARRAY_BUFFER, 0)
-        glBindVertexArray(0)
+    @property
+    def LOD(self) -> Optional[LODGroup]:
+        return self._lod
+
+    @LOD.setter
+    def LOD(self, lod: Optional[LODGroup]):
+        # The finest level supplies bounds and the single-draw Render() path.
+        self._lod = lod
+        self._lod_level = 0
+        if lod is not None:
+            self._mesh = lod.Meshes[0]
+        MeshRenderer._StateVersion += 1
+        self._OnBoundsChanged()
+
+    @property
+    def CurrentLOD(self) -> int:
+        return self._lod_level
+
+    @property
+    def Vao(self):
+        return self._mesh.vao if self._mesh is not None else None
+
+    @property
+    def VertexCount(self) -> int:
+        return self._mesh.vertex_count if self._mesh is not None else 0
+
+    @property
+    def Material(self):
+        return self._material
+
+    @Material.setter
+    def Material(self, material):
+        self._material = material
+        MeshRenderer._StateVersion += 1
+
+    def _OnBoundsChanged(self):
+        owner = self._BoundsOwner
+        if owner is not None and owner.Scene is not None:
+            owner.Scene._RefreshLocalBounds(owner)
+
+    def GetLocalBounds(self):
+        """(centre, radius) of the mesh in entity space, read by Scene."""
+        if self._mesh is None:
+            return None
+        return self._mesh.bounds_center, self._mesh.bounds_radius
 
     @property
     def ShaderProgram(self) -> int:
-        return ShaderManager.get(self._shader_name)
+        return ShaderManager.get(self._material.ShaderName)
 
     def use_shader(self, name: str):
-        self._shader_name = name
+        self.Material = Material.ForShader(name)
 
-    def Render(self, transform: Transform, view_mat: Matrix4, proj_mat: Matrix4):
-        program = self.ShaderProgram
-        if not program:
+    def Render(self, model, view_mat: Matrix4, proj_mat: Matrix4):
+        if self._mesh is None:
             return
 
-        glUseProgram(program)
+        program = bind_material(self._material, view_mat, proj_mat)
+        if program is None:
+            return
+
+        if isinstance(model, Transform):
+            model = model.GetWorldMatrixArray()
+
+        model_loc = uniform_location(program, "model")
+        if model_loc != -1:
+            glUniformMatrix4fv(model_loc, 1, GL_FALSE, model)
+            self._mesh.draw()
+        else:
+            self._mesh.upload_instances(np.asarray(model, np.float32).reshape(1, 16))
+            self._mesh.draw(1)
+
+    @staticmethod
+    def SubmitEntities(queue: RenderQueue, entities, model_matrices):
+        """Queues every MeshRenderer in ``entities``, one item per mesh/material.
+
+        ``model_matrices`` is the (N, 4, 4) stack from ``Scene.GetModelMatrices``
+        in the same order as ``entities``. Shaders that still declare a
+        ``model`` uniform fall back to one draw per renderer. When the queue
+        has a frustum, renderers outside it are dropped in a single pass.
+        """
+        groups, centers, radii, included = _batch_groups(entities)
+        count = len(entities) if included is None else int(np.count_nonzero(included))
 
-        model_loc = glGetUniformLocation(program, "model")
-        view_loc = glGetUniformLocation(program, "view")
-        proj_loc = glGetUniformLocation(program, "projection")
+        visible = None
+        world = None
+        if queue.Frustum is not None and count:
+            world = transform_spheres(model_matrices, centers, radii)
+            visible = queue.Frustum.TestSpheres(*world)
+            if included is not None:
+                drawn = int(np.count_nonzero(visible & included))
+            else:
+                drawn = int(np.count_nonzero(visible))
+            queue.ObjectsDrawn += drawn
+            queue.ObjectsCulled += count - drawn
+            if drawn == count:
+                visible = None
+        else:
+            queue.ObjectsDrawn += count
 
-        glUniformMatrix4fv(model_loc, 1, GL_FALSE, transform.GetWorldMatrix().M)
-        glUniformMatrix4fv(view_loc, 1, GL_FALSE, view_mat.M)
-        glUniformMatrix4fv(proj_loc, 1, GL_FALSE, proj_mat.M)
+        for mesh, material, indices, lod_state in groups:
+            if lod_state is not None:
+                if world is None:
+                    world = transform_spheres(model_matrices, centers, radii)
+                _submit_lods(
+                    queue,
+                    mesh,
+                    material,
+                    indices,
+                    lod_state,
+                    model_matrices,
+                    world,
+                    visible,
+                )
+                continue
+            if visible is not None:
+                if indices is None:
+                    indices = np.flatnonzero(visible)
+                else:
+                    indices = indices[visible[indices]]
+                if not len(indices):
+                    continue
+            models = model_matrices if indices is None else model_matrices[indices]
+            queue.Submit(material, mesh, models)
 
-        glBindVertexArray(self.Vao)
-        glDrawArrays(GL_TRIANGLES, 0, self.VertexCount)
-        glBindVertexArray(0)
+    @staticmethod
+    def RenderEntities(entities, model_matrices, view_mat: Matrix4, proj_mat: Matrix4):
+        queue = RenderQueue()
+        queue.Begin()
+        MeshRenderer.SubmitEntities(queue, entities, model_matrices)
+        queue.Flush(view_mat, proj_mat)
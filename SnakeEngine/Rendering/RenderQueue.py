@@ -0,0 +1,196 @@
+import itertools
+import weakref
+from operator import itemgetter
+from typing import Optional
+
+from OpenGL.GL import *
+import numpy as np
+
+from ..Core.Mathematics.Matrix4 import Matrix4
+from .Frustum import Frustum
+from .GraphicsContext import GraphicsContext
+from .Material import Material
+
+PASS_OPAQUE = 0
+PASS_SKYBOX = 1
+PASS_TRANSPARENT = 2
+
+# Sort key layout, most significant first:
+#   pass 3 bits | shader 13 bits | material 16 bits | mesh 16 bits | depth 16 bits
+_PASS_SHIFT = 61
+_SHADER_SHIFT = 48
+_MATERIAL_SHIFT = 32
+_MESH_SHIFT = 16
+_DEPTH_MAX = 0xFFFF
+
+
+def uniform_location(program, name: str) -> int:
+    info = program.uniforms.get(name)
+    return info.location if info is not None else -1
+
+
+def bind_material(material: Material, view_mat: Matrix4, proj_mat: Matrix4):
+    program = material.Bind()
+    if program is None:
+        return None
+
+    if not program.uses_frame_block:
+        # Shaders that declare loose view/projection uniforms instead of the
+        # SnakeFrame block still get them per bind.
+        glUniformMatrix4fv(
+            uniform_location(program, "view"), 1, GL_FALSE, view_mat.ToArray()
+        )
+        glUniformMatrix4fv(
+            uniform_location(program, "projection"), 1, GL_FALSE, proj_mat.ToArray()
+        )
+    return program
+
+
+class RenderQueue:
+    def __init__(self):
+        self._items = []
+        self._sort_ids = weakref.WeakKeyDictionary()
+        # Never derived from len(self._sort_ids): that shrinks as objects are
+        # collected and would hand a live object's ID to a new one.
+        self._next_sort_id = itertools.count(1)
+        self._camera_position = np.zeros(3, dtype=np.float32)
+        self._depth_scale = _DEPTH_MAX / 1000.0
+        self._frustum = Frustum()
+
+        # Set by Begin() when culling applies this frame, otherwise None.
+        self.Frustum = None
+        self.CullingEnabled = True
+        # Multiplies the LOD metric; above 1 switches to coarser levels sooner.
+        self.LODBias = 1.0
+        self.ScreenScale = 1.0
+        self.ObjectsDrawn = 0
+        self.ObjectsCulled = 0
+
+        self.DrawCalls = 0
+        self.MaterialBinds = 0
+        self.MeshBinds = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def Begin(
+        self,
+        camera_position=None,
+        far: float = 1000.0,
+        view_proj: Optional[Matrix4] = None,
+        screen_scale: float = 1.0,
+    ):
+        """``screen_scale`` is the projection's cot(fov / 2), used to turn
+        bounding radii into LOD screen sizes."""
+        self._items.clear()
+        self.ScreenScale = screen_scale
+        self.ObjectsDrawn = 0
+        self.ObjectsCulled = 0
+        if view_proj is not None and self.CullingEnabled:
+            self.Frustum = self._frustum.Update(view_proj)
+        else:
+            self.Frustum = None
+        if camera_position is not None:
+            self._camera_position[:] = (
+                camera_position.X,
+                camera_position.Y,
+                camera_position.Z,
+            )
+        self._depth_scale = _DEPTH_MAX / max(far, 1e-6)
+
+    @property
+    def CameraPosition(self) -> np.ndarray:
+        return self._camera_position
+
+    def Submit(self, material: Material, mesh, models: np.ndarray):
+        """Queues ``models`` (an (N, 4, 4) stack) for drawing with one mesh."""
+        if mesh is None or len(models) == 0:
+            return
+
+        program = material.Program
+        if program is None or not program.gl_id:
+            return
+
+        pass_ = PASS_TRANSPARENT if material.Transparent else PASS_OPAQUE
+        offset = models[:, 3, :3] - self._camera_position
+        distances = np.sqrt(np.einsum("ij,ij->i", offset, offset))
+        if pass_ == PASS_TRANSPARENT:
+            depth = _DEPTH_MAX - self._quantize(distances.max())
+        else:
+            depth = self._quantize(distances.min())
+
+        key = (
+            (pass_ << _PASS_SHIFT)
+            | ((program.gl_id & 0x1FFF) << _SHADER_SHIFT)
+            | (self._sort_id(material) << _MATERIAL_SHIFT)
+            | (self._sort_id(mesh) << _MESH_SHIFT)
+            | depth
+        )
+        self._items.append((key, material, mesh, models, None))
+
+    def SubmitCallback(self, pass_: int, callback, *args):
+        self._items.append((pass_ << _PASS_SHIFT, None, None, args, callback))
+
+    def Flush(self, view_mat: Matrix4, proj_mat: Matrix4):
+        self.DrawCalls = 0
+        self.MaterialBinds = 0
+        self.MeshBinds = 0
+
+        self._items.sort(key=itemgetter(0))
+        state = GraphicsContext.State
+
+        current_material = None
+        current_mesh = None
+        program = None
+        transparent = False
+        for key, material, mesh, models, callback in self._items:
+            if callback is not None:
+                callback(*models)
+                # Custom draws may touch any state, so rebind afterwards.
+                current_material = None
+                current_mesh = None
+                continue
+
+            if not transparent and key >> _PASS_SHIFT == PASS_TRANSPARENT:
+                transparent = True
+                state.Enable(GL_BLEND)
+                state.BlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+                state.DepthMask(False)
+
+            if material is not current_material:
+                program = bind_material(material, view_mat, proj_mat)
+                current_material = material
+                self.MaterialBinds += 1
+            if program is None:
+                continue
+
+            if mesh is not current_mesh:
+                mesh.bind()
+                current_mesh = mesh
+                self.MeshBinds += 1
+
+            model_loc = uniform_location(program, "model")
+            if model_loc != -1:
+                for model in models:
+                    glUniformMatrix4fv(model_loc, 1, GL_FALSE, model)
+                    mesh.draw(bind=False)
+                self.DrawCalls += len(models)
+            else:
+                count = mesh.upload_instances(models)
+                mesh.draw(count, bind=False)
+                self.DrawCalls += 1
+
+        if transparent:
+            state.DepthMask(True)
+            state.Disable(GL_BLEND)
+        self._items.clear()
+
+    def _quantize(self, distance: float) -> int:
+        return min(int(distance * self._depth_scale), _DEPTH_MAX)
+
+    def _sort_id(self, obj) -> int:
+        sort_id = self._sort_ids.get(obj)
+        if sort_id is None:
+            sort_id = next(self._next_sort_id) & 0xFFFF
+            self._sort_ids[obj] = sort_id
+        return sort_id
@@ -1,8 +1,14 @@
+import os
 import re
-from dataclasses import dataclass, field
+import hashlib
+from dataclasses import asdict, dataclass, field
 from typing import Optional, Union
 from OpenGL.GL import *
+import numpy as np
+from ..Core.FileSystem import FileSystem
 from ..Core.Logger import Logger
+from ..Assets.DefaultAssets import DefaultAssets
+from .GraphicsContext import GraphicsContext
 
 GLSL_TYPE_MAP = {
     GL_FLOAT: ("float", float),
@@ -21,7 +27,35 @@ GLSL_TYPE_MAP = {
     GL_SAMPLER_CUBE: ("samplerCube", None),
 }
 
-_ENGINE_UNIFORMS = {"model", "view", "projection", "viewPos", "time", "resolution"}
+# Per-frame engine uniforms live in one std140 block shared by every program.
+ENGINE_BLOCK_NAME = "SnakeFrame"
+ENGINE_BLOCK_BINDING = 0
+LIGHT_BLOCK_NAME = "SnakeLights"
+LIGHT_BLOCK_BINDING = 1
+
+# Texture units reserved for the lighting buffers, above the material units.
+ENGINE_SAMPLER_UNITS = {
+    "snakeLightData": 13,
+    "snakeLightGrid": 14,
+    "snakeLightIndices": 15,
+}
+
+_ENGINE_UNIFORMS = {
+    "model",
+    "view",
+    "projection",
+    "viewPos",
+    "time",
+    "resolution",
+    *ENGINE_SAMPLER_UNITS,
+}
+
+_BINARY_CACHE_DIR = "ShaderCache"
+
+_INCLUDE_RE = re.compile(
+    r'^[ \t]*#[ \t]*include[ \t]+[<"]([^>"]+)[>"].*$', re.MULTILINE
+)
+_VERSION_RE = re.compile(r"^[ \t]*#[ \t]*version[^\n]*\n?", re.MULTILINE)
 
 _UNIFORM_RE = re.compile(
     r"^\s*uniform\s+"
@@ -54,11 +88,17 @@ class ShaderProgram:
     frag_source: str = ""
     uniforms: dict[str, UniformInfo] = field(default_factory=dict)
     is_valid: bool = True
+    uses_frame_block: bool = False
+    bound_state: object = None
+    defines: frozenset = frozenset()
 
 
 class _ShaderManagerSingleton:
     def __init__(self):
         self._programs: dict[str, ShaderProgram] = {}
+        self._variants: dict[tuple[str, frozenset], ShaderProgram] = {}
+        self.binary_cache_enabled = True
+        self._driver_id: Optional[bytes] = None
 
     def load(
         self, name: str, vert_path: str, frag_path: str, force_recompile: bool = False
@@ -77,6 +117,10 @@ class _ShaderManagerSingleton:
             )
             return 0
 
+        vert_src = self._expand_includes(vert_src, os.path.dirname(vert_path), set())
+        frag_src = self._expand_includes(frag_src, os.path.dirname(frag_path), set())
+
+        self._drop_variants(name)
         program = self._compile(name, vert_src, frag_src)
         program.vert_path = vert_path
         program.frag_path = frag_path
@@ -97,6 +141,10 @@ class _ShaderManagerSingleton:
         if name in self._programs and not force_recompile:
             return self._programs[name].gl_id
 
+        vert_src = self._expand_includes(vert_src, None, set())
+        frag_src = self._expand_includes(frag_src, None, set())
+
+        self._drop_variants(name)
         program = self._compile(name, vert_src, frag_src)
         self._programs[name] = program
 
@@ -114,6 +162,46 @@ class _ShaderManagerSingleton:
     def get_program(self, name: str) -> Optional[ShaderProgram]:
         return self._programs.get(name)
 
+    def get_variant(self, name: str, features=()) -> int:
+        prog = self.get_variant_program(name, features)
+        return prog.gl_id if prog else 0
+
+    def get_variant_program(self, name: str, features=()) -> Optional[ShaderProgram]:
+        features = frozenset(features)
+        if not features:
+            return self._programs.get(name)
+
+        prog = self._variants.get((name, features))
+        if prog is not None:
+            return prog
+
+        base = self._programs.get(name)
+        if base is None:
+            Logger.warning(f"Shader variant requested for unknown program '{name}'.")
+            return None
+
+        variant_name = f"{name}[{','.join(sorted(features))}]"
+        prog = self._compile(
+            variant_name,
+            self._apply_defines(base.vert_source, features),
+            self._apply_defines(base.frag_source, features),
+        )
+        prog.defines = features
+        prog.vert_path = base.vert_path
+        prog.frag_path = base.frag_path
+        # Failed variants are kept too, so a broken permutation is not
+        # recompiled on every request.
+        self._variants[(name, features)] = prog
+
+        if prog.is_valid:
+            Logger.info(f"Shader variant '{variant_name}' compiled on first use.")
+        else:
+            Logger.error(f"Failed to compile shader variant '{variant_name}'.")
+        return prog
+
+    def list_variants(self, name: str) -> list[frozenset]:
+        return [features for base, features in self._variants if base == name]
+
     def get_uniforms(self, name: str, skip_engine: bool = True) -> list[UniformInfo]:
         prog = self._programs.get(name)
         if not prog:
@@ -134,6 +222,7 @@ class _ShaderManagerSingleton:
         if prog.gl_id:
             try:
                 glDeleteProgram(prog.gl_id)
+                GraphicsContext.State.Forget(prog.gl_id)
             except Exception as e:
                 Logger.error(
                     f"Error deleting old OpenGL shader program '{name}': {e}",
@@ -151,25 +240,88 @@ class _ShaderManagerSingleton:
 
     def cleanup(self):
         Logger.info("Cleaning up active shader programs...")
-        for prog in self._programs.values():
+        for prog in list(self._programs.values()) + list(self._variants.values()):
             if prog.gl_id:
                 try:
                     glDeleteProgram(prog.gl_id)
+                    GraphicsContext.State.Forget(prog.gl_id)
                 except Exception as e:
                     Logger.error(
                         f"Failed to delete shader program ID {prog.gl_id} on cleanup: {e}",
                         exc_info=True,
                     )
         self._programs.clear()
+        self._variants.clear()
 
     def list_shaders(self) -> list[str]:
         return list(self._programs.keys())
 
+    def _drop_variants(self, name: str):
+        for key in [k for k in self._variants if k[0] == name]:
+            prog = self._variants.pop(key)
+            if prog.gl_id:
+                glDeleteProgram(prog.gl_id)
+                GraphicsContext.State.Forget(prog.gl_id)
+
+    def _expand_includes(self, source: str, base_dir: Optional[str], seen: set) -> str:
+        def replace(match):
+            include = match.group(1)
+            path = self._resolve_include(include, base_dir)
+            if path is None:
+                Logger.error(f"Shader include not found: '{include}'")
+                return f"// include not found: {include}"
+            if path in seen:
+                return ""
+            seen.add(path)
+            try:
+                with open(path, encoding="utf-8") as f:
+                    text = f.read()
+            except OSError as e:
+                Logger.error(
+                    f"Failed to read shader include '{include}': {e}", exc_info=True
+                )
+                return f"// include not readable: {include}"
+            text = self._expand_includes(text, os.path.dirname(path), seen)
+            return text.rstrip("\n")
+
+        return _INCLUDE_RE.sub(replace, source)
+
+    @staticmethod
+    def _resolve_include(include: str, base_dir: Optional[str]) -> Optional[str]:
+        if base_dir:
+            path = os.path.join(base_dir, include)
+            if os.path.exists(path):
+                return os.path.realpath(path)
+        path = FileSystem.resolve_asset_path(include)
+        if path is not None:
+            return os.path.realpath(path)
+        path = os.path.join(DefaultAssets.GetAssetsPath(), "Shaders", include)
+        if os.path.exists(path):
+            return os.path.realpath(path)
+        return None
+
+    @staticmethod
+    def _apply_defines(source: str, features: frozenset) -> str:
+        lines = []
+        for feature in sorted(features):
+            name, _, value = feature.partition("=")
+            lines.append(f"#define {name} {value or 1}\n")
+        block = "".join(lines)
+
+        match = _VERSION_RE.search(source)
+        if match is None:
+            return block + source
+        return source[: match.end()] + block + source[match.end() :]
+
     def _compile(self, name: str, vert_src: str, frag_src: str) -> ShaderProgram:
         prog = ShaderProgram(
             name=name, gl_id=0, vert_source=vert_src, frag_source=frag_src
         )
 
+        cache_key = self._binary_cache_key(vert_src, frag_src)
+        if cache_key and self._load_program_binary(prog, cache_key):
+            return prog
+
         prog.uniforms = self._parse_uniforms_from_source(vert_src, frag_src)
 
         vs = self._compile_stage(name, vert_src, GL_VERTEX_SHADER, "VERTEX")
@@ -186,6 +338,8 @@ class _ShaderManagerSingleton:
         gl_id = glCreateProgram()
         glAttachShader(gl_id, vs)
         glAttachShader(gl_id, fs)
+        if cache_key:
+            glProgramParameteri(gl_id, GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL_TRUE)
         glLinkProgram(gl_id)
 
         if not glGetProgramiv(gl_id, GL_LINK_STATUS):
@@ -205,10 +359,112 @@ class _ShaderManagerSingleton:
         glDeleteShader(fs)
         prog.gl_id = gl_id
 
+        self._bind_engine_resources(prog)
         self._query_uniforms_gl(prog)
 
+        if cache_key:
+            self._store_program_binary(prog, cache_key)
+
         return prog
 
+    def _binary_cache_key(self, vert_src: str, frag_src: str) -> Optional[str]:
+        if not self.binary_cache_enabled:
+            return None
+
+        if self._driver_id is None:
+            try:
+                supported = bool(glProgramBinary) and bool(
+                    glGetIntegerv(GL_NUM_PROGRAM_BINARY_FORMATS)
+                )
+            except Exception:
+                supported = False
+            if not supported:
+                Logger.info("Program binaries are not supported by this driver.")
+                self.binary_cache_enabled = False
+                return None
+            self._driver_id = b"\0".join(
+                glGetString(e) or b"" for e in (GL_VENDOR, GL_RENDERER, GL_VERSION)
+            )
+
+        digest = hashlib.sha256(self._driver_id)
+        for src in (vert_src, frag_src):
+            digest.update(b"\0")
+            digest.update(src.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _load_program_binary(self, prog: ShaderProgram, key: str) -> bool:
+        meta_path = f"{_BINARY_CACHE_DIR}/{key}.json"
+        bin_path = f"{_BINARY_CACHE_DIR}/{key}.bin"
+        if not FileSystem.exists(meta_path) or not FileSystem.exists(bin_path):
+            return False
+
+        meta = FileSystem.read_json(meta_path)
+        binary = FileSystem.read_bytes(bin_path)
+        if not meta or not binary:
+            return False
+
+        gl_id = 0
+        reason = "was rejected"
+        try:
+            uniforms = {u["name"]: UniformInfo(**u) for u in meta["uniforms"]}
+            gl_id = glCreateProgram()
+            glProgramBinary(
+                gl_id, meta["format"], np.frombuffer(binary, np.uint8), len(binary)
+            )
+            linked = glGetProgramiv(gl_id, GL_LINK_STATUS)
+            if linked:
+                prog.gl_id = gl_id
+                prog.uniforms = uniforms
+                self._bind_engine_resources(prog)
+        except Exception as e:
+            # Unknown binary formats raise GLError; a damaged meta file
+            # raises KeyError or TypeError.
+            reason = f"is unusable ({e})"
+            linked = False
+
+        if not linked:
+            # Drivers reject binaries after updates; rebuild from source.
+            Logger.warning(
+                f"Cached binary for shader '{prog.name}' {reason}, recompiling."
+            )
+            if gl_id:
+                glDeleteProgram(gl_id)
+            prog.gl_id = 0
+            prog.uniforms = {}
+            FileSystem.delete(bin_path)
+            FileSystem.delete(meta_path)
+            return False
+
+        Logger.info(f"Shader '{prog.name}' loaded from program binary cache.")
+        return True
+
+    def _store_program_binary(self, prog: ShaderProgram, key: str):
+        try:
+            length = glGetProgramiv(prog.gl_id, GL_PROGRAM_BINARY_LENGTH)
+            if not length:
+                return
+            binary = np.empty(length, dtype=np.uint8)
+            written = np.zeros(1, dtype=np.int32)
+            binary_format = np.zeros(1, dtype=np.uint32)
+            glGetProgramBinary(prog.gl_id, length, written, binary_format, binary)
+        except Exception as e:
+            Logger.warning(f"Could not read program binary for '{prog.name}': {e}")
+            return
+
+        uniforms = []
+        for info in prog.uniforms.values():
+            entry = asdict(info)
+            entry.pop("value")
+            uniforms.append(entry)
+
+        if FileSystem.write(
+            f"{_BINARY_CACHE_DIR}/{key}.bin", binary[: int(written[0])].tobytes()
+        ):
+            FileSystem.write_json(
+                f"{_BINARY_CACHE_DIR}/{key}.json",
+                {"format": int(binary_format[0]), "uniforms": uniforms},
+            )
+
     def _compile_stage(
         self, shader_name: str, source: str, stage: int, stage_label: str
     ) -> int:
@@ -254,6 +510,23 @@ class _ShaderManagerSingleton:
 
         return uniforms
 
+    def _bind_engine_resources(self, prog: ShaderProgram):
+        index = glGetUniformBlockIndex(prog.gl_id, ENGINE_BLOCK_NAME)
+        prog.uses_frame_block = index != GL_INVALID_INDEX
+        if prog.uses_frame_block:
+            glUniformBlockBinding(prog.gl_id, index, ENGINE_BLOCK_BINDING)
+
+        index = glGetUniformBlockIndex(prog.gl_id, LIGHT_BLOCK_NAME)
+        if index != GL_INVALID_INDEX:
+            glUniformBlockBinding(prog.gl_id, index, LIGHT_BLOCK_BINDING)
+
+        # Sampler values are program state, and reset when loaded from a binary.
+        for uname, unit in ENGINE_SAMPLER_UNITS.items():
+            loc = glGetUniformLocation(prog.gl_id, uname)
+            if loc != -1:
+                GraphicsContext.State.UseProgram(prog.gl_id)
+                glUniform1i(loc, unit)
+
     def _query_uniforms_gl(self, prog: ShaderProgram):
         count = glGetProgramiv(prog.gl_id, GL_ACTIVE_UNIFORMS)
 
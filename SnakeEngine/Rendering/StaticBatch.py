@@ -0,0 +1,238 @@
+import math
+
+import numpy as np
+
+from ..Core.Logger import Logger
+from .MeshManager import ATTRIB_NORMAL, ATTRIB_POSITION, MeshManager
+from .MeshRenderer import MeshRenderer
+from .RenderQueue import RenderQueue
+
+_IDENTITY_MODELS = np.eye(4, dtype=np.float32).reshape(1, 4, 4)
+
+
+def _attribute_offset(layout: tuple, attribute: int) -> int:
+    offset = 0
+    for location, size in layout:
+        if location == attribute:
+            return offset
+        offset += size
+    return -1
+
+
+def bake_vertices(mesh, models: np.ndarray):
+    """Copies of ``mesh`` moved by each of ``models`` (an (N, 4, 4) stack).
+
+    Returns (vertices, indices) ready for one merged vertex buffer, with
+    positions and normals in world space.
+    """
+    floats = sum(size for _, size in mesh.layout)
+    source = mesh.vertices.reshape(-1, floats)
+    count = len(source)
+    linear = models[:, :3, :3]
+
+    vertices = np.broadcast_to(source, (len(models), count, floats)).copy()
+    position = _attribute_offset(mesh.layout, ATTRIB_POSITION)
+    if position >= 0:
+        span = slice(position, position + 3)
+        vertices[:, :, span] = np.einsum("vi,kij->kvj", source[:, span], linear)
+        vertices[:, :, span] += models[:, None, 3, :3]
+
+    normal = _attribute_offset(mesh.layout, ATTRIB_NORMAL)
+    if normal >= 0:
+        # Normals go through the inverse transpose to survive non-uniform scale.
+        span = slice(normal, normal + 3)
+        try:
+            inverse = np.linalg.inv(linear.astype(np.float64))
+        except np.linalg.LinAlgError:
+            # A zero scale axis; the pseudo-inverse keeps the other axes right.
+            inverse = np.linalg.pinv(linear.astype(np.float64))
+        normals = np.einsum("vi,kji->kvj", source[:, span], inverse)
+        lengths = np.linalg.norm(normals, axis=2, keepdims=True)
+        vertices[:, :, span] = normals / np.maximum(lengths, 1e-12)
+
+    local = mesh.indices if mesh.indices is not None else np.arange(count)
+    offsets = np.arange(len(models), dtype=np.uint32)[:, None] * count
+    indices = local.astype(np.uint32)[None, :] + offsets
+    return vertices.reshape(-1), indices.reshape(-1)
+
+
+class _StaticChunk:
+    __slots__ = ("key", "name", "material", "members", "mesh")
+
+    def __init__(self, key, name, material):
+        self.key = key
+        self.name = name
+        self.material = material
+        # entity -> renderer, in insertion order so rebuilds are stable.
+        self.members = {}
+        self.mesh = None
+
+
+class StaticBatcher:
+    """Merges static MeshRenderers into a few pre-transformed meshes.
+
+    Entities flagged ``IsStatic`` are grouped by material, vertex layout and
+    a coarse world-space cell of ``cell_size`` units, so each group still
+    culls as a unit. Only groups whose members changed are rebuilt. A
+    static entity that moves, or whose mesh or material changes, has to be
+    toggled off and on again to be re-baked.
+    """
+
+    def __init__(self, cell_size: float = 64.0):
+        self.CellSize = float(cell_size)
+        self.Enabled = True
+        self._scene = None
+        self._chunks = {}
+        self._entity_chunks = {}
+        self._pending = {}
+        self._dirty = {}
+        self._next_id = 0
+
+    @property
+    def BatchCount(self) -> int:
+        return len(self._chunks)
+
+    @property
+    def BatchedEntities(self) -> int:
+        return len(self._entity_chunks)
+
+    def Attach(self, scene):
+        if scene is self._scene:
+            return
+
+        if self._scene is not None:
+            self._scene._RemoveListener(self)
+        self.cleanup()
+
+        self._scene = scene
+        if scene is not None:
+            scene._AddListener(self)
+            for entity in scene.Query(MeshRenderer):
+                if entity.IsStatic:
+                    self.Add(entity)
+
+    def Add(self, entity):
+        renderer = entity.GetComponent(MeshRenderer)
+        if renderer is None or entity in self._entity_chunks:
+            return
+        mesh = renderer._mesh
+        if mesh is None or mesh.vertices is None:
+            return
+        self._pending[entity] = renderer
+        renderer._static_batched = True
+        MeshRenderer._StateVersion += 1
+
+    def Remove(self, entity):
+        renderer = self._pending.pop(entity, None)
+        chunk = self._entity_chunks.pop(entity, None)
+        if chunk is not None:
+            renderer = chunk.members.pop(entity)
+            self._dirty[chunk] = None
+        if renderer is not None:
+            renderer._static_batched = False
+            MeshRenderer._StateVersion += 1
+
+    def Update(self):
+        """Places newly static entities and rebuilds the chunks that changed."""
+        if self._pending:
+            for entity, renderer in self._pending.items():
+                chunk = self._chunk_for(entity, renderer)
+                chunk.members[entity] = renderer
+                self._entity_chunks[entity] = chunk
+                self._dirty[chunk] = None
+            self._pending.clear()
+
+        if self._dirty:
+            for chunk in self._dirty:
+                self._rebuild(chunk)
+            self._dirty.clear()
+
+    def Submit(self, queue: RenderQueue):
+        if not self.Enabled:
+            return
+        self.Update()
+        if not self._chunks:
+            return
+
+        chunks = [c for c in self._chunks.values() if c.mesh is not None]
+        if not chunks:
+            return
+        if queue.Frustum is not None:
+            centers = np.array([c.mesh.bounds_center for c in chunks], np.float32)
+            radii = np.array([c.mesh.bounds_radius for c in chunks], np.float32)
+            visible = queue.Frustum.TestSpheres(centers, radii).tolist()
+        else:
+            visible = (True,) * len(chunks)
+
+        for chunk, seen in zip(chunks, visible):
+            if seen:
+                queue.Submit(chunk.material, chunk.mesh, _IDENTITY_MODELS)
+                queue.ObjectsDrawn += len(chunk.members)
+            else:
+                queue.ObjectsCulled += len(chunk.members)
+
+    def cleanup(self):
+        for entity in list(self._pending) + list(self._entity_chunks):
+            self.Remove(entity)
+        for chunk in self._chunks.values():
+            MeshManager.unload(chunk.name)
+        self._chunks.clear()
+        self._dirty.clear()
+
+    def _chunk_for(self, entity, renderer):
+        world = entity.Transform.GetWorldMatrixArray().reshape(4, 4)
+        cell = tuple(math.floor(v / self.CellSize) for v in world[3, :3].tolist())
+        key = (renderer._material, renderer._mesh.layout, cell)
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            name = f"SnakeEngine/StaticBatch/{self._next_id}"
+            self._next_id += 1
+            chunk = self._chunks[key] = _StaticChunk(key, name, renderer._material)
+        return chunk
+
+    def _rebuild(self, chunk: _StaticChunk):
+        if not chunk.members:
+            MeshManager.unload(chunk.name)
+            self._chunks.pop(chunk.key, None)
+            return
+
+        by_mesh = {}
+        for entity, renderer in chunk.members.items():
+            by_mesh.setdefault(renderer._mesh, []).append(entity)
+
+        vertex_parts = []
+        index_parts = []
+        base = 0
+        for mesh, entities in by_mesh.items():
+            models = np.stack(
+                [entity.Transform.GetWorldMatrixArray() for entity in entities]
+            ).reshape(-1, 4, 4)
+            vertices, indices = bake_vertices(mesh, models)
+            vertex_parts.append(vertices)
+            index_parts.append(indices + base)
+            base += mesh.vertex_count * len(entities)
+
+        chunk.mesh = MeshManager.load_vertices(
+            chunk.name,
+            np.concatenate(vertex_parts),
+            chunk.key[1],
+            np.concatenate(index_parts),
+            force_reload=True,
+        )
+        Logger.debug(
+            f"Static batch '{chunk.name}' rebuilt from {len(chunk.members)} entities."
+        )
+
+    def _OnComponentActivated(self, entity, component):
+        if isinstance(component, MeshRenderer) and entity.IsStatic:
+            self.Add(entity)
+
+    def _OnComponentDeactivated(self, entity, component):
+        if isinstance(component, MeshRenderer):
+            self.Remove(entity)
+
+    def _OnStaticChanged(self, entity):
+        if entity.IsStatic:
+            self.Add(entity)
+        else:
+            self.Remove(entity)
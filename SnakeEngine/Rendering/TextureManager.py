@@ -0,0 +1,410 @@
+import ctypes
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from OpenGL.GL import *
+from PIL import Image
+
+from ..Core.FileSystem import FileSystem
+from ..Core.Logger import Logger
+from .GraphicsContext import GraphicsContext
+
+_CUBEMAP_FACES = (
+    GL_TEXTURE_CUBE_MAP_POSITIVE_X,
+    GL_TEXTURE_CUBE_MAP_NEGATIVE_X,
+    GL_TEXTURE_CUBE_MAP_POSITIVE_Y,
+    GL_TEXTURE_CUBE_MAP_NEGATIVE_Y,
+    GL_TEXTURE_CUBE_MAP_POSITIVE_Z,
+    GL_TEXTURE_CUBE_MAP_NEGATIVE_Z,
+)
+
+_DEFAULT_BUDGET = 256 * 1024 * 1024
+_DEFAULT_UPLOAD_BUDGET = 8 * 1024 * 1024
+
+_PLACEHOLDER_PIXEL = bytes((128, 128, 128, 255))
+_MIPMAP_FILTERS = (
+    GL_NEAREST_MIPMAP_NEAREST,
+    GL_LINEAR_MIPMAP_NEAREST,
+    GL_NEAREST_MIPMAP_LINEAR,
+    GL_LINEAR_MIPMAP_LINEAR,
+)
+
+
+@dataclass(frozen=True)
+class TextureSettings:
+    """Import settings; part of the cache key, so keep instances hashable."""
+
+    wrap: int = GL_REPEAT
+    min_filter: int = GL_LINEAR
+    mag_filter: int = GL_LINEAR
+    mipmaps: bool = False
+    flip: bool = True
+
+
+UI_TEXTURE = TextureSettings(wrap=GL_CLAMP_TO_EDGE)
+CUBEMAP_TEXTURE = TextureSettings(wrap=GL_CLAMP_TO_EDGE, flip=False)
+
+
+@dataclass(eq=False)
+class Texture:
+    key: tuple
+    gl_id: int = 0
+    target: int = GL_TEXTURE_2D
+    width: int = 0
+    height: int = 0
+    size_bytes: int = 0
+    ref_count: int = 0
+    loaded: bool = False
+    failed: bool = False
+
+
+def _read_image_bytes(path: str) -> Optional[bytes]:
+    if FileSystem.asset_exists(path):
+        return FileSystem.read_asset_bytes(path)
+    if FileSystem.exists(path):
+        return FileSystem.read_bytes(path)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+    return None
+
+
+def decode_image(path: str, flip: bool = True) -> Optional[tuple[int, int, bytes]]:
+    img_bytes = _read_image_bytes(path)
+    if not img_bytes:
+        Logger.error(f"Texture source file not found: '{path}'")
+        return None
+
+    try:
+        img = Image.open(io.BytesIO(img_bytes))
+        if flip:
+            img = img.transpose(Image.FLIP_TOP_BOTTOM)
+        if img.mode != "RGBA":
+            img = img.convert("RGBA")
+        return img.width, img.height, img.tobytes("raw", "RGBA")
+    except Exception as e:
+        Logger.error(f"Failed to decode image '{path}': {e}", exc_info=True)
+        return None
+
+
+class _TextureManagerSingleton:
+    def __init__(self):
+        # Ordered least recently used first; referenced textures are never
+        # evicted, so the order only matters among unreferenced ones.
+        self._textures: "OrderedDict[tuple, Texture]" = OrderedDict()
+        # Texture -> (decode futures, settings), in submission order.
+        self._pending: dict = {}
+        # Failed textures still held by someone; deleted once released.
+        self._orphans: list[Texture] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pbo = 0
+        self.budget_bytes = _DEFAULT_BUDGET
+        self.upload_budget_bytes = _DEFAULT_UPLOAD_BUDGET
+        self.use_pixel_buffers = True
+        self.resident_bytes = 0
+
+    def acquire(
+        self, path: str, settings: TextureSettings = TextureSettings()
+    ) -> Optional[Texture]:
+        """Loads ``path`` and returns it fully uploaded."""
+        return self._acquire((path, settings), GL_TEXTURE_2D, (path,), settings, True)
+
+    def acquire_async(
+        self, path: str, settings: TextureSettings = TextureSettings()
+    ) -> Optional[Texture]:
+        """Returns at once; the texture shows a placeholder until update()
+        uploads the decoded image. gl_id does not change when it does."""
+        return self._acquire((path, settings), GL_TEXTURE_2D, (path,), settings, False)
+
+    def acquire_cubemap(
+        self, paths, settings: TextureSettings = CUBEMAP_TEXTURE
+    ) -> Optional[Texture]:
+        return self._acquire_cubemap(paths, settings, True)
+
+    def acquire_cubemap_async(
+        self, paths, settings: TextureSettings = CUBEMAP_TEXTURE
+    ) -> Optional[Texture]:
+        return self._acquire_cubemap(paths, settings, False)
+
+    def release(self, texture: Optional[Texture]):
+        # No GL calls here: this runs from __del__ methods. Unreferenced
+        # textures stay cached until the budget needs their memory.
+        if texture is None or texture.ref_count <= 0:
+            return
+        texture.ref_count -= 1
+        if texture.ref_count:
+            return
+        if self._textures.get(texture.key) is texture:
+            self._textures.move_to_end(texture.key)
+        else:
+            self._orphans.append(texture)
+
+    def retain(self, texture: Texture) -> Texture:
+        texture.ref_count += 1
+        if self._textures.get(texture.key) is texture:
+            self._textures.move_to_end(texture.key)
+        return texture
+
+    def update(self):
+        """Uploads finished decodes; call once per frame on the GL thread."""
+        for texture in self._orphans:
+            if texture.ref_count == 0:
+                self._delete_gl(texture)
+        self._orphans = [t for t in self._orphans if t.ref_count]
+
+        uploaded = 0
+        for texture in list(self._pending):
+            # At least one upload per frame, so a texture larger than the
+            # budget still gets through.
+            if uploaded >= self.upload_budget_bytes:
+                break
+            futures, _ = self._pending[texture]
+            if all(future.done() for future in futures):
+                self._finish(texture)
+                uploaded += texture.size_bytes
+
+    def set_budget(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        self._evict()
+
+    def get_stats(self) -> dict:
+        unreferenced = [t for t in self._textures.values() if t.ref_count == 0]
+        return {
+            "textures": len(self._textures),
+            "resident_bytes": self.resident_bytes,
+            "unreferenced": len(unreferenced),
+            "unreferenced_bytes": sum(t.size_bytes for t in unreferenced),
+            "pending": len(self._pending),
+            "budget_bytes": self.budget_bytes,
+        }
+
+    def list_textures(self) -> list[tuple]:
+        return list(self._textures.keys())
+
+    def cleanup(self):
+        Logger.info("Cleaning up cached textures...")
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._pending.clear()
+        for texture in list(self._textures.values()) + self._orphans:
+            self._delete_gl(texture)
+        self._textures.clear()
+        self._orphans.clear()
+        self.resident_bytes = 0
+        if self._pbo:
+            glDeleteBuffers(1, [self._pbo])
+            GraphicsContext.State.Forget(self._pbo)
+            self._pbo = 0
+
+    def _acquire_cubemap(self, paths, settings: TextureSettings, wait: bool):
+        paths = tuple(paths)
+        if len(paths) != len(_CUBEMAP_FACES):
+            Logger.error(f"A cubemap needs 6 faces, got {len(paths)}.")
+            return None
+        return self._acquire(
+            (paths, settings), GL_TEXTURE_CUBE_MAP, paths, settings, wait
+        )
+
+    def _acquire(
+        self,
+        key: tuple,
+        target: int,
+        paths: tuple,
+        settings: TextureSettings,
+        wait: bool,
+    ) -> Optional[Texture]:
+        texture = self._textures.get(key)
+        if texture is None:
+            texture = Texture(key=key, target=target)
+            if not self._allocate(texture, settings):
+                return None
+            # Cubemap faces decode in parallel, one job each.
+            pool = self._get_executor()
+            futures = [pool.submit(decode_image, path, settings.flip) for path in paths]
+            self._pending[texture] = (futures, settings)
+            self._textures[key] = texture
+
+        if wait and texture in self._pending:
+            self._finish(texture)
+            if texture.failed:
+                return None
+        return self.retain(texture)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=min(4, os.cpu_count() or 1),
+                thread_name_prefix="SnakeTextureDecode",
+            )
+        return self._executor
+
+    def _finish(self, texture: Texture):
+        futures, settings = self._pending.pop(texture)
+        images = [future.result() for future in futures]
+        if any(image is None for image in images) or not self._upload(
+            texture, images, settings
+        ):
+            self._fail(texture)
+            return
+
+        texture.loaded = True
+        if self._textures.get(texture.key) is texture:
+            self.resident_bytes += texture.size_bytes
+            self._evict()
+        Logger.info(
+            f"Texture {texture.key[0]!r} uploaded (ID: {texture.gl_id}, "
+            f"{texture.width}x{texture.height})."
+        )
+
+    def _fail(self, texture: Texture):
+        # Holders keep the placeholder; a later acquire() retries the load.
+        texture.failed = True
+        if self._textures.get(texture.key) is texture:
+            del self._textures[texture.key]
+        if texture.ref_count == 0:
+            self._delete_gl(texture)
+        else:
+            self._orphans.append(texture)
+
+    def _evict(self):
+        if self.resident_bytes <= self.budget_bytes:
+            return
+        for texture in list(self._textures.values()):
+            if self.resident_bytes <= self.budget_bytes:
+                break
+            if texture.ref_count == 0 and texture not in self._pending:
+                Logger.debug(f"Evicting texture {texture.key[0]!r} from VRAM.")
+                del self._textures[texture.key]
+                self.resident_bytes -= texture.size_bytes
+                self._delete_gl(texture)
+
+    @staticmethod
+    def _delete_gl(texture: Texture):
+        if texture.gl_id:
+            try:
+                glDeleteTextures(1, [texture.gl_id])
+                GraphicsContext.State.Forget(texture.gl_id)
+            except Exception as e:
+                Logger.error(
+                    f"Failed to delete texture ID {texture.gl_id}: {e}", exc_info=True
+                )
+        texture.gl_id = 0
+
+    @staticmethod
+    def _allocate(texture: Texture, settings: TextureSettings) -> bool:
+        target = texture.target
+        faces = _CUBEMAP_FACES if target == GL_TEXTURE_CUBE_MAP else (target,)
+        try:
+            texture.gl_id = glGenTextures(1)
+            GraphicsContext.State.BindTexture(target, texture.gl_id)
+            for face in faces:
+                glTexImage2D(
+                    face,
+                    0,
+                    GL_RGBA,
+                    1,
+                    1,
+                    0,
+                    GL_RGBA,
+                    GL_UNSIGNED_BYTE,
+                    _PLACEHOLDER_PIXEL,
+                )
+            # Mipmapped filtering waits for the real image, the 1x1
+            # placeholder has no mip chain.
+            min_filter = settings.min_filter
+            if min_filter in _MIPMAP_FILTERS:
+                min_filter = GL_LINEAR
+            glTexParameteri(target, GL_TEXTURE_MIN_FILTER, min_filter)
+            glTexParameteri(target, GL_TEXTURE_MAG_FILTER, settings.mag_filter)
+            glTexParameteri(target, GL_TEXTURE_WRAP_S, settings.wrap)
+            glTexParameteri(target, GL_TEXTURE_WRAP_T, settings.wrap)
+            if target == GL_TEXTURE_CUBE_MAP:
+                glTexParameteri(target, GL_TEXTURE_WRAP_R, settings.wrap)
+        except Exception as e:
+            Logger.error(f"Failed to create OpenGL texture: {e}", exc_info=True)
+            _TextureManagerSingleton._delete_gl(texture)
+            return False
+        texture.width = texture.height = 1
+        return True
+
+    def _upload(self, texture: Texture, images: list, settings: TextureSettings):
+        target = texture.target
+        faces = _CUBEMAP_FACES if target == GL_TEXTURE_CUBE_MAP else (target,)
+        try:
+            GraphicsContext.State.BindTexture(target, texture.gl_id)
+            for face, (width, height, pixels) in zip(faces, images):
+                self._tex_image(face, width, height, pixels)
+
+            if settings.mipmaps:
+                glGenerateMipmap(target)
+                min_filter = settings.min_filter
+                if min_filter == GL_LINEAR:
+                    min_filter = GL_LINEAR_MIPMAP_LINEAR
+                glTexParameteri(target, GL_TEXTURE_MIN_FILTER, min_filter)
+        except Exception as e:
+            Logger.error(f"Failed to upload texture to OpenGL: {e}", exc_info=True)
+            return False
+
+        size = sum(w * h * 4 for w, h, _ in images)
+        if settings.mipmaps:
+            size = size * 4 // 3
+        texture.width, texture.height = images[0][0], images[0][1]
+        texture.size_bytes = size
+        return True
+
+    def _tex_image(self, face: int, width: int, height: int, pixels: bytes):
+        if self.use_pixel_buffers and self._ensure_pbo():
+            # Staging through a pixel buffer lets the driver copy to VRAM
+            # asynchronously instead of blocking on client memory.
+            state = GraphicsContext.State
+            try:
+                state.BindBuffer(GL_PIXEL_UNPACK_BUFFER, self._pbo)
+                glBufferData(GL_PIXEL_UNPACK_BUFFER, len(pixels), None, GL_STREAM_DRAW)
+                ptr = glMapBufferRange(
+                    GL_PIXEL_UNPACK_BUFFER,
+                    0,
+                    len(pixels),
+                    GL_MAP_WRITE_BIT | GL_MAP_INVALIDATE_BUFFER_BIT,
+                )
+                if ptr:
+                    ctypes.memmove(ptr, pixels, len(pixels))
+                    glUnmapBuffer(GL_PIXEL_UNPACK_BUFFER)
+                else:
+                    glBufferSubData(GL_PIXEL_UNPACK_BUFFER, 0, len(pixels), pixels)
+                glTexImage2D(
+                    face,
+                    0,
+                    GL_RGBA,
+                    width,
+                    height,
+                    0,
+                    GL_RGBA,
+                    GL_UNSIGNED_BYTE,
+                    ctypes.c_void_p(0),
+                )
+                return
+            except Exception as e:
+                Logger.warning(f"Pixel buffer upload failed, using direct uploads: {e}")
+                self.use_pixel_buffers = False
+            finally:
+                state.BindBuffer(GL_PIXEL_UNPACK_BUFFER, 0)
+
+        glTexImage2D(
+            face, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, pixels
+        )
+
+    def _ensure_pbo(self) -> bool:
+        if not self._pbo:
+            if not bool(glMapBufferRange):
+                self.use_pixel_buffers = False
+                return False
+            self._pbo = glGenBuffers(1)
+        return True
+
+
+TextureManager = _TextureManagerSingleton()
@@ -4,19 +4,23 @@ import json
 import ctypes
 from OpenGL.GL import *
 import numpy as np
-from PIL import Image
 
 from .Button import UIButton
 from .Frame import UIFrame
 from .Image import UIImage
-from .Label import UILabel
 from .Slider import UISlider
 from .Text import UIText
 
 from ..Assets.DefaultAssets import DefaultAssets
+from ..Rendering.GraphicsContext import GraphicsContext
+from ..Rendering.Material import Material
 from ..Rendering.ShaderManager import ShaderManager
+from ..Rendering.TextureManager import TextureManager, TextureSettings
 
 _SHADER_NAME = "SnakeEngine/UI"
+_FONT_ATLAS_TEXTURE = TextureSettings(
+    wrap=GL_CLAMP_TO_EDGE, min_filter=GL_NEAREST, mag_filter=GL_NEAREST, flip=False
+)
 
 
 def _ensure_ui_shader():
@@ -28,6 +32,14 @@ def _ensure_ui_shader():
         )
 
 
+def _components(scene, component_class):
+    # Render used to take a list of entities; keep accepting one.
+    if hasattr(scene, "QueryComponents"):
+        return scene.QueryComponents(component_class)
+    found = (entity.GetComponent(component_class) for entity in scene)
+    return [component for component in found if component is not None]
+
+
 class UICanvas:
     def __init__(self):
         self.Vao = glGenVertexArrays(1)
@@ -43,6 +55,10 @@ class UICanvas:
         self.ShaderProgram = ShaderManager.get(_SHADER_NAME)
 
         self.SetupFontAtlas()
+        self._SetupVertexLayout()
+        self._TextMaterial = Material(_SHADER_NAME, {"isImage": 0})
+        self._TextMaterial.SetTexture("fontTexture", self.TextureID)
+        self._ImageMaterial = Material(_SHADER_NAME, {"isImage": 1, "fontTexture": 0})
 
     def SetupFontAtlas(self):
         png_path = DefaultAssets.FONT_ATLAS_PNG
@@ -62,28 +78,24 @@ class UICanvas:
         self.FontBaseHeight = meta["char_height"]
         self.FontCharacters = meta["characters"]
 
-        img = Image.open(png_path)
-        self.TextureSize = img.width
-        img_data = img.convert("RGBA").tobytes()
-
-        self.TextureID = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, self.TextureID)
-        glTexImage2D(
-            GL_TEXTURE_2D,
-            0,
-            GL_RGBA,
-            self.TextureSize,
-            self.TextureSize,
-            0,
-            GL_RGBA,
-            GL_UNSIGNED_BYTE,
-            img_data,
-        )
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
-        glBindTexture(GL_TEXTURE_2D, 0)
+        self._FontTexture = TextureManager.acquire(png_path, _FONT_ATLAS_TEXTURE)
+        if self._FontTexture is None:
+            sys.exit(1)
+        self.TextureSize = self._FontTexture.width
+        self.TextureID = self._FontTexture.gl_id
+
+    def _SetupVertexLayout(self):
+        # Attribute pointers are VAO state, so they only need setting once.
+        state = GraphicsContext.State
+        state.BindVertexArray(self.Vao)
+        state.BindBuffer(GL_ARRAY_BUFFER, self.Vbo)
+        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 32, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(1, 2, GL_FLOAT, GL_FALSE, 32, ctypes.c_void_p(8))
+        glEnableVertexAttribArray(1)
+        glVertexAttribPointer(2, 4, GL_FLOAT, GL_FALSE, 32, ctypes.c_void_p(16))
+        glEnableVertexAttribArray(2)
+        state.BindVertexArray(0)
 
     def PushQuad(self, x, y, w, h, color, u1=0.0, v1=0.0, u2=0.0, v2=0.0):
         r, g, b, a = color
@@ -168,167 +180,129 @@ class UICanvas:
             return
 
         data = np.array(self.Vertices, dtype=np.float32)
-        glBindBuffer(GL_ARRAY_BUFFER, self.Vbo)
+        GraphicsContext.State.BindBuffer(GL_ARRAY_BUFFER, self.Vbo)
         glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_DYNAMIC_DRAW)
 
         glDrawArrays(GL_TRIANGLES, 0, len(self.Vertices) // 8)
         self.Vertices.clear()
 
-    def Render(self, entities, screen_width, screen_height):
+    def Render(self, scene, screen_width, screen_height):
         self.Vertices.clear()
 
-        glDisable(GL_DEPTH_TEST)
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-
-        glUseProgram(self.ShaderProgram)
-        glUniform2f(
-            glGetUniformLocation(self.ShaderProgram, "screenSize"),
-            float(screen_width),
-            float(screen_height),
-        )
+        state = GraphicsContext.State
+        state.Disable(GL_DEPTH_TEST)
+        state.Enable(GL_BLEND)
+        state.BlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+        screen_size = (float(screen_width), float(screen_height))
+        self._TextMaterial.Set("screenSize", screen_size)
+        self._ImageMaterial.Set("screenSize", screen_size)
+        self._TextMaterial.Bind()
+
+        state.BindVertexArray(self.Vao)
+
+        for frame in _components(scene, UIFrame):
+            self.PushQuad(
+                frame.Bounds.Position.X,
+                frame.Bounds.Position.Y,
+                frame.Bounds.Width,
+                frame.Bounds.Height,
+                frame.Color,
+            )
+        self._FlushBatch()
 
-        glBindVertexArray(self.Vao)
+        for img in _components(scene, UIImage):
+            if img.has_texture:
+                self._FlushBatch()
 
-        glActiveTexture(GL_TEXTURE0)
-        glBindTexture(GL_TEXTURE_2D, self.TextureID)
+                self._ImageMaterial.Bind()
+                state.BindTexture(GL_TEXTURE_2D, img.texture_id, 0)
 
-        glBindBuffer(GL_ARRAY_BUFFER, self.Vbo)
-        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 32, ctypes.c_void_p(0))
-        glEnableVertexAttribArray(0)
-        glVertexAttribPointer(1, 2, GL_FLOAT, GL_FALSE, 32, ctypes.c_void_p(8))
-        glEnableVertexAttribArray(1)
-        glVertexAttribPointer(2, 4, GL_FLOAT, GL_FALSE, 32, ctypes.c_void_p(16))
-        glEnableVertexAttribArray(2)
-
-        for entity in entities:
-            frame = entity.GetComponent(UIFrame)
-            if frame:
                 self.PushQuad(
-                    frame.Bounds.Position.X,
-                    frame.Bounds.Position.Y,
-                    frame.Bounds.Width,
-                    frame.Bounds.Height,
-                    frame.Color,
+                    img.Bounds.Position.X,
+                    img.Bounds.Position.Y,
+                    img.Bounds.Width,
+                    img.Bounds.Height,
+                    img.Color,
+                    0.0,
+                    1.0,
+                    1.0,
+                    0.0,
                 )
-        self._FlushBatch()
 
-        for entity in entities:
-            img = entity.GetComponent(UIImage)
-            if img:
-                if img.has_texture:
-                    self._FlushBatch()
-
-                    glBindTexture(GL_TEXTURE_2D, img.texture_id)
-
-                    glUniform1i(glGetUniformLocation(self.ShaderProgram, "isImage"), 1)
-
-                    self.PushQuad(
-                        img.Bounds.Position.X,
-                        img.Bounds.Position.Y,
-                        img.Bounds.Width,
-                        img.Bounds.Height,
-                        img.Color,
-                        0.0,
-                        1.0,
-                        1.0,
-                        0.0,
-                    )
-
-                    self._FlushBatch()
-
-                    glUniform1i(glGetUniformLocation(self.ShaderProgram, "isImage"), 0)
-
-                    glBindTexture(GL_TEXTURE_2D, self.TextureID)
-                else:
-                    self.PushQuad(
-                        img.Bounds.Position.X,
-                        img.Bounds.Position.Y,
-                        img.Bounds.Width,
-                        img.Bounds.Height,
-                        img.Color,
-                    )
-
-        for entity in entities:
-            slider = entity.GetComponent(UISlider)
-            if slider:
-                self.PushQuad(
-                    slider.Bounds.Position.X,
-                    slider.Bounds.Position.Y,
-                    slider.Bounds.Width,
-                    slider.Bounds.Height,
-                    slider.BackgroundColor,
-                )
-                fill_w = slider.Bounds.Width * slider.Value
+                self._FlushBatch()
+
+                self._TextMaterial.Bind()
+            else:
                 self.PushQuad(
-                    slider.Bounds.Position.X,
-                    slider.Bounds.Position.Y,
-                    fill_w,
-                    slider.Bounds.Height,
-                    slider.FillColor,
+                    img.Bounds.Position.X,
+                    img.Bounds.Position.Y,
+                    img.Bounds.Width,
+                    img.Bounds.Height,
+                    img.Color,
                 )
+
+        for slider in _components(scene, UISlider):
+            self.PushQuad(
+                slider.Bounds.Position.X,
+                slider.Bounds.Position.Y,
+                slider.Bounds.Width,
+                slider.Bounds.Height,
+                slider.BackgroundColor,
+            )
+            fill_w = slider.Bounds.Width * slider.Value
+            self.PushQuad(
+                slider.Bounds.Position.X,
+                slider.Bounds.Position.Y,
+                fill_w,
+                slider.Bounds.Height,
+                slider.FillColor,
+            )
         self._FlushBatch()
 
-        for entity in entities:
-            btn = entity.GetComponent(UIButton)
-            if btn:
-                render_color = (
-                    (
-                        btn.BackgroundColor[0] * 0.5,
-                        btn.BackgroundColor[1] * 0.5,
-                        btn.BackgroundColor[2] * 0.5,
-                        btn.BackgroundColor[3],
-                    )
-                    if btn.IsHovered
-                    else btn.BackgroundColor
-                )
-
-                self.PushQuad(
-                    btn.Bounds.Position.X,
-                    btn.Bounds.Position.Y,
-                    btn.Bounds.Width,
-                    btn.Bounds.Height,
-                    render_color,
+        for btn in _components(scene, UIButton):
+            render_color = (
+                (
+                    btn.BackgroundColor[0] * 0.5,
+                    btn.BackgroundColor[1] * 0.5,
+                    btn.BackgroundColor[2] * 0.5,
+                    btn.BackgroundColor[3],
                 )
+                if btn.IsHovered
+                else btn.BackgroundColor
+            )
 
-                text_scale = 0.5
-                total_text_w = (
-                    sum(
-                        [
-                            self.FontCharacters.get(c, self.FontCharacters[" "])[
-                                "advance"
-                            ]
-                            for c in btn.Text
-                        ]
-                    )
-                    * text_scale
-                )
-                text_x = btn.Bounds.Position.X + (btn.Bounds.Width - total_text_w) / 2
-                text_y = (
-                    btn.Bounds.Position.Y
-                    + (btn.Bounds.Height - (self.FontBaseHeight * text_scale)) / 2
-                )
-                self.PushString(btn.Text, text_x, text_y, text_scale, btn.TextColor)
+            self.PushQuad(
+                btn.Bounds.Position.X,
+                btn.Bounds.Position.Y,
+                btn.Bounds.Width,
+                btn.Bounds.Height,
+                render_color,
+            )
 
-        for entity in entities:
-            txt = entity.GetComponent(UIText)
-            if txt:
-                self.PushString(
-                    txt.Text, txt.Position.X, txt.Position.Y, txt.Scale, txt.Color
+            text_scale = 0.5
+            total_text_w = (
+                sum(
+                    [
+                        self.FontCharacters.get(c, self.FontCharacters[" "])["advance"]
+                        for c in btn.Text
+                    ]
                 )
+                * text_scale
+            )
+            text_x = btn.Bounds.Position.X + (btn.Bounds.Width - total_text_w) / 2
+            text_y = (
+                btn.Bounds.Position.Y
+                + (btn.Bounds.Height - (self.FontBaseHeight * text_scale)) / 2
+            )
+            self.PushString(btn.Text, text_x, text_y, text_scale, btn.TextColor)
 
-            label = entity.GetComponent(UILabel)
-            if label:
-                self.PushString(
-                    label.Text,
-                    label.Position.X,
-                    label.Position.Y,
-                    label.Scale,
-                    label.Color,
-                )
+        for txt in _components(scene, UIText):
+            self.PushString(
+                txt.Text, txt.Position.X, txt.Position.Y, txt.Scale, txt.Color
+            )
 
         self._FlushBatch()
 
-        glBindVertexArray(0)
-        glDisable(GL_BLEND)
-        glEnable(GL_DEPTH_TEST)
+        state.Disable(GL_BLEND)
+        state.Enable(GL_DEPTH_TEST)
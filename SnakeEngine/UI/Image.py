@@ -1,11 +1,7 @@
 from typing import Optional, Tuple
-from OpenGL.GL import *
-from PIL import Image
-import io
 
 from .Extent import UIExtent
-from ..Core.FileSystem import FileSystem
-from ..Core.Logger import Logger
+from ..Rendering.TextureManager import TextureManager, Texture, UI_TEXTURE
 
 
 class UIImage:
@@ -21,7 +17,7 @@ class UIImage:
         self.Bounds = UIExtent(x, y, width, height)
         self.Color = color
         self._path: Optional[str] = None
-        self._texture_id: int = 0
+        self._texture: Optional[Texture] = None
 
         if path:
             self.path = path
@@ -40,11 +36,11 @@ class UIImage:
 
     @property
     def texture_id(self) -> int:
-        return self._texture_id
+        return self._texture.gl_id if self._texture else 0
 
     @property
     def has_texture(self) -> bool:
-        return self._texture_id > 0
+        return self.texture_id > 0
 
     def _load_texture(self):
         self._cleanup_texture()
@@ -52,81 +48,20 @@ class UIImage:
         if not self._path:
             return
 
-        Logger.info(f"Loading UI image texture: '{self._path}'")
-
-        img_bytes = None
-        if FileSystem.asset_exists(self._path):
-            img_bytes = FileSystem.read_asset_bytes(self._path)
-        elif FileSystem.exists(self._path):
-            img_bytes = FileSystem.read_bytes(self._path)
-
-        if not img_bytes:
-            Logger.error(f"UI Image source file not found: '{self._path}'")
-            return
-
-        try:
-            img = Image.open(io.BytesIO(img_bytes))
-            img = img.transpose(Image.FLIP_TOP_BOTTOM)
-
-            if img.mode != "RGBA":
-                img = img.convert("RGBA")
-
-            img_data = img.tobytes("raw", "RGBA")
-            width, height = img.size
-        except Exception as e:
-            Logger.error(
-                f"Failed to parse image file '{self._path}' via Pillow: {e}",
-                exc_info=True,
-            )
-            return
-
-        try:
-            self._texture_id = glGenTextures(1)
-            glBindTexture(GL_TEXTURE_2D, self._texture_id)
-
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
-
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-
-            glTexImage2D(
-                GL_TEXTURE_2D,
-                0,
-                GL_RGBA,
-                width,
-                height,
-                0,
-                GL_RGBA,
-                GL_UNSIGNED_BYTE,
-                img_data,
-            )
-
-            glBindTexture(GL_TEXTURE_2D, 0)
-            Logger.info(
-                f"Successfully uploaded UI texture '{self._path}' to GPU (ID: {self._texture_id}, Resolution: {width}x{height})"
-            )
-        except Exception as e:
-            Logger.error(
-                f"Failed to upload UI texture '{self._path}' to OpenGL: {e}",
-                exc_info=True,
-            )
-            self._cleanup_texture()
+        # Widgets showing the same file share one GL texture. It shows a
+        # placeholder until the decoded image is uploaded.
+        self._texture = TextureManager.acquire_async(self._path, UI_TEXTURE)
 
     def _cleanup_texture(self):
-        if self._texture_id > 0:
-            try:
-                from OpenGL.GL import glDeleteTextures
-                import sys
-
-                if sys and sys.meta_path is not None:
-                    glDeleteTextures(int(self._texture_id))
-            except Exception as e:
-                pass
-            self._texture_id = 0
+        if self._texture is not None:
+            TextureManager.release(self._texture)
+            self._texture = None
 
     def cleanup(self):
         self._cleanup_texture()
 
     def __del__(self):
-        pass
+        try:
+            self._cleanup_texture()
+        except Exception:
+            pass
@@ -12,7 +12,9 @@ from .Assets.DefaultAssets import DefaultAssets
 
 from .Core.Mathematics.Vector2 import Vector2
 from .Core.Mathematics.Vector3 import Vector3
+from .Core.Mathematics.Vector3Array import Vector3Array
 from .Core.Mathematics.Transform import Transform
+from .Core.Mathematics.TransformStorage import TransformStorage
 from .Core.Mathematics.Matrix4 import Matrix4
 
 from .Rendering.Camera import Camera
@@ -51,7 +53,9 @@ __all__ = [
     "Logger",
     "Vector2",
     "Vector3",
+    "Vector3Array",
     "Transform",
+    "TransformStorage",
     "Matrix4",
     "Camera",
     "MeshRenderer",
@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from SnakeEngine.Core.Scene import Scene
+from SnakeEngine.Core.GameEntity import GameEntity
+from SnakeEngine.UI.Text import UIText
+from SnakeEngine.UI.Label import UILabel
+from SnakeEngine.UI.Frame import UIFrame
+from SnakeEngine.UI.Button import UIButton
+from SnakeEngine.UI.Slider import UISlider
+from SnakeEngine.UI.Image import UIImage
+
+
+def uncached_get_component(entity, component_class):
+    if component_class in entity.Components:
+        return entity.Components[component_class]
+
+    for cls, instance in entity.Components.items():
+        if issubclass(cls, component_class):
+            return instance
+    return None
+
+
+def build_scene(entity_count):
+    scene = Scene()
+    for i in range(entity_count):
+        entity = scene.CreateEntity()
+        if i % 2:
+            entity.AddComponent(UILabel, "label", 0, 0)
+        else:
+            entity.AddComponent(UIFrame, 0, 0, 10, 10)
+    return scene
+
+
+def measure(entities, lookup, repeats):
+    requested = (UIButton, UISlider, UIFrame, UIImage, UIText)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for entity in entities:
+            for component_class in requested:
+                lookup(entity, component_class)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    entity_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    entities = build_scene(entity_count).Entities
+
+    uncached = measure(entities, uncached_get_component, repeats)
+    cached = measure(entities, GameEntity.GetComponent, repeats)
+
+    lookups = entity_count * 5 * repeats
+    print(f"Entities: {entity_count}, lookups: {lookups}")
+    print(
+        f"issubclass scan: {uncached * 1000:.1f} ms ({uncached / lookups * 1e9:.0f} ns/lookup)"
+    )
+    print(
+        f"cached lookup:   {cached * 1000:.1f} ms ({cached / lookups * 1e9:.0f} ns/lookup)"
+    )
+    print(f"Speedup: {uncached / cached:.2f}x")
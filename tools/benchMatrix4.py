@@ -0,0 +1,109 @@
+import os
+import sys
+import math
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from SnakeEngine.Core.Mathematics.Matrix4 import Matrix4
+from SnakeEngine.Core.Mathematics.Vector3 import Vector3
+
+
+class ListMatrix4:
+    """The previous list-backed Matrix4, kept here as the baseline."""
+
+    def __init__(self):
+        self.M = [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+        self.M += [0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+
+    @staticmethod
+    def Translate(v):
+        mat = ListMatrix4()
+        mat.M[12] = v.X
+        mat.M[13] = v.Y
+        mat.M[14] = v.Z
+        return mat
+
+    @staticmethod
+    def RotateY(angle_rad):
+        mat = ListMatrix4()
+        c = math.cos(angle_rad)
+        s = math.sin(angle_rad)
+        mat.M[0] = c
+        mat.M[2] = -s
+        mat.M[8] = s
+        mat.M[10] = c
+        return mat
+
+    @staticmethod
+    def RotateX(angle_rad):
+        mat = ListMatrix4()
+        c = math.cos(angle_rad)
+        s = math.sin(angle_rad)
+        mat.M[5] = c
+        mat.M[6] = s
+        mat.M[9] = -s
+        mat.M[10] = c
+        return mat
+
+    def Multiply(self, other):
+        res = ListMatrix4()
+        for r in range(4):
+            for c in range(4):
+                val = 0.0
+                for i in range(4):
+                    val += self.M[i * 4 + r] * other.M[c * 4 + i]
+                res.M[c * 4 + r] = val
+        return res
+
+    def ToArray(self):
+        return np.array(self.M, dtype=np.float32)
+
+
+def timed(label, iterations, fn):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed / iterations * 1e6:8.2f} us")
+    return elapsed
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    position = Vector3(1.0, 2.0, 3.0)
+    rotation = Vector3(0.3, 0.7, 0.0)
+    scale = Vector3(1.0, 1.0, 1.0)
+
+    list_a = ListMatrix4.RotateY(0.7)
+    list_b = ListMatrix4.RotateX(0.3)
+    np_a = Matrix4.RotateY(0.7)
+    np_b = Matrix4.RotateX(0.3)
+    np_out = Matrix4()
+
+    print(f"Iterations: {iterations}")
+    old = timed("list Multiply", iterations, lambda: list_a.Multiply(list_b))
+    new = timed("numpy Multiply", iterations, lambda: np_a.Multiply(np_b))
+    timed("numpy MultiplyInto", iterations, lambda: np_a.MultiplyInto(np_b, np_out))
+    print(f"Multiply speedup: {old / new:.1f}x\n")
+
+    old = timed("list ToArray", iterations, list_a.ToArray)
+    new = timed("numpy ToArray", iterations, np_a.ToArray)
+    print(f"ToArray speedup: {old / new:.1f}x\n")
+
+    old = timed(
+        "list T * Ry * Rx",
+        iterations,
+        lambda: ListMatrix4.Translate(position)
+        .Multiply(ListMatrix4.RotateY(rotation.Y))
+        .Multiply(ListMatrix4.RotateX(rotation.X)),
+    )
+    new = timed(
+        "numpy TRS into buffer",
+        iterations,
+        lambda: Matrix4.TRS(position, rotation, scale, out=np_out),
+    )
+    print(f"World matrix speedup: {old / new:.1f}x")
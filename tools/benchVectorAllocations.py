@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from SnakeEngine.Core.Scene import Scene
+from SnakeEngine.Core.GameScript import GameScript
+from SnakeEngine.Core.ScriptManager import ScriptManager
+from SnakeEngine.Core.Mathematics.Vector3 import Vector3
+
+
+class AllocatingMover(GameScript):
+    def __init__(self):
+        super().__init__()
+        self.Velocity = Vector3(1.0, 0.5, -0.25)
+        self.Target = Vector3(10.0, 0.0, 10.0)
+
+    def OnUpdate(self, delta_time):
+        transform = self.Entity.Transform
+        transform.Position = transform.Position + self.Velocity * delta_time
+        self.Velocity = self.Velocity + (self.Target - transform.Position) * 0.01
+        transform.Rotation.Y += 0.5 * delta_time
+
+
+class InPlaceMover(GameScript):
+    def __init__(self):
+        super().__init__()
+        self.Velocity = Vector3(1.0, 0.5, -0.25)
+        self.Target = Vector3(10.0, 0.0, 10.0)
+
+    def OnUpdate(self, delta_time):
+        position = self.Entity.Transform.Position
+        position.AddScaled(self.Velocity, delta_time)
+        velocity = self.Velocity
+        target = self.Target
+        velocity.Set(
+            velocity.X + (target.X - position.X) * 0.01,
+            velocity.Y + (target.Y - position.Y) * 0.01,
+            velocity.Z + (target.Z - position.Z) * 0.01,
+        )
+        self.Entity.Transform.Rotation.Y += 0.5 * delta_time
+
+
+def run(script_class, entity_count, frames):
+    scene = Scene()
+    for _ in range(entity_count):
+        scene.CreateEntity().AddComponent(script_class)
+
+    scripts = ScriptManager()
+    scripts.Attach(scene)
+    scripts.OnUpdate(1.0 / 60.0)
+
+    created = [0]
+    original_init = Vector3.__init__
+
+    def counting_init(self, x=0.0, y=0.0, z=0.0):
+        created[0] += 1
+        original_init(self, x, y, z)
+
+    Vector3.__init__ = counting_init
+    try:
+        start = time.perf_counter()
+        for _ in range(frames):
+            scripts.OnUpdate(1.0 / 60.0)
+        elapsed = time.perf_counter() - start
+    finally:
+        Vector3.__init__ = original_init
+
+    return created[0] / frames, elapsed / frames
+
+
+if __name__ == "__main__":
+    entity_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    print(f"Entities: {entity_count}, frames: {frames}")
+    print(f"Vector3 size: {sys.getsizeof(Vector3())} bytes, __slots__, no __dict__")
+    for label, script_class in (
+        ("operators", AllocatingMover),
+        ("in-place API", InPlaceMover),
+    ):
+        allocations, frame_time = run(script_class, entity_count, frames)
+        print(
+            f"{label:<14} {allocations:>9.0f} Vector3 allocations/frame,"
+            f" {frame_time * 1000:7.2f} ms/frame"
+        )
@@ -0,0 +1,35 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from SnakeEngine.Core.SpatialGrid import SpatialHashGrid
+
+
+def check_raycast_keeps_collected_items():
+    # A far-away item exhausts the traversal budget before the near one,
+    # which was already collected, gets tested.
+    grid = SpatialHashGrid()
+    grid.Insert("A", (0.0, 0.0, 0.0), 1.0)
+    grid.Insert("B", (1000.0, 0.0, 0.0), 1.0)
+
+    hit = grid.Raycast((-4.0, 0.0, 0.0), (1.0, 0.0, 0.0))
+    assert hit == (3.0, "A"), hit
+
+    hits = grid.RaycastAll((-4.0, 0.0, 0.0), (1.0, 0.0, 0.0))
+    assert [item for _, item in hits] == ["A", "B"], hits
+
+
+def check_raycast_short_ray():
+    grid = SpatialHashGrid()
+    grid.Insert("A", (0.0, 0.0, 0.0), 1.0)
+    grid.Insert("B", (100.0, 0.0, 0.0), 1.0)
+
+    hit = grid.Raycast((-4.0, 0.0, 0.0), (1.0, 0.0, 0.0))
+    assert hit == (3.0, "A"), hit
+
+
+if __name__ == "__main__":
+    check_raycast_keeps_collected_items()
+    check_raycast_short_ray()
+    print("SpatialHashGrid checks passed.")
@@ -0,0 +1,61 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from SnakeEngine.Core.Mathematics.Vector3 import Vector3
+from SnakeEngine.Core.Mathematics.Transform import Transform
+from SnakeEngine.Core.Mathematics.TransformStorage import TransformStorage
+from SnakeEngine.Core.Mathematics.Vector3Array import Vector3Array
+
+
+def _xyz(v):
+    return (v.X, v.Y, v.Z)
+
+
+def check_lerp_into_self():
+    points = Vector3Array(np.array([[0, 0, 0], [10, 10, 10]], dtype=np.float32))
+    points.LerpInto(points, Vector3(10, 0, 0), 0.5)
+    expected = [[5.0, 0.0, 0.0], [10.0, 5.0, 5.0]]
+    assert np.allclose(points.Data, expected), points.Data
+
+
+def check_lerp_into_per_row():
+    a = Vector3Array(np.zeros((2, 3), dtype=np.float32))
+    b = Vector3Array(np.ones((2, 3), dtype=np.float32))
+    out = Vector3Array.Zeros(2).LerpInto(a, b, np.array([0.25, 1.0]))
+    assert np.allclose(out.Data, [[0.25] * 3, [1.0] * 3]), out.Data
+
+
+def check_dot_with_tuple():
+    points = Vector3Array(np.array([[1, 2, 3], [4, 5, 6]], dtype=np.float32))
+    assert np.allclose(points.Dot((1, 0, 0)), [1.0, 4.0])
+    assert np.allclose(points.Dot(Vector3(0, 1, 0)), [2.0, 5.0])
+
+
+def check_copy_to_storage_updates_transforms():
+    storage = TransformStorage(4)
+    parent, child, leaf = Transform(storage), Transform(storage), Transform(storage)
+    child.SetParent(parent)
+    for transform in (parent, child, leaf):
+        transform.GetWorldMatrix()
+
+    positions = np.array([[1, 0, 0], [0, 2, 0], [0, 0, 3]], dtype=np.float32)
+    Vector3Array(positions).CopyToStorage(storage)
+    # Batched rebuilds clear Dirty; the Transforms must still notice.
+    storage.GetWorldMatrices(np.arange(3))
+
+    assert leaf.IsDirty
+    assert _xyz(leaf.WorldPosition) == (0.0, 0.0, 3.0)
+    assert _xyz(child.WorldPosition) == (1.0, 2.0, 0.0)
+    assert _xyz(parent.WorldPosition) == (1.0, 0.0, 0.0)
+
+
+if __name__ == "__main__":
+    check_lerp_into_self()
+    check_lerp_into_per_row()
+    check_dot_with_tuple()
+    check_copy_to_storage_updates_transforms()
+    print("Vector3Array checks passed.")